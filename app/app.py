@@ -4,10 +4,18 @@ CRM Analytics Lab - SQL 학습 플랫폼
 """
 
 import streamlit as st
-import sqlite3
+import sys
+import time
 import pandas as pd
 from pathlib import Path
+
+# 프로젝트 루트 추가 (src.utils 사용)
+sys.path.append(str(Path(__file__).parent.parent))
+
 from components.progress_manager import init_progress_table, load_all_progress, get_completed_count
+from src.utils.schema_catalog import load_catalog
+from src.utils.query_engine import get_engine
+from src.utils.db_snapshot import start_provisioning
 
 # 페이지 설정
 st.set_page_config(
@@ -931,20 +939,13 @@ st.markdown("""
 
 # 데이터베이스 경로
 DB_PATH = Path(__file__).parent.parent / "learning" / "data" / "crm.db"
-
-def get_db_connection():
-    """데이터베이스 연결"""
-    return sqlite3.connect(DB_PATH)
+# DB 준비 중 진행 상황을 다시 그리는 간격
+PROVISION_POLL_SECONDS = 0.5
 
 def execute_query(query: str) -> tuple[pd.DataFrame | None, str | None]:
-    """SQL 쿼리 실행"""
-    try:
-        conn = get_db_connection()
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df, None
-    except Exception as e:
-        return None, str(e)
+    """SQL 쿼리 실행 (공유 쿼리 엔진)"""
+    result = get_engine().execute(query)
+    return result.df, result.error
 
 def init_session_state():
     """세션 상태 초기화 및 저장된 진행 데이터 로드"""
@@ -967,7 +968,36 @@ def init_session_state():
                 if progress.last_query:
                     st.session_state.user_queries[qid] = progress.last_query
 
+def show_provisioning() -> bool:
+    """DB가 없으면 백그라운드 준비(스냅샷 복원 또는 생성)를 시작하고 진행 상황 표시 - 준비 중이면 True"""
+    if DB_PATH.exists():
+        return False
+
+    job = start_provisioning(DB_PATH)
+    st.title("CRM Analytics Lab")
+    source = "스냅샷에서 복원" if job.source == "snapshot" else "새로 생성"
+    st.info(f"실습 데이터베이스를 준비하고 있습니다 ({source}). 완료되면 자동으로 시작됩니다.", icon="⏳")
+
+    if job.error:
+        st.error(f"데이터베이스 준비 실패: {job.error}", icon="❌")
+        st.caption("직접 생성하려면:")
+        st.code("python learning/setup_database.py")
+        if st.button("다시 시도"):
+            start_provisioning(DB_PATH, retry=True)
+            st.rerun()
+        return True
+
+    if job.progress is None:
+        with st.spinner(job.message):
+            time.sleep(PROVISION_POLL_SECONDS)
+    else:
+        st.progress(job.progress, text=job.message)
+        time.sleep(PROVISION_POLL_SECONDS)
+    st.rerun()
+
 def main():
+    if show_provisioning():
+        return
     init_session_state()
 
     # 사이드바
@@ -1014,17 +1044,25 @@ def main():
         if DB_PATH.exists():
             st.success("연결됨", icon="✅")
 
-            # 테이블 목록
-            conn = get_db_connection()
-            tables = pd.read_sql_query(
-                "SELECT name FROM sqlite_master WHERE type='table'",
-                conn
-            )
-            conn.close()
+            # 테이블 목록 (스키마 카탈로그에서 읽음 - DB 버전이 바뀔 때만 다시 로드)
+            catalog = load_catalog(DB_PATH)
 
             with st.expander("테이블 목록"):
-                for table in tables['name']:
-                    st.code(table)
+                if catalog is None:
+                    st.caption("스키마 카탈로그 없음 - python learning/setup_database.py --refresh-catalog 실행")
+                for table in catalog.tables.values() if catalog else []:
+                    st.code(table.name)
+                    st.caption(f"{table.row_count:,}행 · {len(table.base_column_names)}개 컬럼"
+                               + (" (뷰)" if table.kind == "view" else ""))
+
+            # 쿼리 엔진 지표 (프로세스 단위 - 모든 세션 합산)
+            engine = get_engine()
+            cache_stats = engine.cache.stats()
+            with st.expander("쿼리 엔진"):
+                st.caption(f"{engine.backend.name} · 쿼리 {engine.metrics.queries:,}회 · 평균 {engine.metrics.avg_ms:.1f}ms")
+                st.caption(f"결과 캐시 적중 {cache_stats.hits:,} / 미스 {cache_stats.misses:,} "
+                           f"({cache_stats.hit_rate:.0%}) · {cache_stats.entries}개 · "
+                           f"{cache_stats.bytes / 1024 ** 2:.1f}/{cache_stats.max_bytes / 1024 ** 2:.0f}MB")
         else:
             st.error("DB 없음", icon="❌")
             st.caption("python learning/setup_database.py 실행")
@@ -1240,32 +1278,29 @@ def show_home():
     # 데이터베이스 미리보기
     st.markdown("### 🗄️ 데이터베이스 미리보기")
 
-    if DB_PATH.exists():
-        tab1, tab2, tab3, tab4 = st.tabs(["customers", "transactions", "events", "campaigns"])
-
-        conn = get_db_connection()
-
-        with tab1:
-            df = pd.read_sql_query("SELECT * FROM customers LIMIT 5", conn)
-            st.dataframe(df, width="stretch")
-            st.caption("고객 정보 테이블 (2,000명)")
-
-        with tab2:
-            df = pd.read_sql_query("SELECT * FROM transactions LIMIT 5", conn)
-            st.dataframe(df, width="stretch")
-            st.caption("거래 내역 테이블 (~5,000건)")
-
-        with tab3:
-            df = pd.read_sql_query("SELECT * FROM events LIMIT 5", conn)
-            st.dataframe(df, width="stretch")
-            st.caption("이벤트 로그 테이블 (~35,000건)")
-
-        with tab4:
-            df = pd.read_sql_query("SELECT * FROM campaigns LIMIT 5", conn)
-            st.dataframe(df, width="stretch")
-            st.caption("마케팅 캠페인 테이블 (50개)")
-
-        conn.close()
+    catalog = load_catalog(DB_PATH)
+    if catalog is not None:
+        previews = [
+            ("customers", "고객 정보 테이블 ({:,}명)"),
+            ("transactions", "거래 내역 테이블 ({:,}건)"),
+            ("events", "이벤트 로그 테이블 ({:,}건)"),
+            ("campaigns", "마케팅 캠페인 테이블 ({:,}개)"),
+        ]
+        tabs = st.tabs([name for name, _ in previews])
+
+        for tab, (name, caption) in zip(tabs, previews):
+            table = catalog.table(name)
+            with tab:
+                if table is None:
+                    st.info(f"{name} 테이블이 없습니다.")
+                    continue
+                # 날짜 생성 컬럼(signup_month 등)은 빼고 원본 스키마만 표시
+                df = pd.DataFrame(table.preview, columns=table.column_names)[table.base_column_names]
+                st.dataframe(df, width="stretch")
+                st.caption(caption.format(table.row_count))
+    elif DB_PATH.exists():
+        st.warning("스키마 카탈로그가 없습니다. 아래 명령어를 실행하세요:")
+        st.code("python learning/setup_database.py --refresh-catalog")
     else:
         st.warning("데이터베이스가 없습니다. 아래 명령어를 실행하세요:")
         st.code("python learning/setup_database.py")
@@ -6,6 +6,8 @@
 - 시도 횟수
 - 마지막 제출 쿼리
 - 완료 시간
+
+조회는 공유 읽기 전용 연결 풀을, 저장은 별도 쓰기 연결을 사용합니다.
 """
 
 import sqlite3
@@ -14,6 +16,8 @@ from datetime import datetime
 from dataclasses import dataclass
 from typing import Optional
 
+from src.utils.connection_pool import get_pool
+
 DB_PATH = Path(__file__).parent.parent.parent / "learning" / "data" / "crm.db"
 
 
@@ -111,16 +115,15 @@ def load_all_progress() -> dict[str, QuestionProgress]:
     Returns:
         dict: {question_id: QuestionProgress} 형태
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with get_pool(DB_PATH).connection() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT question_id, is_completed, attempts, last_query, solved_at
-        FROM user_progress
-    """)
+        cursor.execute("""
+            SELECT question_id, is_completed, attempts, last_query, solved_at
+            FROM user_progress
+        """)
 
-    rows = cursor.fetchall()
-    conn.close()
+        rows = cursor.fetchall()
 
     progress_dict = {}
     for row in rows:
@@ -145,17 +148,16 @@ def get_progress(question_id: str) -> Optional[QuestionProgress]:
     Returns:
         QuestionProgress 또는 None
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with get_pool(DB_PATH).connection() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT question_id, is_completed, attempts, last_query, solved_at
-        FROM user_progress
-        WHERE question_id = ?
-    """, (question_id,))
+        cursor.execute("""
+            SELECT question_id, is_completed, attempts, last_query, solved_at
+            FROM user_progress
+            WHERE question_id = ?
+        """, (question_id,))
 
-    row = cursor.fetchone()
-    conn.close()
+        row = cursor.fetchone()
 
     if row:
         return QuestionProgress(
@@ -170,13 +172,12 @@ def get_progress(question_id: str) -> Optional[QuestionProgress]:
 
 def get_completed_count() -> int:
     """완료된 문제 수 반환"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with get_pool(DB_PATH).connection() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("SELECT COUNT(*) FROM user_progress WHERE is_completed = 1")
-    count = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM user_progress WHERE is_completed = 1")
+        count = cursor.fetchone()[0]
 
-    conn.close()
     return count
 
 
@@ -191,19 +192,18 @@ def get_stats() -> dict:
             'total_attempts': 총 시도 횟수
         }
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with get_pool(DB_PATH).connection() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT
-            COUNT(CASE WHEN is_completed = 1 THEN 1 END) as completed,
-            COUNT(*) as attempted,
-            SUM(attempts) as total_attempts
-        FROM user_progress
-    """)
-
-    row = cursor.fetchone()
-    conn.close()
+        cursor.execute("""
+            SELECT
+                COUNT(CASE WHEN is_completed = 1 THEN 1 END) as completed,
+                COUNT(*) as attempted,
+                SUM(attempts) as total_attempts
+            FROM user_progress
+        """)
+
+        row = cursor.fetchone()
 
     return {
         'completed': row[0] or 0,
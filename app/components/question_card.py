@@ -4,14 +4,13 @@
 
 import streamlit as st
 import pandas as pd
-import sqlite3
-from pathlib import Path
 from dataclasses import dataclass
 from typing import Callable
 from components.progress_manager import save_progress, get_progress
 from components.result_checker import check_result, CheckStatus
+from components.sql_editor import run_user_query
 
-DB_PATH = Path(__file__).parent.parent.parent / "learning" / "data" / "crm.db"
+from src.utils.query_engine import get_engine
 
 @dataclass
 class Question:
@@ -124,9 +123,12 @@ class QuestionCard:
         is_correct = False
 
         if run_clicked and query.strip():
-            result_df, error = self._execute_query(query)
-            st.session_state[f"result_{self.key}"] = result_df
-            st.session_state[f"error_{self.key}"] = error
+            result = run_user_query(self.key, query)
+            st.session_state[f"result_{self.key}"] = result.df
+            st.session_state[f"error_{self.key}"] = result.error
+            st.session_state[f"cost_hint_{self.key}"] = result.cost_hint
+            st.session_state[f"elapsed_{self.key}"] = result.elapsed_ms
+            st.session_state[f"notice_{self.key}"] = result.notice
 
         # 결과 표시
         if f"result_{self.key}" in st.session_state:
@@ -141,8 +143,15 @@ class QuestionCard:
                     <span style="font-size: 0.8rem; font-weight: 700; color: #059669; text-transform: uppercase; letter-spacing: 0.05em;">RESULT</span>
                 </div>
                 """, unsafe_allow_html=True)
+                notice = st.session_state.get(f"notice_{self.key}")
+                if notice:
+                    st.warning(f"✂️ {notice}")
                 st.dataframe(result_df, use_container_width=True)
-                st.caption(f"{len(result_df)}개 행 반환")
+                elapsed = st.session_state.get(f"elapsed_{self.key}")
+                st.caption(f"{len(result_df)}개 행 반환" + (f" · {elapsed:.0f}ms" if elapsed is not None else ""))
+                hint = st.session_state.get(f"cost_hint_{self.key}")
+                if hint:
+                    st.caption(f"💡 쿼리 비용 - {hint}")
 
         # 정답 확인
         if check_clicked:
@@ -151,8 +160,8 @@ class QuestionCard:
         if st.session_state.get(f"checked_{self.key}", False):
             st.divider()
 
-            # 정답 쿼리 실행
-            answer_df, _ = self._execute_query(q.answer_query)
+            # 정답 쿼리 실행 (DB 지문이 같으면 캐시된 결과 재사용)
+            answer_df = self._answer_result()
 
             # 결과 기반 채점
             user_result = st.session_state.get(f"result_{self.key}")
@@ -314,13 +323,7 @@ class QuestionCard:
         # 구분자 없으면 단일 힌트
         return [hint.strip()]
 
-    def _execute_query(self, query: str) -> tuple[pd.DataFrame | None, str | None]:
-        """SQL 쿼리 실행"""
-        try:
-            conn = sqlite3.connect(DB_PATH)
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            return df, None
-        except Exception as e:
-            return None, str(e)
+    def _answer_result(self) -> pd.DataFrame | None:
+        """정답 쿼리 결과 (엔진 결과 캐시 - 채점 후 rerun이나 다른 세션에서 다시 실행하지 않음)"""
+        return get_engine().execute(self.question.answer_query, cache=True).df
 
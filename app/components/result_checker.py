@@ -229,8 +229,8 @@ class ResultChecker:
                 answer_sorted = answer_normalized
 
             # 값 비교
-            user_values = user_sorted.values.tolist()
-            answer_values = answer_sorted.values.tolist()
+            user_values = self._to_rows(user_sorted)
+            answer_values = self._to_rows(answer_sorted)
 
             if user_values == answer_values:
                 return 50, []
@@ -286,6 +286,10 @@ class ResultChecker:
 
         return result
 
+    def _to_rows(self, df: pd.DataFrame) -> list[list]:
+        """비교용 행 목록 - NULL(NaN/None)은 None으로 (NaN != NaN이라 그대로면 같은 결과도 불일치)"""
+        return df.astype(object).where(df.notna(), None).values.tolist()
+
     def _sort_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """DataFrame 정렬 (비교용)"""
         try:
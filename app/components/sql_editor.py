@@ -2,12 +2,71 @@
 SQL 에디터 컴포넌트
 """
 
+import threading
+import time
+
 import streamlit as st
-import sqlite3
 import pandas as pd
-from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent.parent / "learning" / "data" / "crm.db"
+from src.utils.query_engine import QueryResult, get_engine
+
+# 학습자 쿼리 실행 중 화면(경과 시간)을 갱신하는 간격
+QUERY_POLL_SECONDS = 0.1
+
+
+def run_user_query(key: str, query: str) -> QueryResult:
+    """
+    학습자 쿼리 실행 - 엔진의 한도(user_limits: 시간/행 수/VM 명령/결과 메모리) 적용, 오래 걸리면 취소 버튼 표시
+
+    쿼리는 작업 스레드에서 실행하고 스크립트 스레드는 경과 시간을 갱신하며 기다립니다.
+    취소 버튼은 이벤트를 세워 진행 핸들러가 실행 중인 문장을 바로 중단시키고,
+    다른 위젯 조작으로 rerun이 요청되어 스크립트가 멈출 때도 finally에서 쿼리를 취소합니다.
+    """
+    engine = get_engine()
+    cancel = threading.Event()
+    outcome: dict[str, QueryResult] = {}
+
+    def work():
+        outcome["result"] = engine.execute(
+            query, with_cost_hint=True, limits=engine.user_limits, cancel=cancel
+        )
+
+    worker = threading.Thread(target=work, daemon=True)
+    worker.start()
+    worker.join(QUERY_POLL_SECONDS)  # 짧은 쿼리는 취소 버튼 없이 끝남
+    if not worker.is_alive():
+        return outcome["result"]
+
+    st.session_state[f"cancel_event_{key}"] = cancel
+    cancel_slot = st.empty()
+    status = st.empty()
+    timeout = engine.user_limits.timeout_seconds
+    start = time.monotonic()
+    try:
+        cancel_slot.button("⏹ 실행 취소", key=f"cancel_{key}", on_click=_cancel_query, args=(key,))
+        while worker.is_alive():
+            elapsed = time.monotonic() - start + QUERY_POLL_SECONDS
+            status.caption(f"⏳ 실행 중... {elapsed:.1f}초" + (f" (제한 {timeout:g}초)" if timeout else ""))
+            worker.join(QUERY_POLL_SECONDS)
+    finally:
+        cancel.set()  # 정상 종료면 영향 없음, rerun으로 중단되면 쿼리 취소
+        st.session_state.pop(f"cancel_event_{key}", None)
+    cancel_slot.empty()
+    status.empty()
+    return outcome["result"]
+
+
+def _cancel_query(key: str):
+    """취소 버튼 콜백 - 실행 중인 쿼리를 중단하고 결과 자리에 취소 안내를 남김"""
+    cancel = st.session_state.get(f"cancel_event_{key}")
+    if cancel is not None:
+        cancel.set()
+    st.session_state[f"result_{key}"] = None
+    st.session_state[f"error_{key}"] = "쿼리 실행을 취소했습니다."
+    st.session_state[f"cost_hint_{key}"] = None
+    st.session_state[f"elapsed_{key}"] = None
+    st.session_state[f"notice_{key}"] = None
+
 
 class SQLEditor:
     """SQL 에디터 및 실행기"""
@@ -60,12 +119,16 @@ class SQLEditor:
         error = None
 
         if run_clicked and query.strip():
-            result_df, error = self._execute_query(query)
+            result = run_user_query(self.key, query)
+            result_df, error = result.df, result.error
 
             # 결과를 세션에 저장
             st.session_state[f"result_{self.key}"] = result_df
             st.session_state[f"error_{self.key}"] = error
             st.session_state[f"last_query_{self.key}"] = query
+            st.session_state[f"cost_hint_{self.key}"] = result.cost_hint
+            st.session_state[f"elapsed_{self.key}"] = result.elapsed_ms
+            st.session_state[f"notice_{self.key}"] = result.notice
 
         # 이전 결과 표시
         elif f"result_{self.key}" in st.session_state:
@@ -74,16 +137,6 @@ class SQLEditor:
 
         return query, result_df, error
 
-    def _execute_query(self, query: str) -> tuple[pd.DataFrame | None, str | None]:
-        """SQL 쿼리 실행"""
-        try:
-            conn = sqlite3.connect(DB_PATH)
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            return df, None
-        except Exception as e:
-            return None, str(e)
-
 
 def render_sql_editor(
     key: str,
@@ -115,7 +168,14 @@ def render_sql_editor(
                 <span style="font-size: 0.8rem; font-weight: 700; color: #059669; text-transform: uppercase; letter-spacing: 0.05em;">RESULT</span>
             </div>
             """, unsafe_allow_html=True)
+            notice = st.session_state.get(f"notice_{key}")
+            if notice:
+                st.warning(f"✂️ {notice}")
             st.dataframe(result_df, use_container_width=True)
-            st.caption(f"{len(result_df)}개 행 반환")
+            elapsed = st.session_state.get(f"elapsed_{key}")
+            st.caption(f"{len(result_df)}개 행 반환" + (f" · {elapsed:.0f}ms" if elapsed is not None else ""))
+            hint = st.session_state.get(f"cost_hint_{key}")
+            if hint:
+                st.caption(f"💡 쿼리 비용 - {hint}")
 
     return query, result_df
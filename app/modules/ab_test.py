@@ -583,7 +583,7 @@ ORDER BY date""",
         answer_query="""
 WITH daily_stats AS (
     SELECT
-        date(event_date) as date,
+        event_date as date,
         CASE device WHEN 'desktop' THEN 'control' ELSE 'treatment' END as variant,
         COUNT(DISTINCT CASE WHEN event_type = 'page_view' THEN user_id END) as users,
         COUNT(DISTINCT CASE WHEN event_type = 'purchase' THEN user_id END) as conversions,
@@ -594,7 +594,7 @@ WITH daily_stats AS (
         ) as rate
     FROM events
     WHERE event_type IN ('page_view', 'purchase')
-    GROUP BY date(event_date), CASE device WHEN 'desktop' THEN 'control' ELSE 'treatment' END
+    GROUP BY event_date, CASE device WHEN 'desktop' THEN 'control' ELSE 'treatment' END
 )
 SELECT
     date,
@@ -792,7 +792,7 @@ WITH user_revenue AS (
         COALESCE(SUM(t.amount), 0) as revenue
     FROM events e
     LEFT JOIN transactions t ON e.user_id = t.customer_id
-        AND date(e.event_date) = date(t.transaction_date)
+        AND e.event_day = t.txn_day
     WHERE e.event_type IN ('page_view', 'purchase')
     GROUP BY e.user_id, e.device
 )
@@ -872,8 +872,8 @@ UNION ALL
         answer_query="""
 WITH experiment_overview AS (
     SELECT
-        MIN(date(event_date)) as start_date,
-        MAX(date(event_date)) as end_date,
+        MIN(event_date) as start_date,
+        MAX(event_date) as end_date,
         COUNT(DISTINCT user_id) as total_users,
         COUNT(DISTINCT CASE WHEN device = 'desktop' THEN user_id END) as control_users,
         COUNT(DISTINCT CASE WHEN device != 'desktop' THEN user_id END) as treatment_users
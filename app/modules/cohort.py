@@ -38,10 +38,10 @@ GROUP BY ...
 ORDER BY ...""",
         answer_query="""
 SELECT
-    strftime('%Y-%m', signup_date) as cohort_month,
+    signup_month as cohort_month,
     COUNT(*) as customer_count
 FROM customers
-GROUP BY strftime('%Y-%m', signup_date)
+GROUP BY signup_month
 ORDER BY cohort_month
 """,
         explanation="""
@@ -51,6 +51,8 @@ ORDER BY cohort_month
         시간에 따른 행동 변화를 추적하는 데 사용됩니다.
 
         strftime()은 SQLite의 날짜 포맷팅 함수입니다.
+        정답 쿼리의 signup_month는 strftime('%Y-%m', signup_date)를 적재 시 미리 계산해 둔
+        생성 컬럼이라, 행마다 함수를 호출하지 않고 인덱스로 묶을 수 있습니다.
         """,
         interview_tip="""
         **Q: 코호트 분석이 뭔가요?**
@@ -98,16 +100,16 @@ JOIN first_purchase fp ON ...""",
 WITH first_purchase AS (
     SELECT
         customer_id,
-        MIN(transaction_date) as first_purchase_date
+        MIN(txn_day) as first_purchase_day
     FROM transactions
     GROUP BY customer_id
 )
 SELECT
-    strftime('%Y-%m', c.signup_date) as cohort_month,
-    ROUND(AVG(julianday(fp.first_purchase_date) - julianday(c.signup_date)), 1) as avg_days_to_first_purchase
+    c.signup_month as cohort_month,
+    ROUND(AVG(fp.first_purchase_day - c.signup_day), 1) as avg_days_to_first_purchase
 FROM customers c
 JOIN first_purchase fp ON c.customer_id = fp.customer_id
-GROUP BY strftime('%Y-%m', c.signup_date)
+GROUP BY c.signup_month
 ORDER BY cohort_month
 """,
         explanation="""
@@ -119,6 +121,7 @@ ORDER BY cohort_month
         - 초기 전환 유도가 잘 됨
 
         julianday()는 날짜를 일수로 변환하는 SQLite 함수입니다.
+        정답 쿼리는 정수 일자 생성 컬럼(signup_day, txn_day)의 뺄셈으로 같은 값을 계산합니다.
         """,
         interview_tip="""
         **Q: 첫 구매까지 기간(Time to First Purchase)이 왜 중요한가요?**
@@ -162,15 +165,15 @@ ORDER BY cohort_month
 WITH customer_cohort AS (
     SELECT
         customer_id,
-        strftime('%Y-%m', signup_date) as cohort_month
+        signup_month as cohort_month
     FROM customers
 ),
 customer_activity AS (
     SELECT
         t.customer_id,
         cc.cohort_month,
-        (strftime('%Y', t.transaction_date) - strftime('%Y', c.signup_date)) * 12 +
-        (strftime('%m', t.transaction_date) - strftime('%m', c.signup_date)) as month_diff
+        (substr(t.txn_month, 1, 4) - substr(c.signup_month, 1, 4)) * 12 +
+        (substr(t.txn_month, 6, 2) - substr(c.signup_month, 6, 2)) as month_diff
     FROM transactions t
     JOIN customers c ON t.customer_id = c.customer_id
     JOIN customer_cohort cc ON t.customer_id = cc.customer_id
@@ -256,14 +259,14 @@ GROUP BY cohort_month""",
 WITH customer_cohort AS (
     SELECT
         customer_id,
-        strftime('%Y-%m', signup_date) as cohort_month
+        signup_month as cohort_month
     FROM customers
 ),
 activity_months AS (
     SELECT
         cc.cohort_month,
-        (strftime('%Y', t.transaction_date) - strftime('%Y', c.signup_date)) * 12 +
-        (strftime('%m', t.transaction_date) - strftime('%m', c.signup_date)) as month_diff,
+        (substr(t.txn_month, 1, 4) - substr(c.signup_month, 1, 4)) * 12 +
+        (substr(t.txn_month, 6, 2) - substr(c.signup_month, 6, 2)) as month_diff,
         COUNT(DISTINCT t.customer_id) as active_customers
     FROM transactions t
     JOIN customers c ON t.customer_id = c.customer_id
@@ -352,14 +355,14 @@ SUM(revenue) OVER (
 WITH customer_cohort AS (
     SELECT
         customer_id,
-        strftime('%Y-%m', signup_date) as cohort_month
+        signup_month as cohort_month
     FROM customers
 ),
 monthly_revenue AS (
     SELECT
         cc.cohort_month,
-        (strftime('%Y', t.transaction_date) - strftime('%Y', c.signup_date)) * 12 +
-        (strftime('%m', t.transaction_date) - strftime('%m', c.signup_date)) as month_diff,
+        (substr(t.txn_month, 1, 4) - substr(c.signup_month, 1, 4)) * 12 +
+        (substr(t.txn_month, 6, 2) - substr(c.signup_month, 6, 2)) as month_diff,
         SUM(t.amount) as revenue
     FROM transactions t
     JOIN customers c ON t.customer_id = c.customer_id
@@ -3,17 +3,23 @@
 """
 
 import streamlit as st
-import sqlite3
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 
+from src.utils.column_store import load_table, read_manifest
+from src.utils.query_engine import get_engine
+
 DB_PATH = Path(__file__).parent.parent.parent / "learning" / "data" / "crm.db"
+FUNNEL_STEPS = ['page_view', 'product_view', 'add_to_cart', 'purchase']
 
 
-def get_db_connection():
-    return sqlite3.connect(DB_PATH)
+def column_store_ready() -> bool:
+    """컬럼 저장소(--export-columns)가 현재 DB에서 내보낸 것인지 - 아니면 SQL로 계산"""
+    manifest = read_manifest()
+    return manifest is not None and manifest["fingerprint"] == get_engine().fingerprint
 
 
 def show_dashboard():
@@ -56,57 +62,60 @@ def show_dashboard():
         st.code("python learning/setup_database.py")
         return
 
-    conn = get_db_connection()
+    engine = get_engine()
 
     # 탭으로 구성
     tab1, tab2, tab3, tab4 = st.tabs(["📈 핵심 지표", "🔄 퍼널", "📅 코호트", "🎯 RFM"])
 
     with tab1:
-        show_key_metrics(conn)
+        show_key_metrics(engine)
 
     with tab2:
-        show_funnel_chart(conn)
+        show_funnel_chart(engine)
 
     with tab3:
-        show_cohort_heatmap(conn)
+        show_cohort_heatmap(engine)
 
     with tab4:
-        show_rfm_segments(conn)
-
-    conn.close()
+        show_rfm_segments(engine)
 
 
-def show_key_metrics(conn):
+def show_key_metrics(engine):
     """핵심 지표 카드"""
 
     st.subheader("💰 LTV & CAC 지표")
 
-    # LTV 계산
-    ltv_query = """
-    WITH customer_revenue AS (
-        SELECT customer_id, SUM(amount) as total_revenue
-        FROM transactions
-        GROUP BY customer_id
-    )
-    SELECT ROUND(AVG(total_revenue), 0) as avg_ltv
-    FROM customer_revenue
-    """
-    avg_ltv = pd.read_sql_query(ltv_query, conn).iloc[0]['avg_ltv']
+    # LTV / 총 매출: 컬럼 저장소가 있으면 mmap 배열로 바로 집계
+    if column_store_ready():
+        transactions = load_table("transactions")
+        customer_ids, amounts = transactions["customer_id"], transactions["amount"]
+        customer_revenue = np.bincount(customer_ids, weights=amounts)[np.bincount(customer_ids) > 0]
+        avg_ltv = float(np.floor(customer_revenue.mean() + 0.5))  # SQLite ROUND(x, 0)과 같은 반올림
+        total_revenue = int(amounts.sum())
+    else:
+        ltv_query = """
+        WITH customer_revenue AS (
+            SELECT customer_id, SUM(amount) as total_revenue
+            FROM transactions
+            GROUP BY customer_id
+        )
+        SELECT ROUND(AVG(total_revenue), 0) as avg_ltv
+        FROM customer_revenue
+        """
+        avg_ltv = engine.read_frame(ltv_query).iloc[0]['avg_ltv']
+        total_revenue_query = "SELECT SUM(amount) as total FROM transactions"
+        total_revenue = engine.read_frame(total_revenue_query).iloc[0]['total']
 
     # CAC 계산
     cac_query = """
     SELECT ROUND(SUM(spend) * 1.0 / SUM(conversions), 0) as avg_cac
     FROM campaigns
     """
-    avg_cac = pd.read_sql_query(cac_query, conn).iloc[0]['avg_cac']
+    avg_cac = engine.read_frame(cac_query).iloc[0]['avg_cac']
 
     # LTV:CAC 비율
     ltv_cac_ratio = round(avg_ltv / avg_cac, 1) if avg_cac > 0 else 0
 
-    # 총 매출
-    total_revenue_query = "SELECT SUM(amount) as total FROM transactions"
-    total_revenue = pd.read_sql_query(total_revenue_query, conn).iloc[0]['total']
-
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
@@ -169,7 +178,7 @@ def show_key_metrics(conn):
     ORDER BY ratio DESC
     """
 
-    channel_df = pd.read_sql_query(channel_query, conn)
+    channel_df = engine.read_frame(channel_query)
 
     fig = px.bar(
         channel_df,
@@ -184,28 +193,30 @@ def show_key_metrics(conn):
     st.plotly_chart(fig, width="stretch")
 
 
-def show_funnel_chart(conn):
+def show_funnel_chart(engine):
     """퍼널 차트"""
 
     st.subheader("🔄 전환 퍼널")
 
-    funnel_query = """
-    SELECT
-        event_type as step,
-        COUNT(DISTINCT user_id) as users,
-        CASE event_type
-            WHEN 'page_view' THEN 1
-            WHEN 'product_view' THEN 2
-            WHEN 'add_to_cart' THEN 3
-            WHEN 'purchase' THEN 4
-        END as step_order
-    FROM events
-    WHERE event_type IN ('page_view', 'product_view', 'add_to_cart', 'purchase')
-    GROUP BY event_type
-    ORDER BY step_order
-    """
-
-    funnel_df = pd.read_sql_query(funnel_query, conn)
+    if column_store_ready():
+        funnel_df = funnel_from_columns()
+    else:
+        funnel_query = """
+        SELECT
+            event_type as step,
+            COUNT(DISTINCT user_id) as users,
+            CASE event_type
+                WHEN 'page_view' THEN 1
+                WHEN 'product_view' THEN 2
+                WHEN 'add_to_cart' THEN 3
+                WHEN 'purchase' THEN 4
+            END as step_order
+        FROM events
+        WHERE event_type IN ('page_view', 'product_view', 'add_to_cart', 'purchase')
+        GROUP BY event_type
+        ORDER BY step_order
+        """
+        funnel_df = engine.read_frame(funnel_query)
 
     # 한글 레이블
     step_labels = {
@@ -247,33 +258,42 @@ def show_funnel_chart(conn):
     st.dataframe(display_df, width="stretch", hide_index=True)
 
 
-def show_cohort_heatmap(conn):
+def funnel_from_columns() -> pd.DataFrame:
+    """퍼널 단계별 고유 사용자 수 (컬럼 저장소의 event_type 코드 / user_id 배열로 계산)"""
+    events = load_table("events")
+    event_types, user_ids = events["event_type"], events["user_id"]
+    rows = []
+    for step_order, step in enumerate(FUNNEL_STEPS, start=1):
+        code = events.code("event_type", step)
+        if code < 0:
+            continue
+        # COUNT(DISTINCT user_id): 사용자 ID별 등장 횟수 중 0이 아닌 칸 수
+        users = np.count_nonzero(np.bincount(user_ids[event_types == code]))
+        rows.append((step, users, step_order))
+    return pd.DataFrame(rows, columns=['step', 'users', 'step_order'])
+
+
+def show_cohort_heatmap(engine):
     """코호트 히트맵"""
 
     st.subheader("📅 코호트 리텐션")
 
+    # 가입 월/거래 월은 생성 컬럼(signup_month, txn_month)을 사용해 행마다 strftime을 호출하지 않음
     cohort_query = """
-    WITH customer_cohort AS (
+    WITH activity_months AS (
         SELECT
-            customer_id,
-            strftime('%Y-%m', signup_date) as cohort_month
-        FROM customers
-    ),
-    activity_months AS (
-        SELECT
-            cc.cohort_month,
-            (strftime('%Y', t.transaction_date) - strftime('%Y', c.signup_date)) * 12 +
-            (strftime('%m', t.transaction_date) - strftime('%m', c.signup_date)) as month_diff,
+            c.signup_month as cohort_month,
+            (substr(t.txn_month, 1, 4) - substr(c.signup_month, 1, 4)) * 12 +
+            (substr(t.txn_month, 6, 2) - substr(c.signup_month, 6, 2)) as month_diff,
             COUNT(DISTINCT t.customer_id) as active_customers
         FROM transactions t
         JOIN customers c ON t.customer_id = c.customer_id
-        JOIN customer_cohort cc ON t.customer_id = cc.customer_id
-        GROUP BY cc.cohort_month, month_diff
+        GROUP BY c.signup_month, month_diff
     ),
     cohort_size AS (
-        SELECT cohort_month, COUNT(*) as total_customers
-        FROM customer_cohort
-        GROUP BY cohort_month
+        SELECT signup_month as cohort_month, COUNT(*) as total_customers
+        FROM customers
+        GROUP BY signup_month
     )
     SELECT
         am.cohort_month,
@@ -285,7 +305,7 @@ def show_cohort_heatmap(conn):
     ORDER BY am.cohort_month, am.month_diff
     """
 
-    cohort_df = pd.read_sql_query(cohort_query, conn)
+    cohort_df = engine.read_frame(cohort_query)
 
     # 피봇 테이블 생성
     pivot_df = cohort_df.pivot(index='cohort_month', columns='month_diff', values='retention')
@@ -312,7 +332,7 @@ def show_cohort_heatmap(conn):
         st.metric("M+5 평균 리텐션", f"{avg_retention.get(5, 0)}%")
 
 
-def show_rfm_segments(conn):
+def show_rfm_segments(engine):
     """RFM 세그먼트"""
 
     st.subheader("🎯 RFM 세그먼트 분포")
@@ -359,7 +379,7 @@ def show_rfm_segments(conn):
     ORDER BY total_monetary DESC
     """
 
-    rfm_df = pd.read_sql_query(rfm_query, conn)
+    rfm_df = engine.read_frame(rfm_query)
 
     col1, col2 = st.columns(2)
 
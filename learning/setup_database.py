@@ -2,65 +2,953 @@
 학습용 SQLite 데이터베이스 생성 스크립트
 
 실행: python learning/setup_database.py
+      python learning/setup_database.py --scale-factor 100 --workers 8
+      python learning/setup_database.py --append --days 7
+      python learning/setup_database.py --profile skewed
+      python learning/setup_database.py --compact-events
+      python learning/setup_database.py --clustered
+      python learning/setup_database.py --partition-events
+      python learning/setup_database.py --shards 4
+      python learning/setup_database.py --export-parquet
+      python learning/setup_database.py --export-columns
+      python learning/setup_database.py --tune-indexes
+      python learning/setup_database.py --fixture
+      python learning/setup_database.py --snapshot
 """
 
+import argparse
+import itertools
+import os
+import shutil
 import sqlite3
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
 import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 # 프로젝트 루트 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.data_generator import generate_customers, generate_transactions, generate_campaigns
+from src.utils.data_generator import (
+    generate_customers,
+    generate_transactions,
+    generate_campaigns,
+    generate_repeat_transactions,
+    WorkloadProfile,
+    PROFILES,
+    DEFAULT_PROFILE,
+    CHANNELS,
+)
+from src.utils.index_advisor import advise
+from src.utils.schema_catalog import SCHEMA_VERSION, build_catalog, save_catalog, refresh_catalog
+from src.utils.event_partitions import partition_table, partition_base, list_partitions, partition_view_sql
+from src.utils.shard_executor import SHARD_DIR, SHARD_KEYS, shard_of, shard_path, write_manifest, read_manifest
+from src.utils.parquet_store import PARQUET_DIR, export_parquet
+from src.utils.column_store import COLUMN_DIR, export_columns
+from src.utils.db_snapshot import create_snapshot
 
 DB_PATH = Path(__file__).parent / "data" / "crm.db"
+# 전체 생성은 이 파일에 만든 뒤 DB_PATH로 원자적으로 교체 (앱이 반쯤 만든 DB를 읽지 않도록)
+BUILD_PATH = DB_PATH.with_name(DB_PATH.name + ".building")
+# 해시 샤드 배포(--shards N)도 같은 방식으로 이 디렉터리에 만든 뒤 SHARD_DIR과 교체
+SHARD_BUILD_DIR = SHARD_DIR.with_name(SHARD_DIR.name + ".building")
+# 테스트용 미니 DB (--fixture): SF1 고객의 1% 표본과 그 고객의 전체 거래/이벤트
+FIXTURE_PATH = DB_PATH.with_name("crm_fixture.db")
+FIXTURE_FRACTION = 0.01
 
+# 스케일 팩터 (TPC 방식): SF1 = 기본 실습 데이터 규모
+SCALE_FACTORS = (1, 10, 100, 1000)
+BASE_CUSTOMERS = 2000
+BASE_CAMPAIGNS = 50
+# 샤드 하나가 담당하는 고객 수 (워커 프로세스 1개 작업 단위)
+CUSTOMERS_PER_SHARD = 50_000
 
-def create_database():
-    """학습용 데이터베이스 생성"""
 
-    print("데이터베이스 생성 중...")
+@dataclass
+class Shard:
+    """고객 샤드 생성 작업 단위"""
+    index: int
+    customer_offset: int  # 이 샤드의 customer_id 시작 오프셋
+    n_customers: int
+    seed: int
+    profile: str = "default"  # PROFILES 키 (워커 프로세스로 넘기기 위해 이름으로 전달)
 
-    # 데이터 생성 (더 많은 데이터로 실습 효과 증대)
-    customers = generate_customers(n_customers=2000, seed=42)
-    transactions = generate_transactions(customers, seed=42)
-    campaigns = generate_campaigns(n_campaigns=50, seed=42)
 
-    # 이벤트 로그 데이터 추가 생성 (Funnel 분석용)
-    events = generate_events(customers, seed=42)
+def plan_shards(scale_factor: int = 1, seed: int = 42, profile: str = "default") -> list[Shard]:
+    """
+    스케일 팩터에 맞춰 고객을 샤드로 분할
 
-    # SQLite 연결
-    conn = sqlite3.connect(DB_PATH)
+    샤드별 시드는 SeedSequence에서 독립적으로 파생되므로
+    워커 수와 무관하게 항상 같은 데이터가 생성됩니다.
+    """
+    if scale_factor not in SCALE_FACTORS:
+        raise ValueError(f"지원하지 않는 스케일 팩터: {scale_factor} (가능: {SCALE_FACTORS})")
+
+    n_customers = BASE_CUSTOMERS * scale_factor
+    n_shards = -(-n_customers // CUSTOMERS_PER_SHARD)
+    children = np.random.SeedSequence(seed).spawn(n_shards)
+
+    shards = []
+    for i, child in enumerate(children):
+        offset = i * CUSTOMERS_PER_SHARD
+        shards.append(Shard(
+            index=i,
+            customer_offset=offset,
+            n_customers=min(CUSTOMERS_PER_SHARD, n_customers - offset),
+            seed=int(child.generate_state(1)[0]),
+            profile=profile
+        ))
+    return shards
+
+
+def generate_shard(shard: Shard) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    샤드 하나의 customers / transactions / events 생성 (워커 프로세스에서 실행)
+
+    customer_id는 1부터 시작하는 정수이므로 샤드 오프셋만큼 이동시켜 전역에서 유일하게 만듭니다.
+    transaction_id / event_id는 샤드 내 번호이며, 전역 번호는 iter_shards에서 다시 매깁니다.
+    """
+    customers = generate_customers(n_customers=shard.n_customers, seed=shard.seed)
+    customers["customer_id"] += shard.customer_offset
+
+    profile = PROFILES[shard.profile]
+    transactions = generate_transactions(customers, seed=shard.seed, profile=profile)
+    events = generate_events(customers, seed=shard.seed, profile=profile)
+
+    return customers, transactions, events
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, max_in_flight: int) -> Iterator:
+    """
+    executor.map과 같지만 제출한 작업을 최대 max_in_flight개로 제한하는 제너레이터 (입력 순서대로 반환)
+
+    executor.map은 모든 작업을 한꺼번에 제출하므로, 소비가 느리면 끝난 결과가 전부 메모리에 남습니다.
+    가장 오래된 결과를 돌려주기 전에 다음 작업을 하나 제출하므로, 살아 있는 결과는
+    진행 중인 max_in_flight개 + 소비 중인 1개를 넘지 않습니다.
+    """
+    items = iter(items)
+    pending: deque[Future] = deque()
+    try:
+        for item in itertools.islice(items, max_in_flight):
+            pending.append(executor.submit(fn, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in itertools.islice(items, 1):
+                pending.append(executor.submit(fn, item))
+            yield result
+            del result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_shards(
+    scale_factor: int = 1,
+    workers: int | None = None,
+    seed: int = 42,
+    profile: str = "default"
+):
+    """
+    샤드를 프로세스 풀에서 병렬 생성하고 샤드 순서대로 반환하는 제너레이터
+
+    동시에 진행 중인 샤드는 최대 workers개이므로 (bounded_map) 적재가 생성보다 느려도
+    완성된 샤드가 메모리에 쌓이지 않고, 최대 메모리는 스케일 팩터와 무관합니다.
+
+    Yields:
+        tuple: (customers, transactions, events) - 전역 ID가 매겨진 샤드 데이터
+    """
+    shards = plan_shards(scale_factor, seed, profile)
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+
+    if workers == 1:
+        results = map(generate_shard, shards)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = bounded_map(executor, generate_shard, shards, workers)
+
+    n_transactions = 0
+    n_events = 0
+    try:
+        for customers, transactions, events in results:
+            # 샤드 내 번호 → 전역 번호
+            transactions["transaction_id"] += n_transactions
+            if n_events:
+                events["event_id"] = np.char.add(
+                    "E", np.arange(n_events, n_events + len(events)).astype(str)
+                )
+            n_transactions += len(transactions)
+            n_events += len(events)
+            yield customers, transactions, events
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+# 적재 전용 PRAGMA: 적재 도중 실패하면 파일을 다시 만들면 되므로 저널/동기화를 끔
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",  # 256MB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA locking_mode = EXCLUSIVE",
+)
+
+# 증분 추가용 PRAGMA: 기존 데이터를 보호해야 하므로 저널은 유지
+APPEND_PRAGMAS = (
+    "PRAGMA cache_size = -262144",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# 인덱스 (쿼리 성능 향상) - 적재가 끝난 뒤 한 번에 생성
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_customers_id ON customers(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_customer ON transactions(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_signup_day ON customers(signup_day)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_signup_month ON customers(signup_month)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_txn_day ON transactions(txn_day)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_txn_month ON transactions(txn_month)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_customer_day ON transactions(customer_id, txn_day)",
+)
+EVENT_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_events_user ON events(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_date ON events(event_date)",
+    "CREATE INDEX IF NOT EXISTS idx_events_day ON events(event_day)",
+    "CREATE INDEX IF NOT EXISTS idx_events_hour ON events(event_hour)",
+)
+COMPACT_EVENT_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_events_compact_user ON events_compact(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_compact_day ON events_compact(event_day)",
+    "CREATE INDEX IF NOT EXISTS idx_events_compact_hour ON events_compact(event_hour)",
+)
+
+# 날짜 파생 컬럼 (STORED generated column): 적재 시 한 번만 계산되어 파일에 저장되고 인덱스를 걸 수 있음
+# 원본 TEXT 날짜 컬럼은 그대로 두므로 기존 쿼리(strftime, 문자열 비교)는 그대로 동작합니다.
+# 생성 컬럼도 SELECT *에 포함되므로, 앱 미리보기/사이드바는 카탈로그의 generated 표시로 원본 컬럼만 보여 줍니다.
+# - *_day: 1970-01-01 기준 정수 일자 (julianday 차이 = 정수 뺄셈)
+# - *_month: 'YYYY-MM' (strftime('%Y-%m', ...)과 같은 값)
+# - event_hour: 0~23 정수
+GENERATED_COLUMNS = {
+    "customers": (
+        "signup_day INTEGER GENERATED ALWAYS AS (CAST(julianday(signup_date) - 2440587.5 AS INTEGER)) STORED",
+        "signup_month TEXT GENERATED ALWAYS AS (substr(signup_date, 1, 7)) STORED",
+    ),
+    "transactions": (
+        "txn_day INTEGER GENERATED ALWAYS AS (CAST(julianday(transaction_date) - 2440587.5 AS INTEGER)) STORED",
+        "txn_month TEXT GENERATED ALWAYS AS (substr(transaction_date, 1, 7)) STORED",
+    ),
+    "events": (
+        "event_day INTEGER GENERATED ALWAYS AS (CAST(julianday(event_date) - 2440587.5 AS INTEGER)) STORED",
+        "event_hour INTEGER GENERATED ALWAYS AS (CAST(substr(event_timestamp, 12, 2) AS INTEGER)) STORED",
+    ),
+    # 압축 이벤트는 정수 연산만 하면 되므로 VIRTUAL (테이블 크기 유지, 인덱스에만 저장)
+    "events_compact": (
+        "event_day INTEGER GENERATED ALWAYS AS (event_ts / 86400) VIRTUAL",
+        "event_hour INTEGER GENERATED ALWAYS AS (event_ts / 3600 % 24) VIRTUAL",
+    ),
+}
+
+# INTEGER PRIMARY KEY (rowid 별칭) 컬럼: 별도 rowid 없이 ID 자체가 B-tree 키가 됨
+PRIMARY_KEYS = {
+    "events_compact": "event_id",
+}
+
+# 클러스터드 레이아웃 (--clustered): WITHOUT ROWID 테이블의 복합 기본키 순서대로 행이 저장됨
+# 사용자/고객별 집계(퍼널, A/B, RFM, LTV)가 흩어진 페이지 대신 연속된 페이지를 읽게 됩니다.
+CLUSTERED_KEYS = {
+    "events": ("user_id", "event_type", "event_id"),
+    "events_compact": ("user_id", "event_type_id", "event_id"),
+    "transactions": ("customer_id", "transaction_date", "transaction_id"),
+}
+# 기본키 선두 컬럼과 같은 단일 컬럼 인덱스는 클러스터드 레이아웃에서 생략
+CLUSTERED_REDUNDANT_INDEXES = {
+    "events": ("idx_events_user",),
+    "events_compact": ("idx_events_compact_user",),
+    "transactions": ("idx_transactions_customer",),
+}
+
+
+class BulkLoader:
+    """
+    SQLite 대량 적재기
+
+    - DataFrame 청크를 받는 즉시 executemany로 삽입 (전체 데이터를 메모리에 모으지 않음)
+    - 전체 적재를 하나의 트랜잭션으로 처리
+    - 테이블은 처음 들어온 청크의 dtype으로 생성하고, 인덱스는 적재 후 생성
+    - append=True면 기존 테이블에 그대로 추가 (증분 추가 모드)
+    - clustered=True면 CLUSTERED_KEYS 테이블을 WITHOUT ROWID + 복합 기본키로 생성
+      (증분 추가 모드에서는 기존 테이블 정의를 보고 판단)
+    - append_partitioned()는 청크를 월별 파티션 테이블(events_2024_01, ...)로 나눠 삽입하고,
+      파티션 테이블은 원래 테이블(events)의 컬럼/키 정의와 인덱스를 그대로 따름
+
+    사용 예:
+        with BulkLoader(DB_PATH) as loader:
+            loader.load("events", iter_event_batches(customers))
+            loader.finish(INDEXES + EVENT_INDEXES)
+    """
+
+    def __init__(self, db_path: Path, append: bool = False, clustered: bool = False):
+        self.db_path = db_path
+        self.append_mode = append
+        self.clustered = clustered
+        self.row_counts: dict[str, int] = {}
+        self.clustered_tables: set[str] = set()
+        self.catalog = None
+        self._insert_sql: dict[str, str] = {}
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        for pragma in APPEND_PRAGMAS if append else LOAD_PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.execute("BEGIN")
+
+    def append(self, table: str, chunk: pd.DataFrame):
+        """청크 하나 삽입 (테이블 첫 청크면 테이블을 새로 생성하거나, 증분 모드면 기존 테이블 사용)"""
+        if table not in self._insert_sql:
+            self._prepare_table(table, chunk)
+
+        if table in self.clustered_tables:
+            # 기본키 선두 컬럼 순으로 넣어 B-tree 삽입 위치가 흩어지지 않도록 함
+            chunk = chunk.sort_values(CLUSTERED_KEYS[_definition_table(table)][0], kind="stable")
+        self.conn.executemany(self._insert_sql[table], _iter_rows(chunk))
+        self.row_counts[table] += len(chunk)
+
+    def append_partitioned(self, table: str, chunk: pd.DataFrame, date_column: str):
+        """청크를 date_column의 월('YYYY-MM')별로 나눠 월별 파티션 테이블에 삽입"""
+        for month, part in chunk.groupby(chunk[date_column].str[:7], sort=True):
+            self.append(partition_table(table, month), part)
+        self.row_counts[table] = self.row_counts.get(table, 0) + len(chunk)
+
+    def create_partition_view(self, table: str):
+        """월별 파티션 전체를 UNION ALL로 합친 뷰 생성 (증분 추가로 새 달이 생기면 다시 호출)"""
+        self.create_view(table, partition_view_sql(list_partitions(self.conn, table)))
+
+    def load(self, table: str, chunks):
+        """청크 제너레이터를 끝까지 소비하며 삽입"""
+        for chunk in chunks:
+            self.append(table, chunk)
+
+    def create_view(self, name: str, select_sql: str):
+        """같은 이름의 테이블/뷰를 지우고 뷰 생성"""
+        self.drop(name)
+        self.conn.execute(f"CREATE VIEW {name} AS {select_sql}")
+
+    def drop(self, name: str):
+        """테이블 또는 뷰 삭제 (없으면 무시)"""
+        row = self.conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = ? AND type IN ('table', 'view')", (name,)
+        ).fetchone()
+        if row:
+            self.conn.execute(f"DROP {row[0].upper()} {name}")
+
+    def finish(self, indexes: tuple[str, ...] = INDEXES + EVENT_INDEXES):
+        """인덱스 생성, 플래너 통계 수집(ANALYZE), 카탈로그/지문 게시 후 커밋"""
+        skip = {
+            _partition_index_name(name, _definition_table(table), table)
+            for table in self.clustered_tables
+            for name in CLUSTERED_REDUNDANT_INDEXES.get(_definition_table(table), ())
+        }
+        for statement in self._expand_partitioned(indexes):
+            if _index_name(statement) in skip:
+                continue
+            self.conn.execute(statement)
+        # 테이블/인덱스별 행 수와 선택도를 sqlite_stat1에 기록 (STAT4 빌드면 sqlite_stat4 표본도 수집)
+        self.conn.execute("ANALYZE")
+        # 데이터와 같은 트랜잭션에서 게시해 앱이 새 데이터를 옛 지문으로 읽는 순간이 없도록 함
+        self.catalog = build_catalog(self.conn, SCHEMA_VERSION)
+        save_catalog(self.conn, self.catalog)
+        self.conn.execute("COMMIT")
+
+    def _expand_partitioned(self, indexes: tuple[str, ...]) -> list[str]:
+        """파티션으로 나눈 테이블의 인덱스 정의를 파티션마다 하나씩으로 펼침"""
+        statements = []
+        for statement in indexes:
+            table = _index_table(statement)
+            partitions = list_partitions(self.conn, table)
+            if not partitions:
+                statements.append(statement)
+                continue
+            for partition in partitions.values():
+                statements.append(
+                    statement.replace(f" ON {table}(", f" ON {partition}(").replace(
+                        _index_name(statement), _partition_index_name(_index_name(statement), table, partition)
+                    )
+                )
+        return statements
+
+    def close(self):
+        if self.conn.in_transaction:
+            self.conn.execute("ROLLBACK")
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _prepare_table(self, table: str, chunk: pd.DataFrame):
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+
+        definition = _definition_table(table)
+        if self.append_mode and exists:
+            if _is_without_rowid(self.conn, table):
+                self.clustered_tables.add(table)
+        else:
+            clustered = self.clustered
+            if self.append_mode and definition != table:
+                # 증분 추가로 새 달 파티션을 만들 때는 기존 파티션의 레이아웃을 따름
+                clustered = any(
+                    _is_without_rowid(self.conn, partition)
+                    for partition in list_partitions(self.conn, definition).values()
+                )
+            clustered_key = CLUSTERED_KEYS.get(definition) if clustered else None
+            primary_key = None if clustered_key else PRIMARY_KEYS.get(definition)
+            columns = ", ".join(
+                [f"{name} {_sql_type(chunk[name])}" + (" PRIMARY KEY" if name == primary_key else "")
+                 for name in chunk.columns]
+                + list(GENERATED_COLUMNS.get(definition, ()))
+                + ([f"PRIMARY KEY ({', '.join(clustered_key)})"] if clustered_key else [])
+            )
+            self.drop(table)
+            self.conn.execute(
+                f"CREATE TABLE {table} ({columns})" + (" WITHOUT ROWID" if clustered_key else "")
+            )
+            if clustered_key:
+                self.clustered_tables.add(table)
+
+        column_names = ", ".join(chunk.columns)
+        placeholders = ", ".join("?" * len(chunk.columns))
+        self._insert_sql[table] = f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})"
+        self.row_counts[table] = 0
+
+
+class ShardedLoader:
+    """
+    해시 샤드 적재기 (--shards N)
+
+    customers / transactions / events를 hash(customer_id / user_id)로 나눠 N개의 샤드 파일에 적재하고
+    나머지 테이블(campaigns)은 모든 샤드에 복제합니다. 샤드마다 BulkLoader 하나를 씁니다.
+    샤드의 events는 항상 기본 레이아웃입니다 (압축/월별 파티션은 crm.db에만 적용).
+    """
+
+    def __init__(self, shard_dir: Path, n_shards: int, append: bool = False, clustered: bool = False):
+        self.n_shards = n_shards
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        self.loaders = [
+            BulkLoader(shard_path(shard_dir, i), append=append, clustered=clustered)
+            for i in range(n_shards)
+        ]
+
+    def append(self, table: str, chunk: pd.DataFrame):
+        key = SHARD_KEYS.get(table)
+        if key is None:
+            for loader in self.loaders:
+                loader.append(table, chunk)
+            return
+        shards = shard_of(chunk[key].to_numpy(), self.n_shards)
+        for i, loader in enumerate(self.loaders):
+            # 빈 조각도 넘겨 모든 샤드에 같은 테이블이 생기도록 함
+            loader.append(table, chunk[shards == i])
+
+    def tee(self, table: str, chunks):
+        """청크 제너레이터를 그대로 흘려보내면서 샤드에도 적재"""
+        for chunk in chunks:
+            self.append(table, chunk)
+            yield chunk
+
+    def finish(self, indexes: tuple[str, ...] = INDEXES + EVENT_INDEXES):
+        for loader in self.loaders:
+            loader.finish(indexes)
+
+    def close(self):
+        for loader in self.loaders:
+            loader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _index_name(statement: str) -> str:
+    """'CREATE INDEX IF NOT EXISTS <name> ON ...' 에서 인덱스 이름 추출"""
+    return statement.split(" ON ")[0].split()[-1]
+
+
+def _index_table(statement: str) -> str:
+    """'CREATE INDEX ... ON <table>(...)' 에서 테이블 이름 추출"""
+    return statement.split(" ON ")[1].split("(")[0].strip()
+
+
+def _partition_index_name(name: str, table: str, partition: str) -> str:
+    """idx_events_user → idx_events_2024_01_user (파티션이 아니면 그대로)"""
+    return name.replace(f"idx_{table}_", f"idx_{partition}_", 1)
+
+
+def _definition_table(table: str) -> str:
+    """컬럼/키 정의를 가져올 테이블 (월별 파티션이면 원래 테이블)"""
+    return partition_base(table) or table
+
+
+def _is_without_rowid(conn: sqlite3.Connection, table: str) -> bool:
+    """WITHOUT ROWID(클러스터드) 테이블 여부"""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return bool(row) and "WITHOUT ROWID" in row[0].upper()
+
+
+def _sql_type(series: pd.Series) -> str:
+    """pandas dtype → SQLite 컬럼 타입 (to_sql과 같은 규칙)"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def _iter_rows(chunk: pd.DataFrame):
+    """DataFrame 청크 → sqlite3에 바인딩 가능한 파이썬 값 튜플"""
+    columns = []
+    for name in chunk.columns:
+        series = chunk[name]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            series = series.dt.strftime("%Y-%m-%d %H:%M:%S")
+        values = series.tolist()
+        if series.hasnans:
+            values = [None if pd.isna(v) else v for v in values]
+        columns.append(values)
+    return zip(*columns)
+
+
+def create_database(
+    scale_factor: int = 1,
+    workers: int | None = None,
+    profile: str = "default",
+    compact_events: bool = False,
+    clustered: bool = False,
+    tune_indexes: bool = False,
+    partition_events: bool = False,
+    shards: int = 0
+):
+    """
+    학습용 데이터베이스 생성
+
+    BUILD_PATH에 새로 만든 뒤(인덱스 튜닝, 카탈로그/지문 게시까지) DB_PATH로 원자적으로 교체합니다.
+    생성 중에도 앱은 이전 DB를 그대로 읽고, 기존 학습 진행(user_progress)은 새 DB로 옮겨집니다.
+    compact_events=True면 이벤트를 정수 코드 테이블(events_compact)에 저장하고
+    events는 같은 컬럼 계약을 제공하는 뷰로 만듭니다.
+    clustered=True면 events / transactions를 (사용자, 이벤트 종류) / (고객, 거래일) 순서의
+    WITHOUT ROWID 테이블로 만듭니다.
+    partition_events=True면 이벤트를 월별 테이블(events_YYYY_MM)에 나눠 저장하고
+    events는 UNION ALL 뷰로 만듭니다 (event_date 조건 쿼리는 prune_events_query로 파티션 프루닝).
+    shards > 0이면 같은 데이터를 고객 해시로 나눈 샤드 파일도 SHARD_DIR에 만듭니다
+    (src/utils/shard_executor.py의 map-reduce 집계용).
+    """
+    if compact_events and partition_events:
+        raise ValueError("compact_events와 partition_events는 함께 사용할 수 없습니다.")
+
+    print(f"데이터베이스 생성 중... (SF{scale_factor}, profile={profile})")
+
+    campaigns = generate_campaigns(n_campaigns=BASE_CAMPAIGNS * scale_factor, seed=42)
+    event_table = "events_compact" if compact_events else "events"
 
-    # 테이블 생성 및 데이터 삽입
-    customers.to_sql("customers", conn, if_exists="replace", index=False)
-    transactions.to_sql("transactions", conn, if_exists="replace", index=False)
-    campaigns.to_sql("campaigns", conn, if_exists="replace", index=False)
-    events.to_sql("events", conn, if_exists="replace", index=False)
-
-    # 인덱스 생성 (쿼리 성능 향상)
-    cursor = conn.cursor()
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_customers_id ON customers(customer_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_customer ON transactions(customer_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_user ON events(user_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_date ON events(event_date)")
-
-    conn.commit()
+    _remove_db_files(BUILD_PATH)
+    shutil.rmtree(SHARD_BUILD_DIR, ignore_errors=True)
+    try:
+        with BulkLoader(BUILD_PATH, clustered=clustered) as loader, \
+                (ShardedLoader(SHARD_BUILD_DIR, shards, clustered=clustered) if shards else nullcontext()) as sharded:
+            # 테이블 생성 및 데이터 삽입 (샤드 단위로 스트리밍)
+            for customers, transactions, events in iter_shards(scale_factor, workers, profile=profile):
+                if sharded:
+                    for table, chunk in (("customers", customers), ("transactions", transactions), ("events", events)):
+                        sharded.append(table, chunk)
+                loader.append("customers", customers)
+                loader.append("transactions", transactions)
+                # 이벤트 로그 데이터 (Funnel 분석용)
+                if partition_events:
+                    loader.append_partitioned("events", events, "event_date")
+                else:
+                    loader.append(event_table, compact_event_batch(events) if compact_events else events)
+
+            loader.append("campaigns", campaigns)
+            if sharded:
+                sharded.append("campaigns", campaigns)
+                sharded.finish(INDEXES + EVENT_INDEXES)
+
+            if partition_events:
+                loader.create_partition_view("events")
+            if compact_events:
+                for table, lookup in event_lookup_tables().items():
+                    loader.append(table, lookup)
+                loader.create_view("events", COMPACT_EVENTS_VIEW)
+                loader.finish(INDEXES + COMPACT_EVENT_INDEXES)
+            else:
+                loader.finish(INDEXES + EVENT_INDEXES)
+        catalog = loader.catalog
+
+        if tune_indexes:
+            print("인덱스 튜닝 중... (정답 쿼리 EXPLAIN QUERY PLAN + 지연 시간 측정)")
+            print(advise(BUILD_PATH, apply=True).format())
+            # 인덱스가 바뀌었으므로 지문 다시 게시
+            catalog = refresh_catalog(BUILD_PATH, SCHEMA_VERSION)
+
+        _publish_database(BUILD_PATH, DB_PATH)
+        if shards:
+            write_manifest(SHARD_BUILD_DIR, shards, catalog.fingerprint)
+            _publish_shards(SHARD_BUILD_DIR, SHARD_DIR)
+        elif SHARD_DIR.exists():
+            # 이전 샤드는 새 crm.db와 데이터가 다르므로 제거
+            shutil.rmtree(SHARD_DIR)
+    except BaseException:
+        _remove_db_files(BUILD_PATH)
+        shutil.rmtree(SHARD_BUILD_DIR, ignore_errors=True)
+        raise
+
+    print(f"데이터베이스 생성 완료: {DB_PATH} (fingerprint={catalog.fingerprint})")
+    for table in ("customers", "transactions", "campaigns"):
+        print(f"- {table}: {loader.row_counts[table]} rows")
+    layout = " (compact)" if compact_events else " (monthly partitions)" if partition_events else ""
+    print(f"- events: {loader.row_counts[event_table]} rows" + layout)
+    if shards:
+        print(f"- 샤드: {SHARD_DIR} ({shards}개 파일)")
+
+
+def create_fixture(
+    db_path: Path = FIXTURE_PATH,
+    fraction: float = FIXTURE_FRACTION,
+    seed: int = 42,
+    profile: str = "default"
+):
+    """
+    빠른 테스트용 미니 DB 생성 (SF1 고객의 fraction 표본)
+
+    SF1 첫 샤드와 같은 시드로 고객을 만든 뒤 fraction만큼 고르고, 그 고객들의 거래/이벤트만 생성합니다.
+    표본 고객의 모든 거래·이벤트가 들어 있고 캠페인은 SF1 전체를 넣으므로 조인 결과가 어긋나지 않으며,
+    테이블/생성 컬럼/인덱스/카탈로그는 crm.db(기본 레이아웃)와 같습니다.
+    같은 인자로 만들면 항상 같은 파일(같은 지문)이 생성됩니다.
+    """
+    shard = plan_shards(1, seed, profile)[0]
+    customers = generate_customers(n_customers=shard.n_customers, seed=shard.seed)
+    rng = np.random.default_rng(shard.seed)
+    n_sample = max(1, round(len(customers) * fraction))
+    sample = np.sort(rng.choice(len(customers), size=n_sample, replace=False))
+    customers = customers.iloc[sample].reset_index(drop=True)
+
+    profile_spec = PROFILES[profile]
+    transactions = generate_transactions(customers, seed=shard.seed, profile=profile_spec)
+    events = generate_events(customers, seed=shard.seed, profile=profile_spec)
+    campaigns = generate_campaigns(n_campaigns=BASE_CAMPAIGNS, seed=42)
+
+    build_path = db_path.with_name(db_path.name + ".building")
+    _remove_db_files(build_path)
+    try:
+        with BulkLoader(build_path) as loader:
+            loader.append("customers", customers)
+            loader.append("transactions", transactions)
+            loader.append("events", events)
+            loader.append("campaigns", campaigns)
+            loader.finish(INDEXES + EVENT_INDEXES)
+        os.replace(build_path, db_path)
+    except BaseException:
+        _remove_db_files(build_path)
+        raise
+
+    print(f"픽스처 DB 생성 완료: {db_path} (fingerprint={loader.catalog.fingerprint})")
+    for table in ("customers", "transactions", "events", "campaigns"):
+        print(f"- {table}: {loader.row_counts[table]} rows")
+
+
+def _publish_shards(build_dir: Path, shard_dir: Path):
+    """완성된 샤드 디렉터리로 교체 (이전 샤드는 옆으로 옮긴 뒤 삭제)"""
+    old_dir = shard_dir.with_name(shard_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if shard_dir.exists():
+        os.replace(shard_dir, old_dir)
+    os.replace(build_dir, shard_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _publish_database(build_path: Path, db_path: Path):
+    """
+    완성된 DB 파일을 db_path로 원자적으로 교체
+
+    1. 새 파일을 디스크에 flush (fsync)
+    2. 기존 DB의 쓰기 잠금을 잡은 상태에서 학습 진행(user_progress)을 새 파일로 복사
+       - 잠금 동안 앱의 진행 저장은 대기하므로 복사 이후 저장분이 사라지지 않음
+       - 잠금만 잡고 쓰지 않으므로 기존 DB에 hot journal이 남지 않아 새 파일에 잘못 적용될 일이 없음
+    3. os.replace로 교체 (같은 디렉터리 rename - 읽는 쪽은 이전 파일 또는 새 파일 중 하나만 봄)
+    """
+    old = sqlite3.connect(db_path, isolation_level=None, timeout=30) if db_path.exists() else None
+    try:
+        if old is not None:
+            old.execute("BEGIN IMMEDIATE")
+            progress = old.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'user_progress'"
+            ).fetchone()
+            if progress:
+                conn = sqlite3.connect(build_path)
+                conn.execute(progress[0])
+                conn.execute("ATTACH DATABASE ? AS old", (str(db_path),))
+                conn.execute("INSERT INTO user_progress SELECT * FROM old.user_progress")
+                conn.commit()
+                conn.execute("DETACH DATABASE old")
+                conn.close()
+
+        with open(build_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(build_path, db_path)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(db_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    finally:
+        if old is not None:
+            old.close()
+
+
+def _remove_db_files(path: Path):
+    """DB 파일과 저널 파일 삭제 (없으면 무시)"""
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        Path(str(path) + suffix).unlink(missing_ok=True)
+
+
+def append_days(n_days: int = 1, seed: int = 42, profile: str = "default"):
+    """
+    기존 crm.db에 다음 n_days일치 데이터를 증분 추가 (일 단위 데이터 피드 시뮬레이션)
+
+    - 기간: 테이블마다 자기 마지막 날짜 다음날부터 n_days일
+      (전체 생성 데이터는 customers/transactions가 2024-06-30, events가 2024-12-31까지라 두 기간이 다름)
+    - customers: 최근 30일 일평균 가입자 수만큼 신규 가입
+    - transactions: 신규 고객의 첫 구매 + 최근 30일 일평균 거래량만큼 기존 고객 재구매
+    - events: 전체 고객(신규 포함)의 기간 내 세션
+    같은 기간을 같은 seed로 추가하면 항상 같은 데이터가 생성됩니다.
+    profile은 전체 생성 때와 같은 값을 주어야 분포가 이어집니다.
+    """
+    if not DB_PATH.exists():
+        raise FileNotFoundError(f"{DB_PATH}가 없습니다. 먼저 전체 생성을 실행하세요.")
+
+    conn = sqlite3.connect(DB_PATH)
+    compact_events = _has_compact_events(conn)
+    partitions = list_partitions(conn)
+    state = _read_append_state(conn, compact_events, partitions)
+    existing = pd.read_sql_query(
+        "SELECT customer_id, acquisition_channel, is_churned FROM customers ORDER BY customer_id",
+        conn
+    )
     conn.close()
 
-    print(f"데이터베이스 생성 완료: {DB_PATH}")
-    print(f"- customers: {len(customers)} rows")
-    print(f"- transactions: {len(transactions)} rows")
-    print(f"- campaigns: {len(campaigns)} rows")
-    print(f"- events: {len(events)} rows")
+    start_date = state["sales_max_date"] + np.timedelta64(1, "D")
+    end_date = start_date + np.timedelta64(n_days - 1, "D")
+    event_start_date = state["event_max_date"] + np.timedelta64(1, "D")
+    window_seq = np.random.SeedSequence(
+        [seed, int(start_date.astype(np.int64)), int(event_start_date.astype(np.int64)), n_days]
+    )
+    customer_seed, transaction_seed, repeat_seed, event_seed = (
+        int(child.generate_state(1)[0]) for child in window_seq.spawn(4)
+    )
+
+    print(f"증분 추가 중... (customers/transactions {start_date} ~ {end_date}, "
+          f"events {event_start_date} ~ {event_start_date + np.timedelta64(n_days - 1, 'D')}, {n_days}일)")
+
+    # 신규 고객 및 첫 구매
+    n_new = int(round(state["daily_signups"] * n_days))
+    customers = generate_customers(
+        n_customers=n_new, seed=customer_seed, start_date=start_date, end_date=end_date
+    )
+    customers["customer_id"] += state["max_customer_id"]
+    workload = PROFILES[profile]
+    transactions = generate_transactions(
+        customers, seed=transaction_seed, end_date=end_date, profile=workload
+    )
+
+    # 기존 활성 고객 재구매
+    active_ids = existing.loc[existing["is_churned"] == 0, "customer_id"].to_numpy()
+    repeat = generate_repeat_transactions(
+        active_ids,
+        n_transactions=int(round(state["daily_transactions"] * n_days)),
+        start_date=start_date,
+        end_date=end_date,
+        seed=repeat_seed,
+        profile=workload
+    )
+    transactions = pd.concat([transactions, repeat], ignore_index=True)
+    transactions["transaction_id"] = np.arange(
+        state["max_transaction_id"] + 1, state["max_transaction_id"] + 1 + len(transactions)
+    )
+
+    all_customers = pd.concat(
+        [existing[["customer_id", "acquisition_channel"]],
+         customers[["customer_id", "acquisition_channel"]].astype({"acquisition_channel": str})],
+        ignore_index=True
+    )
+
+    event_batches = iter_event_batches(
+        all_customers,
+        seed=event_seed,
+        start_date=event_start_date,
+        n_days=n_days,
+        session_rate=DAILY_SESSION_RATE,
+        first_event_id=state["next_event_id"],
+        profile=workload
+    )
+
+    manifest = read_manifest(SHARD_DIR)
+    with BulkLoader(DB_PATH, append=True) as loader, \
+            (ShardedLoader(SHARD_DIR, manifest["n_shards"], append=True) if manifest else nullcontext()) as sharded:
+        if sharded:
+            sharded.append("customers", customers)
+            sharded.append("transactions", transactions)
+            event_batches = sharded.tee("events", event_batches)
+        loader.append("customers", customers)
+        loader.append("transactions", transactions)
+        if compact_events:
+            loader.load("events_compact", map(compact_event_batch, event_batches))
+            loader.finish(INDEXES + COMPACT_EVENT_INDEXES)
+        elif partitions:
+            for batch in event_batches:
+                loader.append_partitioned("events", batch, "event_date")
+            # 새 달 파티션이 생겼을 수 있으므로 뷰를 다시 만듦
+            loader.create_partition_view("events")
+            loader.finish(INDEXES + EVENT_INDEXES)
+        else:
+            loader.load("events", event_batches)
+            loader.finish(INDEXES + EVENT_INDEXES)
+
+        if sharded:
+            sharded.finish(INDEXES + EVENT_INDEXES)
+
+    if manifest:
+        write_manifest(SHARD_DIR, manifest["n_shards"], loader.catalog.fingerprint)
+    print(f"증분 추가 완료: {DB_PATH} (fingerprint={loader.catalog.fingerprint})")
+    for table in ("customers", "transactions"):
+        print(f"- {table}: +{loader.row_counts.get(table, 0)} rows")
+    event_table = "events_compact" if compact_events else "events"
+    print(f"- events: +{loader.row_counts.get(event_table, 0)} rows")
+
+
+def _has_compact_events(conn: sqlite3.Connection) -> bool:
+    """events가 압축 저장(events_compact + 뷰)인지 여부"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_compact'"
+    ).fetchone() is not None
+
+
+def _read_append_state(
+    conn: sqlite3.Connection,
+    compact_events: bool = False,
+    partitions: dict[str, str] | None = None
+) -> dict:
+    """증분 추가에 필요한 현재 데이터 상태 (테이블별 마지막 날짜, 다음 ID, 최근 일평균량)"""
+    if compact_events:
+        # 뷰를 거치면 행마다 디코딩하므로 정수 컬럼에서 직접 조회
+        max_event_date, last_event_id = conn.execute(
+            "SELECT date(MAX(event_ts), 'unixepoch'), MAX(event_id) FROM events_compact"
+        ).fetchone()
+    elif partitions:
+        # UNION ALL 뷰의 MAX는 모든 파티션을 읽으므로 파티션별로 조회
+        last_partition = list(partitions.values())[-1]
+        max_event_date = conn.execute(f"SELECT MAX(event_date) FROM {last_partition}").fetchone()[0]
+        last_ids = [
+            _last_id(conn, table, "CAST(substr(event_id, 2) AS INTEGER)") for table in partitions.values()
+        ]
+        last_event_id = max((i for i in last_ids if i is not None), default=None)
+    else:
+        max_event_date = conn.execute("SELECT MAX(event_date) FROM events").fetchone()[0]
+        last_event_id = _last_id(conn, "events", "CAST(substr(event_id, 2) AS INTEGER)")
+
+    # 고객/거래와 이벤트는 달력이 다르므로(거래는 RFM 기준일까지) 각자 마지막 날짜 다음날부터 이어 붙임
+    sales_max_date = max(
+        conn.execute("SELECT MAX(signup_date) FROM customers").fetchone()[0],
+        conn.execute("SELECT MAX(transaction_date) FROM transactions").fetchone()[0],
+    )
+
+    max_transaction_id = _last_id(conn, "transactions", "transaction_id")
 
+    return {
+        "sales_max_date": np.datetime64(sales_max_date[:10], "D"),
+        "event_max_date": np.datetime64(max_event_date[:10], "D"),
+        "max_customer_id": conn.execute("SELECT MAX(customer_id) FROM customers").fetchone()[0] or 0,
+        "max_transaction_id": max_transaction_id or 0,
+        "next_event_id": last_event_id + 1 if last_event_id is not None else 0,
+        # 테이블마다 마지막 날짜가 다르고 공백 기간이 있을 수 있으므로
+        # 각 테이블에서 데이터가 있는 최근 30일 기준 일평균
+        "daily_signups": _recent_daily_rate(conn, "customers", "signup_date"),
+        "daily_transactions": _recent_daily_rate(conn, "transactions", "transaction_date"),
+    }
 
-def generate_events(customers: pd.DataFrame, seed: int = 42) -> pd.DataFrame:
+
+def _last_id(conn: sqlite3.Connection, table: str, id_expr: str) -> int | None:
+    """마지막으로 삽입된 행의 ID (행이 없으면 None)"""
+    if _is_without_rowid(conn, table):
+        # 클러스터드 테이블은 삽입 순서(rowid)가 없으므로 전체에서 최댓값
+        return conn.execute(f"SELECT MAX({id_expr}) FROM {table}").fetchone()[0]
+
+    # 힙 테이블은 삽입 순서대로 ID가 증가하므로 마지막 rowid만 확인
+    row = conn.execute(f"SELECT {id_expr} FROM {table} ORDER BY rowid DESC LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+def _recent_daily_rate(conn: sqlite3.Connection, table: str, date_column: str, days: int = 30) -> float:
+    """데이터가 있는 최근 days일 동안의 일평균 행 수"""
+    return conn.execute(f"""
+        SELECT COUNT(*) * 1.0 / {days}
+        FROM {table}
+        WHERE {date_column} >= (
+            SELECT MIN(d) FROM (
+                SELECT DISTINCT {date_column} AS d FROM {table} ORDER BY d DESC LIMIT {days}
+            )
+        )
+    """).fetchone()[0] or 0.0
+
+
+EVENT_TYPES = ["page_view", "product_view", "add_to_cart", "checkout_start", "purchase"]
+# 각 단계별 전환율 (이전 단계 도달 시 다음 단계로 진행할 확률)
+CONVERSION_PROBS = [1.0, 0.6, 0.25, 0.15, 0.08]
+DEVICES = ["mobile", "desktop", "tablet"]
+DEVICE_PROBS = [0.6, 0.35, 0.05]
+PAGE_URLS = ["/home"] + [f"/{t}" for t in EVENT_TYPES[1:]]
+
+EVENT_START_DATE = np.datetime64("2023-01-01", "D")
+EVENT_DAYS = 730
+EVENT_BATCH_SIZE = 100_000
+# 난수 스트림 단위 (고객 수) - 블록마다 시드에서 파생한 독립 스트림을 써서 결과가 batch_size와 무관
+EVENT_RNG_BLOCK = 1_000
+# 세션 내 마지막 이벤트의 최대 경과 시간 (분): 29분 간격 x 4회
+MAX_SESSION_MINUTES = 29 * (len(EVENT_TYPES) - 1)
+# 사용자당 평균 세션 수 (1~19 균등 → 10회) / 전체 기간
+DAILY_SESSION_RATE = 10 / EVENT_DAYS
+
+EVENT_COLUMNS = [
+    "event_id", "user_id", "session_id", "event_type", "event_date",
+    "event_timestamp", "page_url", "device", "channel"
+]
+
+
+def generate_events(
+    customers: pd.DataFrame,
+    seed: int = 42,
+    batch_size: int = EVENT_BATCH_SIZE,
+    profile: WorkloadProfile = DEFAULT_PROFILE
+) -> pd.DataFrame:
     """
     Funnel 분석용 이벤트 로그 생성
 
@@ -71,50 +959,368 @@ def generate_events(customers: pd.DataFrame, seed: int = 42) -> pd.DataFrame:
     - checkout_start: 결제 시작
     - purchase: 구매 완료
     """
-    np.random.seed(seed)
-    random.seed(seed)
+    batches = list(iter_event_batches(customers, seed=seed, batch_size=batch_size, profile=profile))
+    if not batches:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    return pd.concat(batches, ignore_index=True)
+
+
+def iter_event_batches(
+    customers: pd.DataFrame,
+    seed: int = 42,
+    batch_size: int = EVENT_BATCH_SIZE,
+    start_date: np.datetime64 = EVENT_START_DATE,
+    n_days: int = EVENT_DAYS,
+    session_rate: float | None = None,
+    first_event_id: int = 0,
+    profile: WorkloadProfile = DEFAULT_PROFILE
+):
+    """
+    고객 batch_size명 단위로 이벤트 DataFrame을 생성하는 제너레이터
+
+    세션 수, 퍼널 깊이, 타임스탬프, 디바이스를 배열로 한 번에 추출하므로
+    고객 수가 늘어나도 메모리 사용량은 배치 크기에 비례합니다.
+    난수는 고객 EVENT_RNG_BLOCK명 블록마다 SeedSequence(seed)에서 파생한 스트림으로 뽑으므로
+    같은 seed면 batch_size와 관계없이 항상 같은 이벤트를 반환합니다 (배치는 블록 단위로 반올림).
+
+    Args:
+        start_date, n_days: 세션 발생 기간
+        session_rate: 사용자당 일 평균 세션 수. None이면 기간 전체에 1~19회 균등,
+            값이 있으면 포아송(session_rate x n_days)회 (증분 추가용)
+        first_event_id: 첫 이벤트의 event_id 번호
+        profile: 분포 프로파일. Zipf 프로파일이면 사용자별 세션 수가 user_id로 고정되고
+            (증분 추가 시 그 수를 기간에 비례해 포아송 추출), 핫 데이에 세션이 몰림
+    """
+    seed_seq = np.random.SeedSequence(seed)
+    user_ids = customers["customer_id"].to_numpy()
+    channel_codes, channel_values = pd.factorize(customers["acquisition_channel"].to_numpy())
+    batch_users = max(1, round(batch_size / EVENT_RNG_BLOCK)) * EVENT_RNG_BLOCK
+
+    next_event_id = first_event_id
+    for batch_start in range(0, len(customers), batch_users):
+        batch_end = min(batch_start + batch_users, len(customers))
+        blocks = []
+        for start in range(batch_start, batch_end, EVENT_RNG_BLOCK):
+            # 블록 번호로 파생한 스트림 (SeedSequence.spawn과 같은 키)
+            rng = np.random.default_rng(
+                np.random.SeedSequence(seed_seq.entropy, spawn_key=(start // EVENT_RNG_BLOCK,))
+            )
+            block = _draw_event_block(
+                rng, user_ids[start:start + EVENT_RNG_BLOCK], n_days, session_rate, profile
+            )
+            block["user_idx"] += start - batch_start
+            blocks.append(block)
+        draws = {name: np.concatenate([block[name] for block in blocks]) for name in blocks[0]}
+        batch = _event_frame(
+            draws,
+            user_ids[batch_start:batch_end],
+            channel_codes[batch_start:batch_end],
+            channel_values,
+            next_event_id,
+            start_date,
+            n_days
+        )
+        next_event_id += len(batch)
+        yield batch
+
+@lru_cache(maxsize=4)
+def _timestamp_lookup(start_date: np.datetime64, n_days: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    이벤트 날짜/타임스탬프 문자열 조합표
+
+    세션은 자정에 시작하므로 타임스탬프는 (일자, 분 오프셋) 조합으로 결정됩니다.
+    행마다 포맷하는 대신 조합표를 한 번 만들어 두고 인덱싱합니다.
+    """
+    days = start_date + np.arange(n_days)
+    minutes = np.arange(MAX_SESSION_MINUTES + 1).astype("timedelta64[m]")
+    timestamps = (days.astype("datetime64[m]")[:, None] + minutes[None, :]).ravel()
+
+    date_strs = np.datetime_as_string(days)
+    timestamp_strs = np.char.replace(
+        np.datetime_as_string(timestamps.astype("datetime64[s]"), unit="s"), "T", " "
+    )
+    return date_strs, timestamp_strs
+
+
+def _draw_event_block(
+    rng: np.random.Generator,
+    user_ids: np.ndarray,
+    n_days: int = EVENT_DAYS,
+    session_rate: float | None = None,
+    profile: WorkloadProfile = DEFAULT_PROFILE
+) -> dict[str, np.ndarray]:
+    """고객 블록 하나의 이벤트를 배열로 추출 (user_idx는 블록 안 고객 위치, 이벤트 순서대로)"""
+    n_steps = len(EVENT_TYPES)
+
+    # 사용자당 세션 수 (기본: 1~19, Zipf 프로파일: 소수 헤비 유저에 집중)
+    if profile.session_zipf_a is not None:
+        n_sessions = profile.user_session_counts(user_ids)
+        if session_rate is not None:
+            n_sessions = rng.poisson(n_sessions * n_days / EVENT_DAYS)
+    elif session_rate is None:
+        n_sessions = rng.integers(1, 20, size=len(user_ids))
+    else:
+        n_sessions = rng.poisson(session_rate * n_days, size=len(user_ids))
+    session_user = np.repeat(np.arange(len(user_ids)), n_sessions)
+    total_sessions = len(session_user)
+
+    # 세션 시작일 (자정 기준) 및 세션 ID
+    session_day = profile.sample_days(rng, n_days, total_sessions)
+    session_num = rng.integers(100000, 999999, size=total_sessions)
+
+    # Funnel 진행: 단계별로 독립 추출 후 첫 이탈 지점까지만 유지
+    reached = np.cumprod(
+        rng.random((total_sessions, n_steps)) <= np.asarray(CONVERSION_PROBS),
+        axis=1
+    ).astype(bool)
+
+    # 다음 이벤트까지 시간 간격 (1~29분)의 누적합
+    gaps = rng.integers(1, 30, size=(total_sessions, n_steps - 1))
+    offsets = np.zeros((total_sessions, n_steps), dtype=np.int64)
+    np.cumsum(gaps, axis=1, out=offsets[:, 1:])
+
+    session_idx, step_idx = np.nonzero(reached)
+    device_codes = rng.choice(len(DEVICES), size=len(session_idx), p=DEVICE_PROBS)
+
+    return {
+        "user_idx": session_user[session_idx],
+        "session_num": session_num[session_idx],
+        "step_idx": step_idx,
+        "event_day": session_day[session_idx],
+        "minute": offsets[session_idx, step_idx],
+        "device_code": device_codes,
+    }
+
+
+def _event_frame(
+    draws: dict[str, np.ndarray],
+    user_ids: np.ndarray,
+    channel_codes: np.ndarray,
+    channel_values: np.ndarray,
+    first_event_id: int = 0,
+    start_date: np.datetime64 = EVENT_START_DATE,
+    n_days: int = EVENT_DAYS
+) -> pd.DataFrame:
+    """추출한 배열로 이벤트 로그 DataFrame을 컬럼 단위로 구성 (배치당 한 번)"""
+    # 날짜/시각 문자열은 (일자, 분 오프셋) 조합표에서 인덱싱
+    date_strs, timestamp_strs = _timestamp_lookup(np.datetime64(start_date, "D"), n_days)
+    event_day = draws["event_day"]
+    timestamp_idx = event_day * (MAX_SESSION_MINUTES + 1) + draws["minute"]
+
+    step_idx = draws["step_idx"]
+    user_idx = draws["user_idx"]
+    event_ids = np.arange(first_event_id, first_event_id + len(step_idx))
+
+    # 반복 값이 많은 컬럼은 코드 + 카테고리로 구성해 행 단위 문자열 생성을 피함
+    return pd.DataFrame({
+        "event_id": np.char.add("E", event_ids.astype(str)),
+        "user_id": user_ids[user_idx],
+        "session_id": np.char.add("S", draws["session_num"].astype(str)),
+        "event_type": pd.Categorical.from_codes(step_idx, EVENT_TYPES),
+        "event_date": pd.Categorical.from_codes(event_day, date_strs, ordered=True),
+        "event_timestamp": pd.Categorical.from_codes(timestamp_idx, timestamp_strs, ordered=True),
+        "page_url": pd.Categorical.from_codes(step_idx, PAGE_URLS),
+        "device": pd.Categorical.from_codes(draws["device_code"], DEVICES),
+        "channel": pd.Categorical.from_codes(channel_codes[user_idx], channel_values)
+    }, columns=EVENT_COLUMNS)
+
+
+# 압축 이벤트 저장 (--compact-events)
+# 반복 문자열 컬럼은 작은 정수 코드 + 조회 테이블, ID는 정수, 시각은 epoch 초로 저장합니다.
+COMPACT_EVENT_COLUMNS = [
+    "event_id", "user_id", "session_id", "event_type_id", "device_id", "channel_id", "event_ts"
+]
+EVENT_CHANNELS = list(CHANNELS)
+
+
+def event_lookup_tables() -> dict[str, pd.DataFrame]:
+    """코드 → 값 조회 테이블 (코드는 0부터, 리스트 순서)"""
+    return {
+        "event_types": pd.DataFrame({
+            "event_type_id": np.arange(len(EVENT_TYPES)),
+            "event_type": EVENT_TYPES,
+            "page_url": PAGE_URLS,
+        }),
+        "devices": pd.DataFrame({"device_id": np.arange(len(DEVICES)), "device": DEVICES}),
+        "channels": pd.DataFrame({"channel_id": np.arange(len(EVENT_CHANNELS)), "channel": EVENT_CHANNELS}),
+    }
+
+
+def _decode_case(code_column: str, values: list[str]) -> str:
+    """정수 코드 → 문자열 CASE 식"""
+    branches = " ".join(f"WHEN {code} THEN '{value}'" for code, value in enumerate(values))
+    return f"CASE {code_column} {branches} END"
+
+
+# 기존 events 컬럼 계약을 그대로 제공하는 뷰
+# 코드 디코딩은 조회 테이블 JOIN보다 CASE 식이 빠르므로 (행마다 B-tree 탐색이 없음) CASE로 풀어 씀
+COMPACT_EVENTS_VIEW = f"""
+SELECT
+    'E' || e.event_id AS event_id,
+    e.user_id,
+    'S' || e.session_id AS session_id,
+    {_decode_case("e.event_type_id", EVENT_TYPES)} AS event_type,
+    date(e.event_ts, 'unixepoch') AS event_date,
+    datetime(e.event_ts, 'unixepoch') AS event_timestamp,
+    {_decode_case("e.event_type_id", PAGE_URLS)} AS page_url,
+    {_decode_case("e.device_id", DEVICES)} AS device,
+    {_decode_case("e.channel_id", EVENT_CHANNELS)} AS channel,
+    e.event_day,
+    e.event_hour
+FROM events_compact e
+"""
+
 
-    event_types = ["page_view", "product_view", "add_to_cart", "checkout_start", "purchase"]
-    # 각 단계별 전환율 (누적)
-    conversion_probs = [1.0, 0.6, 0.25, 0.15, 0.08]
+def compact_event_batch(events: pd.DataFrame) -> pd.DataFrame:
+    """이벤트 DataFrame(문자열 컬럼)을 events_compact 행(정수 컬럼)으로 변환"""
+    timestamps = pd.Categorical(events["event_timestamp"])
+    epoch_seconds = np.asarray(timestamps.categories, dtype="datetime64[s]").astype(np.int64)
 
-    events = []
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime(2024, 12, 31)
+    return pd.DataFrame({
+        "event_id": _strip_id_prefix(events["event_id"]),
+        "user_id": events["user_id"].to_numpy(),
+        "session_id": _strip_id_prefix(events["session_id"]),
+        "event_type_id": _lookup_codes(events["event_type"], EVENT_TYPES),
+        "device_id": _lookup_codes(events["device"], DEVICES),
+        "channel_id": _lookup_codes(events["channel"], EVENT_CHANNELS),
+        "event_ts": epoch_seconds[timestamps.codes],
+    }, columns=COMPACT_EVENT_COLUMNS)
 
-    for _, customer in customers.iterrows():
-        user_id = customer["customer_id"]
 
-        # 사용자당 세션 수
-        n_sessions = np.random.randint(1, 20)
+def _lookup_codes(values: pd.Series, dictionary: list[str]) -> np.ndarray:
+    """값 → 조회 테이블 코드"""
+    codes = pd.Categorical(values, categories=dictionary).codes
+    if (codes < 0).any():
+        unknown = sorted(set(values[codes < 0]))
+        raise ValueError(f"조회 테이블에 없는 값: {unknown}")
+    return codes.astype(np.int64)
 
-        for _ in range(n_sessions):
-            session_date = start_date + timedelta(days=np.random.randint(0, 730))
-            session_id = f"S{np.random.randint(100000, 999999)}"
 
-            # Funnel 진행
-            current_time = session_date
-            for i, (event_type, prob) in enumerate(zip(event_types, conversion_probs)):
-                if np.random.random() > prob:
-                    break
+def _strip_id_prefix(values: pd.Series) -> np.ndarray:
+    """'E123', 'S456789' 형태의 ID에서 접두 문자를 떼고 정수로 변환"""
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
 
-                events.append({
-                    "event_id": f"E{len(events)}",
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "event_type": event_type,
-                    "event_date": current_time.strftime("%Y-%m-%d"),
-                    "event_timestamp": current_time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "page_url": f"/{'home' if i == 0 else event_type}",
-                    "device": np.random.choice(["mobile", "desktop", "tablet"], p=[0.6, 0.35, 0.05]),
-                    "channel": customer["acquisition_channel"]
-                })
+    # 고정폭 유니코드 배열의 코드포인트를 자릿수 단위로 누적 (행마다 int() 호출 없음)
+    chars = np.asarray(values, dtype=str)
+    codepoints = chars.view(np.uint32).reshape(len(chars), -1)[:, 1:]
+    ids = np.zeros(len(chars), dtype=np.int64)
+    for column in codepoints.T:
+        digit = column != 0
+        ids[digit] = ids[digit] * 10 + (column[digit].astype(np.int64) - ord("0"))
+    return ids
 
-                # 다음 이벤트까지 시간 간격
-                current_time += timedelta(minutes=np.random.randint(1, 30))
 
-    return pd.DataFrame(events)
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="학습용 SQLite 데이터베이스 생성")
+    parser.add_argument(
+        "--scale-factor", type=int, default=1, choices=SCALE_FACTORS,
+        help=f"데이터 규모 (SF1 = 고객 {BASE_CUSTOMERS:,}명)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="샤드 생성 프로세스 수 (기본값: CPU 코어 수)"
+    )
+    parser.add_argument(
+        "--append", action="store_true",
+        help="기존 DB를 다시 만들지 않고 다음 --days일치 데이터를 추가"
+    )
+    parser.add_argument(
+        "--days", type=int, default=1,
+        help="--append 시 추가할 일수 (기본값: 1)"
+    )
+    parser.add_argument(
+        "--profile", default="default", choices=sorted(PROFILES),
+        help="데이터 분포 프로파일 (zipf_users: 헤비 유저 쏠림, hot_days: 특정일 급증, "
+             "long_tail: 고액 거래 꼬리, skewed: 전부 적용)"
+    )
+    parser.add_argument(
+        "--compact-events", action="store_true",
+        help="events를 정수 코드 테이블(events_compact) + 조회 테이블로 저장하고 events는 뷰로 제공"
+    )
+    parser.add_argument(
+        "--clustered", action="store_true",
+        help="events / transactions를 (user_id, event_type) / (customer_id, transaction_date) 순서의 "
+             "WITHOUT ROWID 테이블로 저장"
+    )
+    parser.add_argument(
+        "--partition-events", action="store_true",
+        help="events를 월별 테이블(events_YYYY_MM)에 나눠 저장하고 events는 UNION ALL 뷰로 제공"
+    )
+    parser.add_argument(
+        "--shards", type=int, default=0,
+        help="customers / transactions / events를 고객 해시로 나눈 샤드 파일 N개도 생성 (map-reduce 집계용)"
+    )
+    parser.add_argument(
+        "--export-parquet", action="store_true",
+        help="생성/추가 후 customers / transactions / events를 월별 row group Parquet로 내보내기 (pyarrow 필요)"
+    )
+    parser.add_argument(
+        "--export-columns", action="store_true",
+        help="생성/추가 후 테이블을 컬럼별 .npy 파일로 내보내기 (대시보드/노트북이 mmap으로 읽음)"
+    )
+    parser.add_argument(
+        "--fixture", action="store_true",
+        help=f"crm.db 대신 테스트용 미니 DB({FIXTURE_PATH.name}, SF1 고객 {FIXTURE_FRACTION:.0%} 표본)만 생성"
+    )
+    parser.add_argument(
+        "--snapshot", action="store_true",
+        help="생성/추가 후 crm.db를 압축 스냅샷으로 저장 (새 환경의 앱이 생성 대신 복원)"
+    )
+    parser.add_argument(
+        "--tune-indexes", action="store_true",
+        help="생성 후 정답 쿼리 워크로드로 인덱스 어드바이저를 실행해 추천 인덱스를 적용"
+    )
+    parser.add_argument(
+        "--refresh-catalog", action="store_true",
+        help="데이터는 그대로 두고 기존 crm.db의 스키마 카탈로그와 지문만 다시 만들기 "
+             "(이전 버전 스크립트로 만들었거나 직접 수정한 DB용 - 앱은 카탈로그를 만들지 않음)"
+    )
+    args = parser.parse_args(argv)
+    if args.days < 1:
+        parser.error("--days는 1 이상이어야 합니다.")
+    if args.shards < 0:
+        parser.error("--shards는 0 이상이어야 합니다.")
+    if args.compact_events and args.partition_events:
+        parser.error("--compact-events와 --partition-events는 함께 사용할 수 없습니다.")
+    if args.fixture and (args.append or args.shards or args.scale_factor != 1):
+        parser.error("--fixture는 --append / --shards / --scale-factor와 함께 사용할 수 없습니다.")
+    return args
 
 
 if __name__ == "__main__":
-    create_database()
+    args = parse_args()
+    if args.refresh_catalog:
+        catalog = refresh_catalog(DB_PATH, SCHEMA_VERSION)
+        print(f"카탈로그 갱신 완료: {DB_PATH} (지문 {catalog.fingerprint})")
+        sys.exit(0)
+    if args.fixture:
+        create_fixture(profile=args.profile)
+        sys.exit(0)
+    if args.append:
+        append_days(n_days=args.days, profile=args.profile)
+    else:
+        create_database(
+            scale_factor=args.scale_factor,
+            workers=args.workers,
+            profile=args.profile,
+            compact_events=args.compact_events,
+            clustered=args.clustered,
+            tune_indexes=args.tune_indexes,
+            partition_events=args.partition_events,
+            shards=args.shards
+        )
+    if args.export_parquet:
+        manifest = export_parquet(DB_PATH)
+        print(f"Parquet 내보내기 완료: {PARQUET_DIR}")
+        for table, info in manifest["tables"].items():
+            print(f"- {table}: {info['rows']} rows, {len(info['row_groups'])} row groups (월별)")
+    if args.export_columns:
+        manifest = export_columns(DB_PATH)
+        print(f"컬럼 저장소 내보내기 완료: {COLUMN_DIR}")
+        for table, info in manifest["tables"].items():
+            print(f"- {table}: {info['rows']} rows, {len(info['columns'])} columns")
+    if args.snapshot:
+        snapshot = create_snapshot(DB_PATH)
+        print(f"스냅샷 저장 완료: {snapshot.path} ({snapshot.path.stat().st_size:,} bytes)")
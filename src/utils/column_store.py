@@ -0,0 +1,277 @@
+"""
+메모리 매핑 NumPy 컬럼 저장소
+
+crm.db의 테이블을 컬럼별 .npy 파일로 내보내고, np.load(mmap_mode='r')로 읽습니다.
+pd.read_sql_query처럼 행마다 Python 객체를 만들지 않고, 파일이 OS 페이지 캐시에 한 번만 올라가
+Streamlit 세션과 워커 프로세스가 같은 메모리를 공유합니다.
+
+- 파일: learning/data/columns/{table}/{column}.npy
+- 숫자 컬럼: int64 / float64 배열 그대로 (NULL이 있는 정수 컬럼은 float64 + NaN)
+- 문자열 컬럼: 고유값이 DICT_MAX_VALUES 이하면 사전 코드(uint8/uint16) + {column}.dict.npy(정렬된 고유값)
+  사전이 정렬되어 있으므로 코드 비교 = 문자열 비교 (날짜 범위 조건도 코드로 계산 가능)
+  NULL은 사전 밖의 코드 len(사전)으로 저장 (정렬 순서상 모든 값 뒤)
+  고유값이 더 많은 컬럼(event_id 등)은 고정 길이 유니코드 배열 + NULL이 있으면 {column}.valid.npy(bool)
+- NULL 확인: table.is_null(column) / decode()와 to_frame()은 NULL을 None/NaN으로 되돌림
+
+    from src.utils.column_store import load_table
+    events = load_table("events")
+    purchase = events["event_type"] == events.code("event_type", "purchase")
+    buyers = np.unique(events["user_id"][purchase]).size
+
+실행: python -m src.utils.column_store                 # 내보내기
+      python learning/setup_database.py --export-columns
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DB_PATH = PROJECT_ROOT / "learning" / "data" / "crm.db"
+COLUMN_DIR = DB_PATH.parent / "columns"
+MANIFEST_NAME = "manifest.json"
+
+TABLES = ("customers", "transactions", "events", "campaigns")
+# 문자열 컬럼을 사전 인코딩하는 최대 고유값 수 (uint16 코드, NULL 코드 하나를 남김)
+DICT_MAX_VALUES = 65_535
+EXPORT_CHUNK_ROWS = 200_000
+
+
+@dataclass
+class ColumnTable:
+    """mmap으로 연 테이블 하나 (배열은 읽기 전용)"""
+    name: str
+    n_rows: int
+    arrays: dict[str, np.ndarray]  # 숫자 값 또는 사전 코드
+    dictionaries: dict[str, np.ndarray]  # 사전 인코딩 컬럼 → 정렬된 고유값
+    null_codes: dict[str, int] = field(default_factory=dict)  # NULL이 있는 사전 컬럼 → NULL 코드
+    valid: dict[str, np.ndarray] = field(default_factory=dict)  # NULL이 있는 문자열 컬럼 → 값 있음 여부
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.arrays[column]
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.arrays)
+
+    def code(self, column: str, value: str) -> int:
+        """사전 인코딩 컬럼에서 value의 코드 (값이 없으면 -1 - 어떤 코드와도 같지 않음)"""
+        dictionary = self.dictionaries[column]
+        i = int(np.searchsorted(dictionary, value))
+        return i if i < len(dictionary) and dictionary[i] == value else -1
+
+    def is_null(self, column: str) -> np.ndarray:
+        """컬럼의 NULL 여부 (bool 배열)"""
+        values = self.arrays[column]
+        if column in self.null_codes:
+            return values == self.null_codes[column]
+        if column in self.valid:
+            return ~self.valid[column]
+        if values.dtype.kind == "f":
+            return np.isnan(values)
+        return np.zeros(len(values), dtype=bool)
+
+    def decode(self, column: str, codes: np.ndarray | None = None) -> np.ndarray:
+        """사전 코드 → 문자열 (codes가 없으면 컬럼 전체, NULL 코드는 None)"""
+        codes = np.asarray(self.arrays[column] if codes is None else codes)
+        null_code = self.null_codes.get(column)
+        if null_code is None:
+            return self.dictionaries[column][codes]
+        null = codes == null_code
+        result = self.dictionaries[column][np.where(null, 0, codes)].astype(object)
+        result[null] = None
+        return result
+
+    def to_frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """DataFrame으로 변환 (사전 컬럼은 코드를 그대로 쓰는 Categorical, NULL은 결측값)"""
+        data = {}
+        for column in columns or self.columns:
+            if column in self.dictionaries:
+                codes = np.asarray(self.arrays[column], dtype=np.int32)
+                if column in self.null_codes:
+                    codes = np.where(codes == self.null_codes[column], -1, codes)
+                data[column] = pd.Categorical.from_codes(codes, self.dictionaries[column])
+            elif column in self.valid:
+                values = np.asarray(self.arrays[column]).astype(object)
+                values[~self.valid[column]] = None
+                data[column] = values
+            else:
+                data[column] = self.arrays[column]
+        return pd.DataFrame(data)
+
+
+def export_columns(db_path: Path = DB_PATH, column_dir: Path = COLUMN_DIR) -> dict:
+    """
+    crm.db → 컬럼별 .npy 파일
+
+    행 수만큼 미리 만든 np.lib.format.open_memmap 파일에 청크 단위로 채우므로
+    메모리 사용량은 청크 크기에 비례합니다. 임시 디렉터리에 만든 뒤 교체하므로
+    이미 mmap으로 연 프로세스는 이전 파일을 계속 안전하게 읽습니다.
+
+    Returns:
+        dict: manifest (원본 DB 지문, 테이블별 행 수와 컬럼 형식)
+    """
+    build_dir = column_dir.with_name(column_dir.name + ".building")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    build_dir.mkdir(parents=True)
+
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        fingerprint = conn.execute("SELECT value FROM db_meta WHERE key = 'fingerprint'").fetchone()
+        manifest = {"fingerprint": fingerprint[0] if fingerprint else None, "tables": {}}
+        for table in TABLES:
+            manifest["tables"][table] = _export_table(conn, table, build_dir / table)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    finally:
+        conn.close()
+
+    (build_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+    old_dir = column_dir.with_name(column_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if column_dir.exists():
+        os.replace(column_dir, old_dir)
+    os.replace(build_dir, column_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def read_manifest(column_dir: Path = COLUMN_DIR) -> dict | None:
+    """컬럼 저장소 manifest (없으면 None)"""
+    path = column_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+# 프로세스 단위 캐시: (디렉터리, 테이블) → (manifest 수정 시각, ColumnTable)
+_cache: dict[tuple[Path, str], tuple[int, ColumnTable]] = {}
+
+
+def load_table(table: str, column_dir: Path = COLUMN_DIR) -> ColumnTable:
+    """
+    테이블의 컬럼 파일을 mmap으로 열기 (다시 내보내기 전까지 프로세스당 한 번)
+
+    배열은 필요한 페이지만 디스크(페이지 캐시)에서 읽히고, 복사되지 않습니다.
+    """
+    manifest_path = column_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise FileNotFoundError(
+            f"{column_dir}에 컬럼 저장소가 없습니다. python -m src.utils.column_store로 내보내세요."
+        )
+    version = manifest_path.stat().st_mtime_ns
+    cached = _cache.get((column_dir, table))
+    if cached and cached[0] == version:
+        return cached[1]
+
+    info = json.loads(manifest_path.read_text())["tables"][table]
+    table_dir = column_dir / table
+    arrays, dictionaries, null_codes, valid = {}, {}, {}, {}
+    for column, spec in info["columns"].items():
+        arrays[column] = np.load(table_dir / f"{column}.npy", mmap_mode="r")
+        if spec["kind"] == "dictionary":
+            dictionaries[column] = np.load(table_dir / f"{column}.dict.npy", mmap_mode="r")
+            if spec.get("nullable"):
+                null_codes[column] = spec["values"]
+        elif spec["kind"] == "string" and spec.get("nullable"):
+            valid[column] = np.load(table_dir / f"{column}.valid.npy", mmap_mode="r")
+
+    result = ColumnTable(
+        name=table, n_rows=info["rows"], arrays=arrays, dictionaries=dictionaries,
+        null_codes=null_codes, valid=valid,
+    )
+    _cache[(column_dir, table)] = (version, result)
+    return result
+
+
+def _export_table(conn: sqlite3.Connection, table: str, table_dir: Path) -> dict:
+    """테이블 하나를 컬럼 파일로 내보내기"""
+    table_dir.mkdir(parents=True)
+    n_rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")]
+
+    specs, outputs, dictionaries, valid = {}, {}, {}, {}
+    for column in columns:
+        value_type = conn.execute(
+            f"SELECT typeof({column}) FROM {table} WHERE {column} IS NOT NULL LIMIT 1"
+        ).fetchone()
+        value_type = value_type[0] if value_type else "text"
+        nullable = conn.execute(f"SELECT 1 FROM {table} WHERE {column} IS NULL LIMIT 1").fetchone() is not None
+
+        if value_type in ("integer", "real"):
+            # 정수 컬럼의 NULL은 int64로 표현할 수 없으므로 float64 + NaN
+            integer = value_type == "integer" and not nullable
+            dtype = np.dtype(np.int64 if integer else np.float64)
+            specs[column] = {"kind": "numeric", "dtype": dtype.str, "nullable": nullable}
+        else:
+            values = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL "
+                f"ORDER BY {column} LIMIT {DICT_MAX_VALUES + 1}"
+            )]
+            if len(values) <= DICT_MAX_VALUES:
+                dictionary = np.array([str(v) for v in values])
+                np.save(table_dir / f"{column}.dict.npy", dictionary)
+                dictionaries[column] = dictionary
+                n_codes = len(values) + nullable  # NULL 코드 = len(values)
+                dtype = np.dtype(np.uint8 if n_codes <= 256 else np.uint16)
+                specs[column] = {
+                    "kind": "dictionary", "dtype": dtype.str, "values": len(values), "nullable": nullable
+                }
+            else:
+                width = conn.execute(f"SELECT MAX(LENGTH({column})) FROM {table}").fetchone()[0] or 1
+                dtype = np.dtype(f"<U{width}")
+                specs[column] = {"kind": "string", "dtype": dtype.str, "nullable": nullable}
+                if nullable:
+                    valid[column] = np.lib.format.open_memmap(
+                        table_dir / f"{column}.valid.npy", mode="w+", dtype=np.bool_, shape=(n_rows,)
+                    )
+        outputs[column] = np.lib.format.open_memmap(
+            table_dir / f"{column}.npy", mode="w+", dtype=dtype, shape=(n_rows,)
+        )
+
+    offset = 0
+    for chunk in pd.read_sql_query(f"SELECT * FROM {table}", conn, chunksize=EXPORT_CHUNK_ROWS):
+        end = offset + len(chunk)
+        for column in columns:
+            series = chunk[column]
+            null = series.isna().to_numpy()
+            if column in dictionaries:
+                dictionary = dictionaries[column]
+                values = np.searchsorted(dictionary, series.fillna("").astype(str).to_numpy())
+                values[null] = len(dictionary)
+            elif specs[column]["kind"] == "string":
+                values = series.fillna("").astype(str).to_numpy()
+                if column in valid:
+                    valid[column][offset:end] = ~null
+            else:
+                values = series.to_numpy(dtype=outputs[column].dtype, na_value=np.nan)
+            outputs[column][offset:end] = values
+        offset = end
+
+    for output in [*outputs.values(), *valid.values()]:
+        output.flush()
+    return {"rows": n_rows, "columns": specs}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="crm.db → 컬럼별 .npy (mmap) 내보내기")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="원본 SQLite DB")
+    parser.add_argument("--out", type=Path, default=COLUMN_DIR, help="출력 디렉터리")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    manifest = export_columns(args.db, args.out)
+    print(f"컬럼 저장소 내보내기 완료: {args.out} (fingerprint={manifest['fingerprint']})")
+    for table, info in manifest["tables"].items():
+        kinds = [spec["kind"] for spec in info["columns"].values()]
+        print(f"- {table}: {info['rows']} rows, {len(kinds)} columns (사전 인코딩 {kinds.count('dictionary')}개)")
@@ -0,0 +1,301 @@
+"""
+읽기 전용 SQLite 연결 풀
+
+쿼리/페이지 렌더링마다 connect → 스키마 파싱 → close를 반복하는 대신, mode=ro URI로 연
+연결을 프로세스 안에서 재사용합니다. Streamlit 스크립트 스레드들이 같은 풀을 공유하고,
+연결 하나는 한 번에 한 스레드만 빌려 씁니다 (check_same_thread=False).
+
+- 크기 제한: max_size개까지 만들고, 모두 사용 중이면 timeout초 동안 반납을 기다림
+- 상태 확인: 빌려줄 때 DB 파일이 교체되었는지(inode) 확인 - 재생성/복원으로 바뀌었으면 다시 연결
+  반납할 때 열린 트랜잭션은 롤백하고, 쿼리가 실패했으면 SELECT 1로 연결이 살아 있는지 확인
+- 읽기 전용이라 학습자 쿼리가 실습 데이터를 바꿀 수 없음 (학습 진행 저장은 별도 쓰기 연결)
+
+    from src.utils.connection_pool import get_pool
+    with get_pool(DB_PATH).connection() as conn:
+        conn.execute("SELECT COUNT(*) FROM customers").fetchone()
+
+MemoryReplicaPool은 같은 방식으로 빌려 주되, 파일 대신 프로세스 메모리에 올린 복제본에 연결합니다.
+학습 진행(user_progress)처럼 앱이 계속 쓰는 테이블은 복제본에 넣지 않으므로, 이를 읽는 쿼리는
+reads_replica_excluded로 골라 파일 풀에서 실행합니다 (QueryEngine의 replica 백엔드).
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from src.utils.schema_catalog import read_fingerprint
+from src.utils.sql_fingerprint import tokenize
+
+POOL_MAX_SIZE = 8
+POOL_TIMEOUT_SECONDS = 30.0
+# 연결마다 적용: 파일을 mmap으로 읽어 연결들이 OS 페이지 캐시를 그대로 공유
+POOL_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456",  # 256MB
+)
+# 복제본에서 빼는 테이블: 앱이 계속 쓰지만 지문에는 들어가지 않아, 복제본에 두면 오래된 내용을 읽게 됨
+REPLICA_EXCLUDED_TABLES = frozenset({"user_progress"})
+
+
+@dataclass
+class PoolStats:
+    """풀 상태 (모니터링용)"""
+    size: int  # 현재 열려 있는 연결 수
+    idle: int
+    max_size: int
+    connects: int  # 누적 새 연결 수
+    checkouts: int
+    discarded: int  # 상태 확인 실패로 닫은 연결 수
+
+
+class ConnectionPool:
+    """mode=ro 연결 풀 (스레드 안전)"""
+
+    def __init__(self, db_path: Path, max_size: int = POOL_MAX_SIZE, timeout: float = POOL_TIMEOUT_SECONDS):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: list[tuple[sqlite3.Connection, tuple[int, int]]] = []
+        self._size = 0
+        self._connects = 0
+        self._checkouts = 0
+        self._discarded = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """연결 하나를 빌려 쓰고 반납"""
+        conn, file_id = self._acquire()
+        failed = False
+        try:
+            yield conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(conn, file_id, failed)
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return PoolStats(
+                size=self._size,
+                idle=len(self._idle),
+                max_size=self.max_size,
+                connects=self._connects,
+                checkouts=self._checkouts,
+                discarded=self._discarded,
+            )
+
+    def close(self):
+        """대기 중인 연결을 모두 닫음 (빌려 간 연결은 반납될 때 닫힘)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            conn.close()
+
+    def _acquire(self) -> tuple[sqlite3.Connection, tuple[int, int]]:
+        current = self._file_id()
+        stale = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("연결 풀이 닫혔습니다.")
+                    while self._idle:
+                        conn, file_id = self._idle.pop()
+                        if file_id == current:
+                            self._checkouts += 1
+                            return conn, file_id
+                        # DB 파일이 교체됨 - 이전 파일을 읽는 연결은 버림
+                        stale.append(conn)
+                        self._size -= 1
+                        self._discarded += 1
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._checkouts += 1
+                        break
+                    if not self._cond.wait(self.timeout):
+                        raise TimeoutError(
+                            f"연결 풀 대기 시간 초과 ({self.timeout:g}초, 최대 {self.max_size}개 사용 중)"
+                        )
+        finally:
+            for conn in stale:
+                conn.close()
+
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        return conn, current
+
+    def _release(self, conn: sqlite3.Connection, file_id: tuple[int, int], failed: bool):
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            if failed:
+                conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            if healthy and not self._closed and file_id == self._file_id():
+                self._idle.append((conn, file_id))
+                conn = None
+            else:
+                self._size -= 1
+                self._discarded += 1
+            self._cond.notify()
+        if conn is not None:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        for pragma in POOL_PRAGMAS:
+            conn.execute(pragma)
+        with self._cond:
+            self._connects += 1
+        return conn
+
+    def _file_id(self) -> tuple[int, int]:
+        """DB 파일 식별자 (장치, inode) - os.replace로 교체되면 바뀜. 파일이 없으면 (0, 0)"""
+        try:
+            stat = os.stat(self.db_path)
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_dev, stat.st_ino
+
+
+# 프로세스 단위: DB 경로 → 풀
+_pools: dict[Path, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Path, max_size: int = POOL_MAX_SIZE) -> ConnectionPool:
+    """DB 파일별 공유 풀 (없으면 생성)"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None or pool._closed:
+            pool = _pools[db_path] = ConnectionPool(db_path, max_size)
+        return pool
+
+
+class MemoryReplicaPool(ConnectionPool):
+    """
+    DB 파일을 프로세스당 한 번 메모리에 올린 공유 복제본의 연결 풀
+
+    backup API로 이름 있는 공유 캐시 인메모리 DB(file:...?mode=memory&cache=shared)에 복사하고,
+    세션들은 그 DB에 연결한 query_only 연결을 빌려 씁니다 - 쿼리가 디스크를 읽지 않음.
+    원본의 (inode, DB 지문)이 바뀌면(재생성/증분 추가/복원) 다음 대여 때 새 세대로 다시 복사하고,
+    이전 세대 연결은 반납될 때 닫힙니다 (마지막 연결이 닫히면 이전 복제본 메모리 해제).
+    학습 진행 저장처럼 지문이 그대로인 쓰기는 다시 로드하지 않으며, 그 테이블(REPLICA_EXCLUDED_TABLES)은
+    복제본에서 뺍니다.
+    """
+
+    def __init__(self, db_path: Path, max_size: int = POOL_MAX_SIZE, timeout: float = POOL_TIMEOUT_SECONDS):
+        super().__init__(db_path, max_size, timeout)
+        self._load_lock = threading.Lock()
+        self._holder: sqlite3.Connection | None = None  # 복제본을 살려 두는 연결
+        self._source_version: tuple[int, int, str | None] | None = None
+        self._source_stat: tuple[int, int, int] | None = None  # 마지막으로 확인한 (장치, inode, 수정 시각)
+        self._generation = 0
+
+    def close(self):
+        super().close()
+        with self._load_lock:
+            if self._holder is not None:
+                self._holder.close()
+                self._holder = None
+            self._source_version = None
+            self._source_stat = None
+
+    def _acquire(self) -> tuple[sqlite3.Connection, tuple[int, int]]:
+        self._refresh()
+        return super()._acquire()
+
+    def _refresh(self):
+        """
+        원본 DB 버전이 바뀌었으면 새 세대 복제본 로드
+
+        대여마다 stat 한 번으로 (장치, inode, 수정 시각)만 비교하고, 바뀌었을 때만 지문을 다시 읽습니다.
+        수정 시각만 바뀌고 지문이 같으면(학습 진행 저장) 다시 로드하지 않습니다.
+
+        원본 파일이 잠시 없으면(첫 실행 준비, 스냅샷 복원 중 교체) 이미 올린 세대를 계속 쓰고,
+        올린 세대도 없으면 mode=ro 연결과 같은 오류를 냅니다.
+        """
+        try:
+            stat = os.stat(self.db_path)
+        except FileNotFoundError:
+            if self._holder is not None:
+                return
+            raise sqlite3.OperationalError(f"unable to open database file: {self.db_path}") from None
+        file_stat = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        if file_stat == self._source_stat:
+            return
+        version = (stat.st_dev, stat.st_ino, read_fingerprint(self.db_path))
+        if version == self._source_version:
+            self._source_stat = file_stat
+            return
+        with self._load_lock:
+            if version == self._source_version:
+                return
+            generation = self._generation + 1
+            holder = sqlite3.connect(self._uri(generation), uri=True, check_same_thread=False)
+            source = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                source.backup(holder)
+            finally:
+                source.close()
+            for table in REPLICA_EXCLUDED_TABLES:
+                holder.execute(f"DROP TABLE IF EXISTS {table}")
+            previous, self._holder = self._holder, holder
+            self._generation, self._source_version = generation, version
+            self._source_stat = file_stat
+        if previous is not None:
+            previous.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._uri(self._generation), uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        with self._cond:
+            self._connects += 1
+        return conn
+
+    def _file_id(self) -> tuple[int, int]:
+        """복제본 세대 - 원본이 다시 로드되면 바뀜"""
+        return self._generation, 0
+
+    def _uri(self, generation: int) -> str:
+        return f"file:crm_replica_{id(self)}_{generation}?mode=memory&cache=shared"
+
+
+def reads_replica_excluded(query: str) -> bool:
+    """쿼리가 복제본에서 뺀 테이블(REPLICA_EXCLUDED_TABLES)을 참조하는지 - 참이면 파일에서 실행해야 함"""
+    return any(
+        kind in ("word", "quoted") and text.strip('"`[]').lower() in REPLICA_EXCLUDED_TABLES
+        for kind, text in tokenize(query)
+    )
+
+
+_replicas: dict[Path, MemoryReplicaPool] = {}
+
+
+def get_replica(db_path: Path, max_size: int = POOL_MAX_SIZE) -> MemoryReplicaPool:
+    """DB 파일별 공유 인메모리 복제본 (없으면 생성 - 첫 대여 때 로드)"""
+    with _pools_lock:
+        replica = _replicas.get(db_path)
+        if replica is None or replica._closed:
+            replica = _replicas[db_path] = MemoryReplicaPool(db_path, max_size)
+        return replica
@@ -0,0 +1,361 @@
+"""
+CRM 합성 데이터 생성기
+
+customers / transactions / campaigns 테이블용 DataFrame을 생성합니다.
+모든 값은 NumPy 배열 단위로 추출하므로 수천만 건까지 확장할 수 있습니다.
+
+컬럼 계약 (실습 정답 쿼리가 의존):
+- customers: customer_id, signup_date, acquisition_channel, acquisition_cost, is_churned
+- transactions: transaction_id, customer_id, transaction_date, amount, product_category
+- campaigns: campaign_id, channel, spend, conversions, revenue
+
+날짜 컬럼은 'YYYY-MM-DD' 문자열(정렬된 Categorical)이며,
+customer_id / transaction_id / campaign_id는 1부터 시작하는 정수입니다.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# 데이터 기간
+DATA_START_DATE = np.datetime64("2023-01-01", "D")
+SIGNUP_END_DATE = np.datetime64("2024-06-30", "D")      # 가입 마감일
+TRANSACTION_END_DATE = np.datetime64("2024-06-30", "D")  # RFM 기준일
+CALENDAR_END_DATE = np.datetime64("2024-12-31", "D")
+
+# 획득 채널: (비중, 평균 획득 비용, 평균 구매 횟수, 이탈률)
+CHANNELS = {
+    "organic":    (0.30,     0, 4.6, 0.25),
+    "google_ads": (0.20, 32000, 4.0, 0.35),
+    "facebook":   (0.18, 27000, 3.4, 0.42),
+    "instagram":  (0.14, 24000, 3.2, 0.45),
+    "naver":      (0.10, 29000, 4.3, 0.33),
+    "referral":   (0.08, 12000, 5.2, 0.20),
+}
+PAID_CHANNELS = [name for name, (_, cost, _, _) in CHANNELS.items() if cost > 0]
+
+PRODUCT_CATEGORIES = ["fashion", "beauty", "electronics", "food", "home", "sports"]
+PRODUCT_CATEGORY_PROBS = [0.28, 0.18, 0.12, 0.20, 0.14, 0.08]
+
+# 거래 금액 (원): 로그정규 분포, 100원 단위
+AMOUNT_MEDIAN = 35000
+AMOUNT_SIGMA = 0.6
+
+# 구매 간격 (일)
+FIRST_PURCHASE_DAYS = 14
+REPEAT_PURCHASE_DAYS = 45
+
+
+@dataclass(frozen=True)
+class WorkloadProfile:
+    """
+    데이터 분포 프로파일
+
+    운영 환경의 쏠림(소수 헤비 유저, 캠페인 일자 급증, 고액 거래)을 재현해
+    쿼리/채점 벤치마크를 현실적인 분포에서 돌릴 수 있도록 합니다.
+    """
+    name: str
+    # 사용자당 세션 수: None이면 1~19 균등, 값이 있으면 지수 a의 Zipf(멱법칙) 분포
+    session_zipf_a: float | None = None
+    max_sessions: int = 2000
+    # 핫 데이: 전체 기간 중 hot_day_count일에 세션의 hot_day_share만큼이 몰림
+    hot_day_count: int = 0
+    hot_day_share: float = 0.0
+    hot_day_seed: int = 7
+    # 거래 금액: None이면 로그정규, 값이 있으면 꼬리 지수 alpha의 파레토(Lomax) 분포
+    amount_pareto_alpha: float | None = None
+
+    def user_session_counts(self, user_ids: np.ndarray) -> np.ndarray:
+        """
+        사용자별 전체 기간 세션 수 (Zipf 프로파일 전용)
+
+        user_id 해시에서 결정되므로 샤드/증분 추가와 무관하게
+        같은 사용자는 항상 같은 활동량(헤비 유저 여부)을 가집니다.
+        """
+        u = _hash_uniform(user_ids)
+        counts = np.floor(u ** (-1.0 / (self.session_zipf_a - 1.0)))
+        return np.minimum(counts, self.max_sessions).astype(np.int64)
+
+    def hot_days(self, n_days: int) -> np.ndarray:
+        """기간(n_days일) 내 핫 데이 인덱스 - 같은 기간이면 모든 샤드에서 동일"""
+        count = min(self.hot_day_count, n_days)
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        rng = np.random.default_rng([self.hot_day_seed, n_days])
+        return np.sort(rng.choice(n_days, size=count, replace=False))
+
+    def sample_days(self, rng: np.random.Generator, n_days: int, size: int) -> np.ndarray:
+        """기간 내 일자 인덱스 추출 (핫 데이 쏠림 반영)"""
+        days = rng.integers(0, n_days, size=size)
+        hot = self.hot_days(n_days)
+        if len(hot) and self.hot_day_share > 0:
+            on_hot = rng.random(size) < self.hot_day_share
+            days[on_hot] = hot[rng.integers(0, len(hot), size=int(on_hot.sum()))]
+        return days
+
+    def sample_amounts(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """거래 금액 추출 (원, 100원 단위) - 두 분포 모두 중앙값은 AMOUNT_MEDIAN"""
+        if self.amount_pareto_alpha is None:
+            amounts = rng.lognormal(np.log(AMOUNT_MEDIAN), AMOUNT_SIGMA, size=size)
+        else:
+            alpha = self.amount_pareto_alpha
+            scale = AMOUNT_MEDIAN / (2 ** (1 / alpha) - 1)
+            amounts = np.minimum(rng.pareto(alpha, size=size) * scale, 1e9)
+        return np.maximum(np.round(amounts, -2), 100).astype(np.int64)
+
+
+PROFILES = {
+    "default": WorkloadProfile("default"),
+    "zipf_users": WorkloadProfile("zipf_users", session_zipf_a=2.0),
+    "hot_days": WorkloadProfile("hot_days", hot_day_count=12, hot_day_share=0.3),
+    "long_tail": WorkloadProfile("long_tail", amount_pareto_alpha=1.3),
+    "skewed": WorkloadProfile(
+        "skewed",
+        session_zipf_a=2.0,
+        hot_day_count=12,
+        hot_day_share=0.3,
+        amount_pareto_alpha=1.3,
+    ),
+}
+DEFAULT_PROFILE = PROFILES["default"]
+
+
+def _hash_uniform(values: np.ndarray) -> np.ndarray:
+    """정수 배열 → (0, 1) 균등 분포 값 (splitmix64 해시, 결정적)"""
+    x = np.asarray(values).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return ((x >> np.uint64(11)).astype(np.float64) + 0.5) / float(1 << 53)
+
+
+@lru_cache(maxsize=4)
+def _calendar(n_days: int) -> np.ndarray:
+    """DATA_START_DATE부터 n_days일 동안의 일자 문자열표"""
+    days = DATA_START_DATE + np.arange(n_days)
+    return np.datetime_as_string(days)
+
+
+def _date_column(day_index: np.ndarray) -> pd.Categorical:
+    """DATA_START_DATE 기준 일자 인덱스 → 'YYYY-MM-DD' 정렬 Categorical"""
+    # 기본 기간을 넘는 날짜(증분 추가)가 있으면 달력을 그만큼 늘림
+    n_days = int((CALENDAR_END_DATE - DATA_START_DATE).astype(int)) + 1
+    if len(day_index):
+        n_days = max(n_days, int(day_index.max()) + 1)
+    return pd.Categorical.from_codes(day_index, _calendar(n_days), ordered=True)
+
+
+def _day_offset(date: np.datetime64) -> int:
+    """날짜 → DATA_START_DATE 기준 일자 인덱스"""
+    return int((np.datetime64(date, "D") - DATA_START_DATE).astype(int))
+
+
+def _day_index(dates: pd.Series) -> np.ndarray:
+    """날짜 컬럼 → DATA_START_DATE 기준 일자 인덱스"""
+    if isinstance(dates.dtype, pd.CategoricalDtype):
+        category_days = pd.to_datetime(dates.cat.categories).values.astype("datetime64[D]")
+        day_index = (category_days - DATA_START_DATE).astype(np.int64)
+        return day_index[dates.cat.codes.to_numpy()]
+    days = pd.to_datetime(dates).values.astype("datetime64[D]")
+    return (days - DATA_START_DATE).astype(np.int64)
+
+
+def generate_customers(
+    n_customers: int = 2000,
+    seed: int = 42,
+    start_date: np.datetime64 = DATA_START_DATE,
+    end_date: np.datetime64 = SIGNUP_END_DATE
+) -> pd.DataFrame:
+    """
+    고객 데이터 생성
+
+    Args:
+        n_customers: 고객 수
+        seed: 난수 시드
+        start_date: 가입 기간 시작일
+        end_date: 가입 기간 종료일 (포함)
+
+    Returns:
+        DataFrame: customer_id, signup_date, acquisition_channel, acquisition_cost, is_churned
+    """
+    rng = np.random.default_rng(seed)
+
+    channel_names = list(CHANNELS)
+    shares, costs, _, churn_rates = (np.asarray(v) for v in zip(*CHANNELS.values()))
+
+    channel_codes = rng.choice(len(channel_names), size=n_customers, p=shares / shares.sum())
+
+    # 가입일: 기간 후반으로 갈수록 가입자가 늘어나는 성장 추세
+    signup_days = _day_offset(end_date) - _day_offset(start_date) + 1
+    signup_day = _day_offset(start_date) + (
+        np.sqrt(rng.random(n_customers)) * signup_days
+    ).astype(np.int64)
+
+    # 획득 비용: 채널 평균 ± 30% (organic은 0)
+    acquisition_cost = np.round(
+        costs[channel_codes] * rng.uniform(0.7, 1.3, size=n_customers), -2
+    ).astype(np.int64)
+
+    is_churned = (rng.random(n_customers) < churn_rates[channel_codes]).astype(np.int64)
+
+    return pd.DataFrame({
+        "customer_id": np.arange(1, n_customers + 1),
+        "signup_date": _date_column(signup_day),
+        "acquisition_channel": pd.Categorical.from_codes(channel_codes, channel_names),
+        "acquisition_cost": acquisition_cost,
+        "is_churned": is_churned,
+    })
+
+
+def generate_transactions(
+    customers: pd.DataFrame,
+    seed: int = 42,
+    end_date: np.datetime64 = TRANSACTION_END_DATE,
+    profile: WorkloadProfile = DEFAULT_PROFILE
+) -> pd.DataFrame:
+    """
+    거래 데이터 생성
+
+    고객별 구매 횟수는 채널별 평균의 포아송 분포(이탈 고객은 절반)를 따르며,
+    첫 구매는 가입 후, 이후 구매는 지수 분포 간격으로 발생합니다.
+    end_date 이후의 구매는 버립니다.
+
+    Args:
+        customers: generate_customers 결과
+        seed: 난수 시드
+        end_date: 거래 기간 종료일 (포함)
+        profile: 분포 프로파일 (거래 금액 분포)
+
+    Returns:
+        DataFrame: transaction_id, customer_id, transaction_date, amount, product_category
+    """
+    rng = np.random.default_rng(seed)
+
+    channel_index = {name: i for i, name in enumerate(CHANNELS)}
+    _, _, purchase_means, _ = (np.asarray(v) for v in zip(*CHANNELS.values()))
+
+    channels = customers["acquisition_channel"].map(channel_index).to_numpy(dtype=np.int64)
+    churned = customers["is_churned"].to_numpy(dtype=bool)
+    signup_day = _day_index(customers["signup_date"])
+
+    lam = purchase_means[channels] * np.where(churned, 0.5, 1.0)
+    n_purchases = rng.poisson(lam)
+
+    # 고객별 구매 간격의 누적합 → 구매일
+    owner = np.repeat(np.arange(len(customers)), n_purchases)
+    starts = np.cumsum(n_purchases) - n_purchases
+    first = np.zeros(len(owner), dtype=bool)
+    first[starts[n_purchases > 0]] = True
+
+    gaps = np.where(
+        first,
+        rng.exponential(FIRST_PURCHASE_DAYS, size=len(owner)),
+        rng.exponential(REPEAT_PURCHASE_DAYS, size=len(owner)) + 1,
+    ).astype(np.int64)
+    cumulative = np.cumsum(gaps)
+    group_base = np.repeat((cumulative - gaps)[first], n_purchases[n_purchases > 0])
+    day = signup_day[owner] + (cumulative - group_base)
+
+    keep = day <= _day_offset(end_date)
+    owner, day = owner[keep], day[keep]
+
+    return _transaction_frame(rng, customers["customer_id"].to_numpy()[owner], day, profile)
+
+
+def generate_repeat_transactions(
+    customer_ids: np.ndarray,
+    n_transactions: int,
+    start_date: np.datetime64,
+    end_date: np.datetime64,
+    seed: int = 42,
+    profile: WorkloadProfile = DEFAULT_PROFILE
+) -> pd.DataFrame:
+    """
+    기존 고객의 재구매 거래 생성 (증분 추가용)
+
+    n_transactions건을 customer_ids 중에서 무작위로 배정하고,
+    구매일은 start_date ~ end_date 사이에서 균등하게 추출합니다.
+
+    Args:
+        customer_ids: 재구매 대상 고객 ID
+        n_transactions: 생성할 거래 수
+        start_date: 거래 기간 시작일
+        end_date: 거래 기간 종료일 (포함)
+        seed: 난수 시드
+        profile: 분포 프로파일 (거래 금액 분포)
+
+    Returns:
+        DataFrame: transaction_id, customer_id, transaction_date, amount, product_category
+    """
+    rng = np.random.default_rng(seed)
+    if len(customer_ids) == 0:
+        n_transactions = 0
+
+    owner = rng.integers(0, max(len(customer_ids), 1), size=n_transactions)
+    day = rng.integers(_day_offset(start_date), _day_offset(end_date) + 1, size=n_transactions)
+
+    return _transaction_frame(rng, np.asarray(customer_ids)[owner], day, profile)
+
+
+def _transaction_frame(
+    rng: np.random.Generator,
+    customer_ids: np.ndarray,
+    day: np.ndarray,
+    profile: WorkloadProfile = DEFAULT_PROFILE
+) -> pd.DataFrame:
+    """구매자/구매일 배열에 금액, 카테고리를 붙여 거래 DataFrame 구성"""
+    n = len(customer_ids)
+
+    amount = profile.sample_amounts(rng, n)
+    category_codes = rng.choice(len(PRODUCT_CATEGORIES), size=n, p=PRODUCT_CATEGORY_PROBS)
+
+    return pd.DataFrame({
+        "transaction_id": np.arange(1, n + 1),
+        "customer_id": customer_ids,
+        "transaction_date": _date_column(day),
+        "amount": amount,
+        "product_category": pd.Categorical.from_codes(category_codes, PRODUCT_CATEGORIES),
+    })
+
+
+def generate_campaigns(n_campaigns: int = 50, seed: int = 42) -> pd.DataFrame:
+    """
+    마케팅 캠페인 데이터 생성
+
+    유료 채널별 캠페인의 지출/전환/매출을 생성합니다.
+    전환당 비용은 채널 평균 획득 비용 ± 25% 수준입니다.
+
+    Args:
+        n_campaigns: 캠페인 수
+        seed: 난수 시드
+
+    Returns:
+        DataFrame: campaign_id, channel, spend, conversions, revenue
+    """
+    rng = np.random.default_rng(seed)
+
+    costs = np.asarray([CHANNELS[name][1] for name in PAID_CHANNELS])
+    purchase_means = np.asarray([CHANNELS[name][2] for name in PAID_CHANNELS])
+
+    channel_codes = rng.integers(0, len(PAID_CHANNELS), size=n_campaigns)
+    conversions = rng.integers(20, 200, size=n_campaigns)
+
+    cost_per_conversion = costs[channel_codes] * rng.uniform(0.75, 1.25, size=n_campaigns)
+    spend = np.round(conversions * cost_per_conversion, -3).astype(np.int64)
+
+    revenue_per_conversion = (
+        purchase_means[channel_codes] * AMOUNT_MEDIAN * rng.uniform(0.8, 1.2, size=n_campaigns)
+    )
+    revenue = np.round(conversions * revenue_per_conversion, -3).astype(np.int64)
+
+    return pd.DataFrame({
+        "campaign_id": np.arange(1, n_campaigns + 1),
+        "channel": pd.Categorical.from_codes(channel_codes, PAID_CHANNELS),
+        "spend": spend,
+        "conversions": conversions,
+        "revenue": revenue,
+    })
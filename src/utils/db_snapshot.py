@@ -0,0 +1,311 @@
+"""
+DB 스냅샷과 첫 실행 자동 준비
+
+생성해 둔 crm.db를 버전이 붙은 압축 스냅샷(learning/data/snapshots/crm-<지문>.sqlite.gz)으로 저장하고,
+새 환경에서는 데이터를 다시 생성하는 대신 스냅샷을 풀어 sqlite3 backup API로 몇 초 만에 복원합니다.
+
+- 파일 이름의 지문(v<스키마 버전>-<해시>)과 옆의 .json 메타데이터로 버전을 구분하고,
+  현재 SCHEMA_VERSION과 같은 스냅샷 중 가장 최근 것을 사용
+- 학습 진행(user_progress)은 스냅샷에 넣지 않음
+- 복원은 임시 파일에 만들고 db_meta 지문을 확인한 뒤 os.replace로 게시
+
+앱은 crm.db가 없으면 start_provisioning()으로 백그라운드 준비를 시작합니다.
+스냅샷이 있으면 복원하고, 없으면 setup_database.py를 하위 프로세스로 실행해 생성합니다.
+
+실행: python -m src.utils.db_snapshot create        # 현재 crm.db → 스냅샷
+      python -m src.utils.db_snapshot restore       # 최신 스냅샷 → crm.db (crm.db가 없을 때)
+      python -m src.utils.db_snapshot list
+      python learning/setup_database.py --snapshot
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from src.utils.schema_catalog import SCHEMA_VERSION, META_TABLE, read_fingerprint
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DB_PATH = PROJECT_ROOT / "learning" / "data" / "crm.db"
+SNAPSHOT_DIR = DB_PATH.parent / "snapshots"
+SNAPSHOT_SUFFIX = ".sqlite.gz"
+SETUP_SCRIPT = PROJECT_ROOT / "learning" / "setup_database.py"
+# backup 한 단계에 복사할 페이지 수 (진행률 갱신 단위)
+BACKUP_PAGES = 1024
+COPY_BUFFER_BYTES = 1 << 20
+COMPRESS_LEVEL = 6
+# 스냅샷에 넣지 않는 테이블 (사용자별 학습 진행)
+PROGRESS_TABLE = "user_progress"
+
+
+@dataclass
+class Snapshot:
+    """압축 DB 스냅샷 하나"""
+    path: Path
+    fingerprint: str
+    schema_version: int | None
+    created_at: str
+    db_bytes: int  # 압축 전 크기
+
+
+def create_snapshot(db_path: Path = DB_PATH, snapshot_dir: Path = SNAPSHOT_DIR) -> Snapshot:
+    """
+    DB → 압축 스냅샷
+
+    backup API로 일관된 사본을 만든 뒤(앱이 켜져 있어도 안전) 학습 진행 테이블을 지우고 gzip으로 압축합니다.
+    같은 지문의 스냅샷이 이미 있으면 새로 만들지 않습니다.
+    """
+    fingerprint = read_fingerprint(db_path)
+    if fingerprint is None:
+        raise FileNotFoundError(f"{db_path}가 없습니다. python learning/setup_database.py로 먼저 생성하세요.")
+
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"crm-{fingerprint}{SNAPSHOT_SUFFIX}"
+    existing = _read_snapshot(_meta_path(path))
+    if existing is not None and path.exists():
+        return existing
+
+    copy_path = snapshot_dir / f".{path.name}.db"
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        source = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+        target = sqlite3.connect(copy_path)
+        try:
+            source.backup(target)
+            target.execute(f"DROP TABLE IF EXISTS {PROGRESS_TABLE}")
+            target.commit()
+        finally:
+            target.close()
+            source.close()
+
+        with open(copy_path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=COMPRESS_LEVEL) as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_BYTES)
+        snapshot = Snapshot(
+            path=path,
+            fingerprint=fingerprint,
+            schema_version=_schema_version(fingerprint),
+            created_at=datetime.now().isoformat(timespec="seconds"),
+            db_bytes=copy_path.stat().st_size,
+        )
+        os.replace(tmp_path, path)
+    finally:
+        copy_path.unlink(missing_ok=True)
+        tmp_path.unlink(missing_ok=True)
+
+    meta = asdict(snapshot)
+    meta["path"] = path.name
+    _meta_path(path).write_text(json.dumps(meta, ensure_ascii=False, indent=2))
+    return snapshot
+
+
+def list_snapshots(snapshot_dir: Path = SNAPSHOT_DIR) -> list[Snapshot]:
+    """스냅샷 목록 (최신순)"""
+    if not snapshot_dir.exists():
+        return []
+    snapshots = []
+    for meta_path in snapshot_dir.glob(f"*{SNAPSHOT_SUFFIX}.json"):
+        snapshot = _read_snapshot(meta_path)
+        if snapshot is not None and snapshot.path.exists():
+            snapshots.append(snapshot)
+    return sorted(snapshots, key=lambda s: s.created_at, reverse=True)
+
+
+def latest_snapshot(
+    snapshot_dir: Path = SNAPSHOT_DIR,
+    schema_version: int | None = SCHEMA_VERSION
+) -> Snapshot | None:
+    """현재 스키마 버전과 호환되는 가장 최근 스냅샷 (없으면 None)"""
+    for snapshot in list_snapshots(snapshot_dir):
+        if schema_version is None or snapshot.schema_version == schema_version:
+            return snapshot
+    return None
+
+
+def restore_snapshot(
+    snapshot: Snapshot,
+    db_path: Path = DB_PATH,
+    progress: Callable[[float, str], None] | None = None
+):
+    """
+    스냅샷 → db_path (db_path가 이미 있으면 FileExistsError - 기존 학습 진행을 덮어쓰지 않음)
+
+    1. 압축 해제 (진행률 0 ~ 50%)
+    2. backup API로 BACKUP_PAGES 페이지씩 복원 파일에 복사 (50 ~ 100%)
+    3. 복원 파일의 지문이 스냅샷 지문과 같은지 확인한 뒤 os.replace로 게시
+    """
+    if db_path.exists():
+        raise FileExistsError(f"{db_path}가 이미 있습니다. 복원하려면 먼저 옮기거나 삭제하세요.")
+    report = progress or (lambda fraction, message: None)
+    raw_path = db_path.with_name(db_path.name + ".snapshot")
+    build_path = db_path.with_name(db_path.name + ".restoring")
+    _remove_files(raw_path, build_path)
+
+    try:
+        compressed_bytes = snapshot.path.stat().st_size or 1
+        with open(snapshot.path, "rb") as compressed, gzip.open(compressed) as src, open(raw_path, "wb") as dst:
+            while chunk := src.read(COPY_BUFFER_BYTES):
+                dst.write(chunk)
+                report(0.5 * compressed.tell() / compressed_bytes, "스냅샷 압축 해제 중...")
+
+        source = sqlite3.connect(f"{raw_path.as_uri()}?mode=ro", uri=True)
+        target = sqlite3.connect(build_path)
+        try:
+            source.backup(
+                target,
+                pages=BACKUP_PAGES,
+                progress=lambda status, remaining, total: report(
+                    0.5 + 0.5 * (total - remaining) / max(total, 1), "데이터베이스 복원 중..."
+                ),
+            )
+            restored = target.execute(f"SELECT value FROM {META_TABLE} WHERE key = 'fingerprint'").fetchone()
+        finally:
+            target.close()
+            source.close()
+        if restored is None or restored[0] != snapshot.fingerprint:
+            raise ValueError(f"스냅샷 검증 실패: 지문 {restored and restored[0]} != {snapshot.fingerprint}")
+
+        with open(build_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(build_path, db_path)
+    finally:
+        _remove_files(raw_path, build_path)
+    report(1.0, "복원 완료")
+
+
+@dataclass
+class ProvisionJob:
+    """백그라운드 DB 준비 작업 상태 (Streamlit 세션들이 같은 객체를 폴링)"""
+    source: str  # 'snapshot' | 'generate'
+    progress: float | None = 0.0  # None이면 진행률을 알 수 없음 (생성 중)
+    message: str = "준비 중..."
+    done: bool = False
+    error: str | None = None
+    thread: threading.Thread | None = field(default=None, repr=False)
+
+
+# 프로세스 단위: DB 경로 → 진행 중이거나 끝난 준비 작업
+_jobs: dict[Path, ProvisionJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_provisioning(
+    db_path: Path = DB_PATH,
+    snapshot_dir: Path = SNAPSHOT_DIR,
+    retry: bool = False
+) -> ProvisionJob:
+    """
+    db_path가 없으면 백그라운드 준비 시작 (이미 진행 중이거나 실패한 작업이 있으면 그 작업을 반환)
+
+    호환되는 스냅샷이 있으면 복원하고, 없으면 setup_database.py로 생성합니다.
+    실패한 작업은 retry=True일 때만 다시 시작합니다.
+    """
+    with _jobs_lock:
+        job = _jobs.get(db_path)
+        if job is not None and (not job.done or (job.error and not retry) or (not job.error and db_path.exists())):
+            return job
+
+        snapshot = latest_snapshot(snapshot_dir)
+        job = ProvisionJob(source="snapshot" if snapshot else "generate")
+        job.thread = threading.Thread(target=_provision, args=(job, db_path, snapshot), daemon=True)
+        _jobs[db_path] = job
+        job.thread.start()
+        return job
+
+
+def _provision(job: ProvisionJob, db_path: Path, snapshot: Snapshot | None):
+    """준비 작업 본체 (백그라운드 스레드)"""
+    def report(fraction: float, message: str):
+        job.progress, job.message = fraction, message
+
+    try:
+        if snapshot is not None:
+            report(0.0, f"스냅샷 {snapshot.path.name} 복원 준비 중...")
+            restore_snapshot(snapshot, db_path, report)
+        elif db_path != DB_PATH:
+            raise FileNotFoundError(f"{db_path}에 복원할 스냅샷이 없습니다 (생성은 기본 경로 {DB_PATH}만 지원).")
+        else:
+            job.progress = None
+            job.message = "스냅샷이 없어 데이터베이스를 생성합니다..."
+            _run_setup(job)
+            report(1.0, "생성 완료")
+    except Exception as e:
+        job.error = str(e)
+    finally:
+        job.done = True
+
+
+def _run_setup(job: ProvisionJob):
+    """setup_database.py를 하위 프로세스로 실행하고 출력 줄을 진행 메시지로 전달"""
+    process = subprocess.Popen(
+        [sys.executable, str(SETUP_SCRIPT)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},  # 출력 줄을 바로 받음
+    )
+    last_line = ""
+    for line in process.stdout:
+        if line.strip():
+            last_line = line.strip()
+            job.message = last_line
+    if process.wait() != 0:
+        raise RuntimeError(f"setup_database.py 실패 (exit {process.returncode}): {last_line}")
+
+
+def _read_snapshot(meta_path: Path) -> Snapshot | None:
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text())
+    meta["path"] = meta_path.parent / meta["path"]
+    return Snapshot(**meta)
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".json")
+
+
+def _schema_version(fingerprint: str) -> int | None:
+    """'v1-...' → 1 (버전이 없는 지문이면 None)"""
+    prefix = fingerprint.split("-", 1)[0]
+    return int(prefix[1:]) if prefix.startswith("v") and prefix[1:].isdigit() else None
+
+
+def _remove_files(*paths: Path):
+    for path in paths:
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            Path(str(path) + suffix).unlink(missing_ok=True)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="crm.db 압축 스냅샷 생성/복원")
+    parser.add_argument("command", choices=("create", "restore", "list"))
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="대상 SQLite DB")
+    parser.add_argument("--dir", type=Path, default=SNAPSHOT_DIR, help="스냅샷 디렉터리")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "create":
+        snapshot = create_snapshot(args.db, args.dir)
+        ratio = snapshot.path.stat().st_size / max(snapshot.db_bytes, 1)
+        print(f"스냅샷 생성 완료: {snapshot.path} ({snapshot.db_bytes:,} bytes → 압축률 {ratio:.0%})")
+    elif args.command == "restore":
+        snapshot = latest_snapshot(args.dir)
+        if snapshot is None:
+            sys.exit(f"{args.dir}에 SCHEMA_VERSION {SCHEMA_VERSION}과 호환되는 스냅샷이 없습니다.")
+        restore_snapshot(snapshot, args.db)
+        print(f"복원 완료: {args.db} (fingerprint={snapshot.fingerprint})")
+    else:
+        for snapshot in list_snapshots(args.dir):
+            print(f"{snapshot.path.name}  v{snapshot.schema_version}  {snapshot.created_at}  {snapshot.db_bytes:,} bytes")
@@ -0,0 +1,275 @@
+"""
+월별 이벤트 파티션과 파티션 프루닝
+
+--partition-events로 만든 DB는 이벤트를 월별 테이블(events_2024_01, ...)에 나눠 저장하고
+events는 전체 파티션을 UNION ALL로 합친 뷰로 제공합니다.
+
+prune_events_query()는 쿼리의 event_date 조건을 읽어 필요한 파티션만 남기도록
+events 참조를 바꿔 씁니다. 한 달 조건 쿼리는 파티션 하나만 읽습니다.
+
+    SELECT COUNT(*) FROM events WHERE event_date BETWEEN '2024-01-01' AND '2024-01-31'
+    → SELECT COUNT(*) FROM events_2024_01 AS events WHERE event_date BETWEEN ...
+
+결과가 바뀌지 않는 경우에만 바꿔 씁니다.
+- events 참조가 정확히 하나이고 (CTE/셀프 조인이면 그대로 실행)
+- 그 SELECT의 WHERE 최상위가 AND로만 이어져 있으며 (OR가 있으면 그대로 실행)
+- 조건이 (date(event_date) | event_date) <비교|BETWEEN|LIKE> '문자열' 형태일 때
+"""
+
+import re
+import sqlite3
+
+from src.utils.sql_fingerprint import TOKEN_RE
+
+PARTITIONED_VIEW = "events"
+PARTITION_DATE_COLUMN = "event_date"
+PARTITION_NAME_RE = re.compile(r"^(?P<base>\w+?)_(?P<year>\d{4})_(?P<month>\d{2})$")
+
+# 이 키워드가 나오면 WHERE 절이 끝남 (같은 괄호 깊이 기준)
+WHERE_END_KEYWORDS = {"GROUP", "ORDER", "LIMIT", "HAVING", "WINDOW"}
+COMPOUND_KEYWORDS = {"UNION", "INTERSECT", "EXCEPT"}
+COMPARISON_OPS = {"=", "==", "<", "<=", ">", ">="}
+FLIPPED_OPS = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "=": "=", "==": "="}
+
+
+def partition_table(base: str, month: str) -> str:
+    """('events', '2024-01') → 'events_2024_01'"""
+    return f"{base}_{month.replace('-', '_')}"
+
+
+def partition_base(table: str) -> str | None:
+    """'events_2024_01' → 'events' (파티션 테이블이 아니면 None)"""
+    match = PARTITION_NAME_RE.match(table)
+    return match.group("base") if match else None
+
+
+def list_partitions(conn: sqlite3.Connection, base: str = PARTITIONED_VIEW) -> dict[str, str]:
+    """월('YYYY-MM') → 파티션 테이블 이름 (월 순서). 파티션 레이아웃이 아니면 빈 dict"""
+    partitions = {}
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ESCAPE '\\' ORDER BY name",
+        (f"{base}\\_%",)
+    ):
+        match = PARTITION_NAME_RE.match(name)
+        if match and match.group("base") == base:
+            partitions[f"{match.group('year')}-{match.group('month')}"] = name
+    return partitions
+
+
+def partition_view_sql(partitions: dict[str, str]) -> str:
+    """파티션 전체를 합치는 뷰 SELECT 문"""
+    return "\nUNION ALL\n".join(f"SELECT * FROM {table}" for table in partitions.values())
+
+
+def prune_events_query(conn: sqlite3.Connection, query: str) -> str:
+    """파티션 레이아웃이면 query의 events 참조를 필요한 파티션으로 바꿔 반환 (아니면 그대로)"""
+    partitions = list_partitions(conn)
+    if not partitions:
+        return query
+    return prune_query(query, partitions)
+
+
+def prune_query(query: str, partitions: dict[str, str], view: str = PARTITIONED_VIEW) -> str:
+    """
+    event_date 조건으로 파티션 프루닝
+
+    Args:
+        partitions: 월('YYYY-MM') → 파티션 테이블 (list_partitions 결과)
+    """
+    tokens = _tokenize(query)
+    refs = [i for i in range(len(tokens)) if _is_table_ref(tokens, i, view)]
+    if len(refs) != 1 or _defines_cte(tokens, view):
+        return query
+    ref = refs[0]
+    depth = tokens[ref][3]
+
+    alias = None
+    following = ref + 1
+    if following < len(tokens) and tokens[following][1].upper() == "AS":
+        following += 1
+    if following < len(tokens) and tokens[following][0] == "word" \
+            and tokens[following][1].upper() not in _STOP_WORDS:
+        alias = tokens[following][1]
+
+    where = _where_span(tokens, ref, depth)
+    if where is None:
+        return query
+    # 별칭이 있으면 SQLite는 별칭으로만 한정할 수 있음
+    constraints = _month_constraints(tokens, where, depth, {alias or view})
+    if not constraints:
+        return query
+
+    months = [month for month in partitions if all(constraint(month) for constraint in constraints)]
+    if len(months) == len(partitions):
+        return query
+
+    if not months:
+        # 조건을 만족하는 파티션이 없음 - 컬럼 구조만 유지한 빈 결과
+        source = f"(SELECT * FROM {next(iter(partitions.values()))} WHERE 0)"
+    elif len(months) == 1:
+        source = partitions[months[0]]
+    else:
+        source = "(" + " UNION ALL ".join(f"SELECT * FROM {partitions[m]}" for m in months) + ")"
+    if alias is None:
+        source += f" AS {view}"
+
+    start, end = tokens[ref][2]
+    return query[:start] + source + query[end:]
+
+
+# 테이블 참조 뒤에 올 수 있지만 별칭이 아닌 단어
+_STOP_WORDS = {
+    "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "NATURAL", "ON", "USING",
+    "GROUP", "ORDER", "LIMIT", "HAVING", "WINDOW", "UNION", "INTERSECT", "EXCEPT", "INDEXED", "NOT",
+}
+
+
+def _tokenize(sql: str) -> list[tuple[str, str, tuple[int, int], int]]:
+    """(종류, 값, (시작, 끝), 괄호 깊이) 토큰 목록 - 주석 제외"""
+    tokens = []
+    depth = 0
+    for match in TOKEN_RE.finditer(sql):
+        kind, value = match.lastgroup, match.group()
+        if kind in ("space", "comment"):
+            continue
+        if value == ")":
+            depth -= 1
+        tokens.append((kind, value, match.span(), depth))
+        if value == "(":
+            depth += 1
+    return tokens
+
+
+def _is_table_ref(tokens, i: int, view: str) -> bool:
+    """FROM / JOIN / 콤마 조인 뒤의 view 이름 (view.컬럼 한정자는 제외)"""
+    kind, value, _, _ = tokens[i]
+    if kind != "word" or value.lower() != view or i == 0:
+        return False
+    if i + 1 < len(tokens) and tokens[i + 1][1] == ".":
+        return False
+    previous = tokens[i - 1][1].upper()
+    return previous in ("FROM", "JOIN", ",")
+
+
+def _defines_cte(tokens, view: str) -> bool:
+    """WITH events AS (...) 처럼 같은 이름의 CTE를 정의하는지"""
+    return any(
+        tokens[i][1].lower() == view and tokens[i + 1][1].upper() == "AS" and tokens[i + 2][1] == "("
+        for i in range(len(tokens) - 2)
+    )
+
+
+def _where_span(tokens, ref: int, depth: int) -> tuple[int, int] | None:
+    """ref가 속한 SELECT의 WHERE 절 토큰 범위 [시작, 끝) - 없으면 None"""
+    start = None
+    for i in range(ref + 1, len(tokens)):
+        _, value, _, token_depth = tokens[i]
+        if token_depth > depth:
+            continue
+        keyword = value.upper()
+        if token_depth < depth or value == ";" or keyword in COMPOUND_KEYWORDS:
+            return (start, i) if start is not None else None
+        if keyword == "WHERE":
+            start = i + 1
+        elif keyword in WHERE_END_KEYWORDS and start is not None:
+            return start, i
+    return (start, len(tokens)) if start is not None else None
+
+
+def _month_constraints(tokens, span: tuple[int, int], depth: int, qualifiers: set[str]):
+    """
+    WHERE 최상위 AND 조건 중 event_date 조건 → 월('YYYY-MM')을 받아 포함 여부를 돌려주는 함수 목록
+
+    최상위에 OR / CASE가 있으면 None (프루닝하지 않음).
+    해석할 수 없는 조건은 건너뜁니다 (파티션을 덜 거를 뿐 결과는 같음).
+    """
+    start, end = span
+    terms = []
+    term_start = start
+    in_between = False
+    for i in range(start, end):
+        if tokens[i][3] != depth:
+            continue
+        keyword = tokens[i][1].upper()
+        if keyword in ("OR", "CASE"):
+            return None
+        if keyword == "BETWEEN":
+            in_between = True
+        elif keyword == "AND":
+            if in_between:
+                in_between = False
+                continue
+            terms.append((term_start, i))
+            term_start = i + 1
+    terms.append((term_start, end))
+
+    constraints = []
+    for term_start, term_end in terms:
+        constraint = _parse_term(tokens[term_start:term_end], qualifiers)
+        if constraint is not None:
+            constraints.append(constraint)
+    return constraints
+
+
+def _parse_term(term, qualifiers: set[str]):
+    """조건 하나를 월 포함 여부 함수로 변환 (해석할 수 없으면 None)"""
+    values = [token[1] for token in term]
+    kinds = [token[0] for token in term]
+
+    column_len = _column_length(values, kinds, 0, qualifiers)
+    if column_len:
+        rest, rest_kinds = values[column_len:], kinds[column_len:]
+        if len(rest) == 2 and rest[0] in COMPARISON_OPS and rest_kinds[1] == "string":
+            return _comparison(rest[0], _literal(rest[1]))
+        if len(rest) == 4 and rest[0].upper() == "BETWEEN" and rest[2].upper() == "AND" \
+                and rest_kinds[1] == rest_kinds[3] == "string":
+            low, high = _comparison(">=", _literal(rest[1])), _comparison("<=", _literal(rest[3]))
+            return lambda month: low(month) and high(month)
+        if len(rest) == 2 and rest[0].upper() == "LIKE" and rest_kinds[1] == "string":
+            prefix = re.split(r"[%_]", _literal(rest[1]))[0]
+            return lambda month: (month + "-").startswith(prefix[:8])
+        return None
+
+    # '2024-01-01' <= event_date
+    if len(values) > 2 and kinds[0] == "string" and values[1] in COMPARISON_OPS:
+        if _column_length(values, kinds, 2, qualifiers) == len(values) - 2:
+            return _comparison(FLIPPED_OPS[values[1]], _literal(values[0]))
+    return None
+
+
+def _column_length(values: list[str], kinds: list[str], i: int, qualifiers: set[str]) -> int:
+    """values[i:]가 [별칭.]event_date 또는 date([별칭.]event_date)로 시작하면 그 토큰 수 (아니면 0)"""
+    def column(j: int) -> int:
+        if j < len(values) and values[j].lower() == PARTITION_DATE_COLUMN:
+            return 1
+        if j + 2 < len(values) and values[j + 1] == "." and values[j] in qualifiers \
+                and values[j + 2].lower() == PARTITION_DATE_COLUMN:
+            return 3
+        return 0
+
+    if i < len(values) and values[i].lower() == "date" and i + 1 < len(values) and values[i + 1] == "(":
+        inner = column(i + 2)
+        if inner and i + 2 + inner < len(values) and values[i + 2 + inner] == ")":
+            return inner + 3
+        return 0
+    if i < len(values) and kinds[i] == "word":
+        return column(i)
+    return 0
+
+
+def _literal(token: str) -> str:
+    return token[1:-1].replace("''", "'")
+
+
+def _comparison(op: str, literal: str):
+    """event_date <op> literal을 만족하는 행이 월 month 파티션에 있을 수 있는지"""
+    # 'YYYY-MM-DD' 문자열 비교: 월 month의 값은 month-01 이상 month-31 이하
+    if op in ("=", "=="):
+        return lambda month: f"{month}-01" <= literal <= f"{month}-31"
+    if op == "<":
+        return lambda month: f"{month}-01" < literal
+    if op == "<=":
+        return lambda month: f"{month}-01" <= literal
+    if op == ">":
+        return lambda month: f"{month}-31" > literal
+    return lambda month: f"{month}-31" >= literal
@@ -0,0 +1,456 @@
+"""
+정답 쿼리 기반 인덱스 어드바이저
+
+app/modules/*.py의 모든 answer_query에 EXPLAIN QUERY PLAN을 실행해
+전체 스캔(SCAN)과 임시 B-tree(USE TEMP B-TREE)를 찾고,
+쿼리에서 쓰는 조건/그룹/조인 컬럼으로 복합·커버링 인덱스 후보를 만든 뒤
+실제로 인덱스를 걸어 본 전후 실행 비용(SQLite VM 명령 수)으로 후보를 고릅니다.
+채택/적용 판단은 실행할 때마다 같은 VM 명령 수로만 하므로 같은 DB면 추천도 항상 같고,
+벽시계 지연 시간은 리포트에 참고로만 표시합니다.
+
+실행: python -m src.utils.index_advisor            # 리포트만
+      python -m src.utils.index_advisor --apply    # 채택된 인덱스를 DB에 생성
+"""
+
+import argparse
+import ast
+import re
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.utils.sql_fingerprint import TOKEN_RE
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+APP_MODULES_DIR = PROJECT_ROOT / "app" / "modules"
+DB_PATH = PROJECT_ROOT / "learning" / "data" / "crm.db"
+
+# 인덱스 후보의 최대 컬럼 수 (키 + 커버링)
+MAX_INDEX_COLUMNS = 4
+# 후보를 채택하는 최소 비용 개선율 (해당 인덱스를 쓰는 쿼리의 VM 명령 수 합계 기준)
+MIN_GAIN = 0.10
+# VM 명령 수 측정 단위 (progress handler 호출 간격)
+STEP_GRANULARITY = 1000
+# 테이블당 추천 인덱스 수 상한 (쓰기/용량 비용 제한, 절감 비용이 큰 순서)
+MAX_INDEXES_PER_TABLE = 3
+ADVISOR_INDEX_PREFIX = "idx_advisor_"
+
+CLAUSE_KEYWORDS = {"SELECT", "FROM", "JOIN", "ON", "WHERE", "HAVING", "GROUP", "ORDER", "LIMIT"}
+SQL_KEYWORDS = CLAUSE_KEYWORDS | {
+    "AS", "AND", "OR", "NOT", "IN", "IS", "NULL", "BY", "CASE", "WHEN", "THEN", "ELSE", "END",
+    "WITH", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "DISTINCT", "BETWEEN", "LIKE", "OVER",
+    "PARTITION", "DESC", "ASC", "UNION", "ALL", "USING",
+}
+# 컬럼 역할 → 인덱스 키 순서 (등호 조건 → 조인 → 그룹 → 범위 조건)
+KEY_ROLES = ("eq", "join", "group", "range")
+
+
+@dataclass
+class AnswerQuery:
+    """app/modules의 Question 하나의 정답 쿼리"""
+    question_id: str
+    module: str
+    sql: str
+
+
+@dataclass
+class QueryPlan:
+    """EXPLAIN QUERY PLAN 결과 요약"""
+    query: AnswerQuery
+    details: list[str]
+    full_scans: list[str]  # 인덱스 없이 전체 스캔한 기본 테이블
+    temp_btrees: int  # USE TEMP B-TREE 횟수 (GROUP BY / DISTINCT / ORDER BY 정렬)
+
+    def uses_index(self, name: str) -> bool:
+        return any(f"INDEX {name}" in detail for detail in self.details)
+
+
+@dataclass
+class IndexCandidate:
+    """복합/커버링 인덱스 후보"""
+    table: str
+    columns: tuple[str, ...]
+    sources: list[str] = field(default_factory=list)  # 후보를 만든 question_id
+
+    @property
+    def name(self) -> str:
+        return f"{ADVISOR_INDEX_PREFIX}{self.table}_" + "_".join(self.columns)
+
+    @property
+    def statement(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+
+@dataclass
+class AdvisorReport:
+    """인덱스 어드바이저 결과"""
+    plans: list[QueryPlan]
+    candidates: list[IndexCandidate]
+    recommended: list[IndexCandidate]
+    latency_before: dict[str, float]  # question_id → 초
+    latency_after: dict[str, float]
+    steps_before: dict[str, int]  # question_id → VM 명령 수
+    steps_after: dict[str, int]
+    applied: bool = False
+    steps_regressed: bool = False  # 채택 인덱스로 전체 VM 명령 수가 늘어 적용하지 않음
+
+    def format(self) -> str:
+        lines = ["[전체 스캔 / 임시 B-tree]"]
+        for plan in self.plans:
+            if plan.full_scans or plan.temp_btrees:
+                scans = ", ".join(f"SCAN {table}" for table in plan.full_scans) or "-"
+                lines.append(f"  {plan.query.question_id:<10} {scans}  (TEMP B-TREE x{plan.temp_btrees})")
+
+        lines.append(f"[인덱스 후보 {len(self.candidates)}개 → 채택 {len(self.recommended)}개]")
+        for candidate in self.candidates:
+            mark = "+" if candidate in self.recommended else "-"
+            lines.append(f"  {mark} {candidate.statement}  ({', '.join(candidate.sources)})")
+
+        if self.applied:
+            status = " - 적용됨"
+        elif self.steps_regressed:
+            status = " - 전체 VM 명령 수가 늘어 미적용"
+        else:
+            status = " - 미적용 (--apply)"
+        lines.append("[지연 시간 (ms) / VM 명령 수 (천)]" + status)
+        lines.append(f"  {'question':<10} {'before':>9} {'after':>9} {'steps':>9} {'after':>9}")
+        for question_id in self.latency_before:
+            lines.append(
+                f"  {question_id:<10} {self.latency_before[question_id] * 1000:9.1f} "
+                f"{self.latency_after[question_id] * 1000:9.1f} "
+                f"{self.steps_before[question_id] / 1000:9.0f} {self.steps_after[question_id] / 1000:9.0f}"
+            )
+        lines.append(
+            f"  {'total':<10} {sum(self.latency_before.values()) * 1000:9.1f} "
+            f"{sum(self.latency_after.values()) * 1000:9.1f} "
+            f"{sum(self.steps_before.values()) / 1000:9.0f} {sum(self.steps_after.values()) / 1000:9.0f}"
+        )
+        return "\n".join(lines)
+
+
+def collect_answer_queries(modules_dir: Path = APP_MODULES_DIR) -> list[AnswerQuery]:
+    """
+    모듈 파일에서 Question(answer_query=...)를 수집
+
+    모듈을 import하면 streamlit이 필요하므로 소스를 AST로 읽습니다.
+    """
+    queries = []
+    for path in sorted(modules_dir.glob("*.py")):
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if not (isinstance(node, ast.Call) and getattr(node.func, "id", None) == "Question"):
+                continue
+            keywords = {kw.arg: kw.value for kw in node.keywords}
+            if not all(isinstance(keywords.get(k), ast.Constant) for k in ("id", "answer_query")):
+                continue
+            queries.append(AnswerQuery(
+                question_id=keywords["id"].value,
+                module=path.stem,
+                sql=keywords["answer_query"].value,
+            ))
+    return queries
+
+
+def explain(conn: sqlite3.Connection, query: AnswerQuery) -> QueryPlan:
+    """쿼리 계획에서 기본 테이블 전체 스캔과 임시 B-tree 추출"""
+    details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query.sql}")]
+    aliases = _table_aliases(_tokenize(query.sql), _base_tables(conn))
+
+    full_scans = []
+    for detail in details:
+        match = re.match(r"SCAN (\w+)$", detail)
+        if match and match.group(1) in aliases:
+            full_scans.append(aliases[match.group(1)])
+    return QueryPlan(
+        query=query,
+        details=details,
+        full_scans=full_scans,
+        temp_btrees=sum("USE TEMP B-TREE" in detail for detail in details),
+    )
+
+
+def propose_indexes(conn: sqlite3.Connection, plans: list[QueryPlan]) -> list[IndexCandidate]:
+    """
+    전체 스캔된 테이블마다 인덱스 후보 생성
+
+    키 = 등호/IN 조건 → 조인 → GROUP BY → 범위 조건 컬럼, 나머지 참조 컬럼은 커버링으로 뒤에 붙임
+    (MAX_INDEX_COLUMNS까지). 기존 인덱스나 다른 후보의 접두어인 후보는 제외합니다.
+    """
+    tables = _base_tables(conn)
+    existing = _existing_index_columns(conn)
+    candidates: dict[tuple[str, tuple[str, ...]], IndexCandidate] = {}
+
+    for plan in plans:
+        usage = _column_usage(plan.query.sql, tables)
+        for table in dict.fromkeys(plan.full_scans):
+            roles = usage.get(table, {})
+            key = list(dict.fromkeys(col for role in KEY_ROLES for col in roles.get(role, [])))
+            if not key:
+                continue
+            covering = [col for col in roles.get("other", []) if col not in key]
+            columns = tuple((key + covering)[:MAX_INDEX_COLUMNS])
+            if any(cols[:len(columns)] == columns for cols in existing.get(table, [])):
+                continue
+            candidate = candidates.setdefault((table, columns), IndexCandidate(table, columns))
+            candidate.sources.append(plan.query.question_id)
+
+    # 다른 후보의 접두어인 후보는 긴 후보가 대신함
+    result = []
+    for (table, columns), candidate in candidates.items():
+        longer = [
+            other for (other_table, other_columns), other in candidates.items()
+            if other_table == table and len(other_columns) > len(columns)
+            and other_columns[:len(columns)] == columns
+        ]
+        if longer:
+            longer[0].sources.extend(s for s in candidate.sources if s not in longer[0].sources)
+        else:
+            result.append(candidate)
+    return result
+
+
+def measure(conn: sqlite3.Connection, queries: list[AnswerQuery], repeat: int = 3) -> dict[str, float]:
+    """쿼리별 실행 시간 (repeat회 중 최솟값, 초)"""
+    latency = {}
+    for query in queries:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(query.sql).fetchall()
+            best = min(best, time.perf_counter() - start)
+        latency[query.question_id] = best
+    return latency
+
+
+def count_steps(conn: sqlite3.Connection, queries: list[AnswerQuery]) -> dict[str, int]:
+    """쿼리별 SQLite VM 명령 수 (STEP_GRANULARITY 단위, 실행할 때마다 같은 값)"""
+    steps = {}
+    for query in queries:
+        counter = [0]
+
+        def tick():
+            counter[0] += STEP_GRANULARITY
+            return 0
+
+        conn.set_progress_handler(tick, STEP_GRANULARITY)
+        try:
+            conn.execute(query.sql).fetchall()
+        finally:
+            conn.set_progress_handler(None, 0)
+        steps[query.question_id] = counter[0]
+    return steps
+
+
+def advise(
+    db_path: Path = DB_PATH,
+    apply: bool = False,
+    modules_dir: Path = APP_MODULES_DIR,
+    repeat: int = 3
+) -> AdvisorReport:
+    """
+    정답 쿼리 워크로드로 인덱스를 추천하고, apply=True면 DB에 생성
+
+    후보는 트랜잭션 안에서 모두 만들어 본 뒤 롤백합니다 (what-if 평가).
+    쿼리 계획에서 실제로 사용되고, 그 인덱스를 쓰는 쿼리들의 VM 명령 수 합계가
+    MIN_GAIN 이상 줄어든 후보를 테이블당 MAX_INDEXES_PER_TABLE개까지 채택한 뒤,
+    채택한 인덱스만으로 다시 측정해 같은 기준을 통과하지 못한 인덱스는 제외합니다
+    (다른 후보와 함께일 때만 이득이던 인덱스 제거). 남은 인덱스로도 전체 VM 명령 수가 늘면
+    apply=True여도 COMMIT하지 않습니다. 지연 시간(measure)은 판단에 쓰지 않습니다 (리포트용).
+    """
+    queries = collect_answer_queries(modules_dir)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        plans = [explain(conn, query) for query in queries]
+        latency_before = measure(conn, queries, repeat)
+        before = count_steps(conn, queries)
+        candidates = propose_indexes(conn, plans)
+
+        conn.execute("BEGIN")
+        for candidate in candidates:
+            conn.execute(candidate.statement)
+        trial_plans = {query.question_id: explain(conn, query) for query in queries}
+        trial = count_steps(conn, queries)
+        conn.execute("ROLLBACK")
+
+        saved = _saved_cost(candidates, trial_plans, before, trial)
+
+        per_table = Counter()
+        recommended = []
+        for candidate in sorted(candidates, key=lambda c: -saved.get(c.name, 0)):
+            if candidate.name in saved and per_table[candidate.table] < MAX_INDEXES_PER_TABLE:
+                per_table[candidate.table] += 1
+                recommended.append(candidate)
+
+        # 추천 인덱스만 만들어 다시 측정 (적용하지 않으면 롤백)
+        while True:
+            conn.execute("BEGIN")
+            for candidate in recommended:
+                conn.execute(candidate.statement)
+            after_plans = {query.question_id: explain(conn, query) for query in queries}
+            after = count_steps(conn, queries)
+            kept = _saved_cost(recommended, after_plans, before, after)
+            if len(kept) == len(recommended):
+                latency_after = measure(conn, queries, repeat)
+                steps_regressed = sum(after.values()) > sum(before.values())
+                applied = apply and bool(recommended) and not steps_regressed
+                conn.execute("COMMIT" if applied else "ROLLBACK")
+                if applied:
+                    # 새 인덱스의 플래너 통계(sqlite_stat1) 갱신
+                    conn.execute("ANALYZE")
+                break
+            conn.execute("ROLLBACK")
+            recommended = [c for c in recommended if c.name in kept]
+    finally:
+        conn.close()
+
+    return AdvisorReport(
+        plans=plans,
+        candidates=candidates,
+        recommended=recommended,
+        latency_before=latency_before,
+        latency_after=latency_after,
+        steps_before=before,
+        steps_after=after,
+        applied=applied,
+        steps_regressed=steps_regressed,
+    )
+
+
+def _saved_cost(
+    candidates: list[IndexCandidate],
+    plans: dict[str, QueryPlan],
+    before: dict[str, int],
+    after: dict[str, int]
+) -> dict[str, int]:
+    """
+    인덱스 이름 → 절감 VM 명령 수
+
+    계획에서 그 인덱스를 쓰는 쿼리들의 명령 수 합계가 MIN_GAIN 이상 줄어든 인덱스만 포함.
+    쓰는 쿼리들이 모두 측정 단위(STEP_GRANULARITY) 미만이라 줄일 비용이 없는 인덱스는 제외
+    """
+    saved = {}
+    for candidate in candidates:
+        users = [qid for qid, plan in plans.items() if plan.uses_index(candidate.name)]
+        if not users:
+            continue
+        before_total = sum(before[qid] for qid in users)
+        after_total = sum(after[qid] for qid in users)
+        if before_total and 1 - after_total / before_total >= MIN_GAIN:
+            saved[candidate.name] = before_total - after_total
+    return saved
+
+
+def _tokenize(sql: str) -> list[tuple[str, str]]:
+    """(종류, 값) 토큰 목록 - 문자열 리터럴은 값을 비우고, 주석은 제거"""
+    tokens = []
+    for match in TOKEN_RE.finditer(sql):
+        kind = match.lastgroup
+        if kind in ("space", "comment"):
+            continue
+        tokens.append((kind, "" if kind == "string" else match.group()))
+    return tokens
+
+
+def _base_tables(conn: sqlite3.Connection) -> dict[str, set[str]]:
+    """테이블 이름 → 컬럼 집합 (생성 컬럼 포함)"""
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    )]
+    return {
+        name: {row[1] for row in conn.execute(f"PRAGMA table_xinfo({name})")}
+        for name in names
+    }
+
+
+def _existing_index_columns(conn: sqlite3.Connection) -> dict[str, list[tuple[str, ...]]]:
+    """테이블 이름 → 기존 인덱스의 컬럼 튜플 목록"""
+    result: dict[str, list[tuple[str, ...]]] = {}
+    for table in _base_tables(conn):
+        for index in conn.execute(f"PRAGMA index_list({table})"):
+            columns = tuple(row[2] for row in conn.execute(f"PRAGMA index_info({index[1]})"))
+            result.setdefault(table, []).append(columns)
+    return result
+
+
+def _table_aliases(tokens: list[tuple[str, str]], tables: dict[str, set[str]]) -> dict[str, str]:
+    """FROM / JOIN 절의 별칭(및 테이블 이름 자체) → 기본 테이블"""
+    aliases = {}
+    for i, (kind, value) in enumerate(tokens[:-1]):
+        if value.upper() not in ("FROM", "JOIN"):
+            continue
+        table = tokens[i + 1][1]
+        if table not in tables:
+            continue
+        aliases[table] = table
+        rest = tokens[i + 2:i + 4]
+        if rest and rest[0][1].upper() == "AS":
+            rest = rest[1:]
+        if rest and rest[0][0] == "word" and rest[0][1].upper() not in SQL_KEYWORDS:
+            aliases[rest[0][1]] = table
+    return aliases
+
+
+def _column_usage(sql: str, tables: dict[str, set[str]]) -> dict[str, dict[str, list[str]]]:
+    """
+    기본 테이블별 컬럼 사용 역할
+
+    Returns:
+        {table: {"eq" | "join" | "group" | "range" | "other": [column, ...]}}
+        eq: WHERE의 = / IN 조건, range: 그 밖의 WHERE 조건, join: ON 조건, group: GROUP BY
+    """
+    tokens = _tokenize(sql)
+    aliases = _table_aliases(tokens, tables)
+    referenced = set(aliases.values())
+
+    usage: dict[str, dict[str, list[str]]] = {}
+    clause = None
+    stack = []
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        upper = value.upper()
+        if value == "(":
+            stack.append(clause)
+        elif value == ")":
+            clause = stack.pop() if stack else None
+        elif kind == "word" and upper in CLAUSE_KEYWORDS:
+            clause = {"GROUP": "GROUP BY", "ORDER": "ORDER BY"}.get(upper, upper)
+        elif kind == "word" and upper not in SQL_KEYWORDS:
+            qualifier = None
+            if i + 2 < len(tokens) and tokens[i + 1][1] == ".":
+                qualifier, value = value, tokens[i + 2][1]
+                i += 2
+            next_value = tokens[i + 1][1].upper() if i + 1 < len(tokens) else ""
+
+            if qualifier is not None:
+                table = aliases.get(qualifier)
+                owners = [table] if table and value in tables[table] else []
+            else:
+                owners = [t for t in referenced if value in tables[t]]
+
+            # 별칭 없이 여러 테이블에 있는 컬럼은 어느 테이블인지 알 수 없으므로 제외
+            if len(owners) == 1 and clause not in ("FROM", "JOIN"):
+                if clause == "WHERE":
+                    role = "eq" if next_value in ("=", "IN") else "range"
+                else:
+                    role = {"ON": "join", "GROUP BY": "group"}.get(clause, "other")
+                columns = usage.setdefault(owners[0], {}).setdefault(role, [])
+                if value not in columns:
+                    columns.append(value)
+        i += 1
+    return usage
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="정답 쿼리 기반 인덱스 어드바이저")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="대상 SQLite DB 경로")
+    parser.add_argument("--apply", action="store_true", help="채택된 인덱스를 DB에 생성")
+    parser.add_argument("--repeat", type=int, default=3, help="쿼리별 지연 시간 측정 반복 횟수 (리포트용)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(advise(args.db, apply=args.apply, repeat=args.repeat).format())
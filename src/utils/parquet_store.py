@@ -0,0 +1,176 @@
+"""
+Parquet 컬럼 저장소
+
+crm.db의 customers / transactions / events를 테이블별 Parquet 파일로 내보내고,
+필요한 컬럼과 기간만 읽는 리더를 제공합니다 (pyarrow 필요 - 선택 의존성).
+
+- 파일: learning/data/parquet/{table}.parquet
+- Row group: 월 단위 (customers는 가입 월, transactions는 거래 월, events는 이벤트 월)
+  월 안에서는 날짜 순으로 정렬되어 row group별 min/max 통계가 겹치지 않습니다.
+- 컬럼 통계(min/max/null 수)를 기록하므로 날짜 조건은 해당 월의 row group만 읽습니다.
+
+    from src.utils.parquet_store import read_table
+    df = read_table("events", columns=["user_id", "event_type"], start="2024-03-01", end="2024-03-31")
+
+실행: python -m src.utils.parquet_store                # 내보내기
+      python learning/setup_database.py --export-parquet
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성: 내보내기/읽기를 호출할 때 안내
+    pa = None
+    pq = None
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DB_PATH = PROJECT_ROOT / "learning" / "data" / "crm.db"
+PARQUET_DIR = DB_PATH.parent / "parquet"
+MANIFEST_NAME = "manifest.json"
+
+# 테이블 → row group을 나누는 날짜 컬럼 ('YYYY-MM-DD')
+DATE_COLUMNS = {
+    "customers": "signup_date",
+    "transactions": "transaction_date",
+    "events": "event_date",
+}
+# 월 안에서의 정렬 (날짜 → ID)
+SORT_COLUMNS = {
+    "customers": ("signup_date", "customer_id"),
+    "transactions": ("transaction_date", "transaction_id"),
+    "events": ("event_date", "event_timestamp"),
+}
+COMPRESSION = "zstd"
+
+
+def export_parquet(db_path: Path = DB_PATH, parquet_dir: Path = PARQUET_DIR) -> dict:
+    """
+    crm.db → 테이블별 Parquet 파일 (월별 row group)
+
+    한 달씩 읽어 row group 하나로 쓰므로 메모리 사용량은 가장 큰 달의 크기에 비례합니다.
+    events가 압축/파티션 레이아웃이어도 events 뷰를 읽으므로 같은 컬럼으로 내보냅니다.
+
+    Returns:
+        dict: manifest (원본 DB 지문, 테이블별 행 수와 row group 월 목록)
+    """
+    _require_pyarrow()
+    parquet_dir.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    try:
+        fingerprint = conn.execute("SELECT value FROM db_meta WHERE key = 'fingerprint'").fetchone()
+        manifest = {"fingerprint": fingerprint[0] if fingerprint else None, "tables": {}}
+        for table, date_column in DATE_COLUMNS.items():
+            manifest["tables"][table] = _export_table(conn, table, date_column, parquet_dir)
+    finally:
+        conn.close()
+
+    (parquet_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+
+def read_table(
+    table: str,
+    columns: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    filters: list[tuple] | None = None,
+    parquet_dir: Path = PARQUET_DIR
+) -> pd.DataFrame:
+    """
+    Parquet 테이블 읽기 (컬럼/조건 pushdown)
+
+    Args:
+        columns: 읽을 컬럼 (None이면 전체). 나머지 컬럼은 디스크에서 읽지 않음
+        start, end: 날짜 컬럼(DATE_COLUMNS) 범위 'YYYY-MM-DD' (양 끝 포함).
+            row group 통계로 범위 밖의 월은 건너뜀
+        filters: 추가 조건 [(컬럼, 연산자, 값), ...] - pyarrow filters 형식 (AND)
+            예: [("event_type", "=", "purchase"), ("user_id", "in", [1, 2, 3])]
+    """
+    _require_pyarrow()
+    path = parquet_dir / f"{table}.parquet"
+    if not path.exists():
+        raise FileNotFoundError(f"{path}가 없습니다. python -m src.utils.parquet_store로 내보내세요.")
+
+    conditions = list(filters or [])
+    date_column = DATE_COLUMNS[table]
+    if start is not None:
+        conditions.append((date_column, ">=", start))
+    if end is not None:
+        conditions.append((date_column, "<=", end))
+
+    return pq.read_table(path, columns=columns, filters=conditions or None).to_pandas()
+
+
+def _export_table(conn: sqlite3.Connection, table: str, date_column: str, parquet_dir: Path) -> dict:
+    """테이블 하나를 월별 row group으로 내보내기"""
+    schema = _arrow_schema(conn, table)
+    months = [row[0] for row in conn.execute(
+        f"SELECT DISTINCT substr({date_column}, 1, 7) FROM {table} WHERE {date_column} IS NOT NULL ORDER BY 1"
+    )]
+    order_by = ", ".join(SORT_COLUMNS[table])
+
+    path = parquet_dir / f"{table}.parquet"
+    tmp_path = path.with_suffix(".parquet.tmp")
+    n_rows = 0
+    with pq.ParquetWriter(tmp_path, schema, compression=COMPRESSION, write_statistics=True) as writer:
+        for month in months:
+            # 날짜 범위 조건이라 날짜 컬럼 인덱스로 해당 월만 읽음 ('-32'는 그 달의 어떤 날짜보다 큰 문자열)
+            df = pd.read_sql_query(
+                f"SELECT * FROM {table} WHERE {date_column} >= ? AND {date_column} < ? ORDER BY {order_by}",
+                conn,
+                params=(f"{month}-01", f"{month}-32")
+            )
+            batch = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            writer.write_table(batch, row_group_size=max(len(batch), 1))
+            n_rows += len(batch)
+    tmp_path.replace(path)
+
+    return {"rows": n_rows, "row_groups": months}
+
+
+def _arrow_schema(conn: sqlite3.Connection, table: str) -> "pa.Schema":
+    """SQLite 컬럼 선언 타입 → Arrow 스키마 (뷰처럼 선언 타입이 없으면 실제 값의 typeof)"""
+    fields = []
+    for row in conn.execute(f"PRAGMA table_xinfo({table})"):
+        name, declared = row[1], (row[2] or "").upper()
+        if not declared:
+            value_type = conn.execute(
+                f"SELECT typeof({name}) FROM {table} WHERE {name} IS NOT NULL LIMIT 1"
+            ).fetchone()
+            declared = value_type[0].upper() if value_type else "TEXT"
+        if "INT" in declared:
+            arrow_type = pa.int64()
+        elif any(t in declared for t in ("REAL", "FLOA", "DOUB")):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _require_pyarrow():
+    if pq is None:
+        raise ImportError("Parquet 내보내기/읽기에는 pyarrow가 필요합니다: pip install pyarrow")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="crm.db → Parquet 내보내기")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="원본 SQLite DB")
+    parser.add_argument("--out", type=Path, default=PARQUET_DIR, help="Parquet 출력 디렉터리")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    manifest = export_parquet(args.db, args.out)
+    print(f"Parquet 내보내기 완료: {args.out} (fingerprint={manifest['fingerprint']})")
+    for table, info in manifest["tables"].items():
+        print(f"- {table}: {info['rows']} rows, {len(info['row_groups'])} row groups")
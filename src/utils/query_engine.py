@@ -0,0 +1,410 @@
+"""
+쿼리 엔진
+
+SQL 에디터, 문제 카드, 앱(execute_query), 대시보드가 공통으로 쓰는 SQL 실행 계층입니다.
+연결 방식은 백엔드로 교체할 수 있고, 파티션 프루닝 / 비용 힌트 / 실행 지표 / 결과 캐시 / 실행 한도는 엔진 한 곳에서 처리합니다.
+
+    from src.utils.query_engine import get_engine
+    result = get_engine().execute("SELECT COUNT(*) FROM events", with_cost_hint=True)
+    if result.ok:
+        print(result.row_count, f"{result.elapsed_ms:.1f}ms", result.cost_hint)
+
+백엔드 (환경 변수 CRM_DB_BACKEND로 선택):
+- pool: 읽기 전용 연결 풀에서 연결을 빌려 씀 (기본 - 연결 비용 없이 실행)
+- replica: crm.db를 프로세스당 한 번 메모리에 올린 복제본에서 실행 (다중 학습자 서버용, DB 크기만큼 RAM 사용)
+  학습 진행(user_progress)을 읽는 쿼리만 파일 풀에서 실행
+- file: 쿼리마다 crm.db에 새로 연결
+"""
+
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import sys
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from src.utils.connection_pool import POOL_MAX_SIZE, get_pool, get_replica, reads_replica_excluded
+from src.utils.event_partitions import prune_events_query
+from src.utils.result_cache import ResultCache, cache_key
+from src.utils.schema_catalog import load_catalog, query_cost_hint, read_fingerprint
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DB_PATH = PROJECT_ROOT / "learning" / "data" / "crm.db"
+BACKEND_ENV = "CRM_DB_BACKEND"
+DEFAULT_BACKEND = "pool"
+# 학습자 쿼리 한도 (환경 변수로 조정, 0이면 제한 없음)
+QUERY_TIMEOUT_ENV = "CRM_QUERY_TIMEOUT"  # 시간 예산 (초)
+QUERY_MAX_ROWS_ENV = "CRM_QUERY_MAX_ROWS"  # 가져올 최대 행 수
+QUERY_MAX_VM_STEPS_ENV = "CRM_QUERY_MAX_VM_STEPS"  # 최대 SQLite VM 명령 수
+QUERY_MAX_RESULT_ENV = "CRM_QUERY_MAX_RESULT_MB"  # 가져온 결과 행의 최대 메모리 (MB)
+DEFAULT_QUERY_TIMEOUT_SECONDS = 10.0
+DEFAULT_QUERY_MAX_ROWS = 10_000
+DEFAULT_QUERY_MAX_VM_STEPS = 500_000_000
+DEFAULT_QUERY_MAX_RESULT_MB = 256
+# 한도 적용 시 결과를 가져오는 묶음 크기 (행)
+FETCH_BATCH_ROWS = 1_000
+# 진행 핸들러 호출 간격 (SQLite VM 명령 수) - 시간 초과/취소를 확인하는 주기
+PROGRESS_HANDLER_OPCODES = 10_000
+
+
+@dataclass
+class QueryResult:
+    """쿼리 실행 결과"""
+    query: str
+    df: pd.DataFrame | None = None
+    error: str | None = None
+    elapsed_ms: float = 0.0
+    row_count: int = 0
+    cost_hint: str | None = None
+    cached: bool = False  # 결과 캐시에서 가져옴 (SQLite 미실행)
+    interrupted: str | None = None  # 실행 중 중단된 이유: "timeout" / "cancelled" / "vm_steps" / "memory"
+    truncated: str | None = None  # 한도에 걸려 일부 행만 가져온 이유: "rows" / "vm_steps" / "memory"
+    notice: str | None = None  # 잘린 결과 안내 메시지
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class EngineMetrics:
+    """엔진 누적 실행 지표 (프로세스 단위, 모든 세션 합산)"""
+    queries: int = 0
+    errors: int = 0
+    rows: int = 0
+    total_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, result: QueryResult):
+        with self._lock:
+            self.queries += 1
+            self.errors += 0 if result.ok else 1
+            self.rows += result.row_count
+            self.total_ms += result.elapsed_ms
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.queries if self.queries else 0.0
+
+
+@dataclass
+class QueryLimits:
+    """
+    학습자 쿼리 실행 한도 (None이면 제한 없음)
+
+    모든 한도는 쿼리 하나에만 적용됩니다. SQLite hard_heap_limit는 프로세스 전체(진행 기록 저장,
+    카탈로그 갱신, 복제본 로드 포함)에 걸리고 PRAGMA로 낮출 수만 있어 쓰지 않고, 결과 메모리는
+    가져온 행의 크기(max_result_bytes)로, SQLite 쪽 작업량은 VM 명령 수(max_vm_steps)로 제한합니다.
+    """
+    timeout_seconds: float | None = DEFAULT_QUERY_TIMEOUT_SECONDS
+    max_rows: int | None = DEFAULT_QUERY_MAX_ROWS
+    max_vm_steps: int | None = DEFAULT_QUERY_MAX_VM_STEPS
+    max_result_bytes: int | None = DEFAULT_QUERY_MAX_RESULT_MB * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "QueryLimits":
+        """환경 변수(CRM_QUERY_*)로 조정한 한도"""
+        def number(name: str, default: float) -> float:
+            return float(os.environ.get(name, default))
+
+        return cls(
+            timeout_seconds=number(QUERY_TIMEOUT_ENV, DEFAULT_QUERY_TIMEOUT_SECONDS) or None,
+            max_rows=int(number(QUERY_MAX_ROWS_ENV, DEFAULT_QUERY_MAX_ROWS)) or None,
+            max_vm_steps=int(number(QUERY_MAX_VM_STEPS_ENV, DEFAULT_QUERY_MAX_VM_STEPS)) or None,
+            max_result_bytes=int(number(QUERY_MAX_RESULT_ENV, DEFAULT_QUERY_MAX_RESULT_MB) * 1024 * 1024) or None,
+        )
+
+    def message(self, reason: str, rows: int | None = None) -> str:
+        """한도 안내 메시지 - rows가 있으면 잘린 결과, 없으면 중단"""
+        if reason == "rows":
+            return (f"결과가 {self.max_rows:,}행을 넘어 처음 {self.max_rows:,}행만 가져왔습니다. "
+                    "LIMIT이나 집계로 결과를 줄이세요.")
+        if reason == "cancelled":
+            return "쿼리 실행을 취소했습니다."
+        limit, particle = {
+            "timeout": (f"실행 시간 제한({self.timeout_seconds or 0:g}초)", "을"),
+            "vm_steps": (f"실행 단계 한도({self.max_vm_steps or 0:,} VM 명령)", "를"),
+            "memory": (f"결과 메모리 한도({(self.max_result_bytes or 0) / 1024 ** 2:,.0f}MB)", "를"),
+        }[reason]
+        if rows is not None:
+            return f"{limit}에 걸려 그때까지 읽은 {rows:,}행만 표시합니다."
+        return f"쿼리가 {limit}{particle} 넘어 중단했습니다. JOIN 조건이나 WHERE 필터를 확인하세요."
+
+
+# 잘린 결과로 돌려줄 수 있는 한도 (시간 초과/취소는 오류로 처리)
+TRUNCATING_LIMITS = ("vm_steps", "memory")
+
+
+def _rows_bytes(rows: list[tuple]) -> int:
+    """가져온 행들이 차지하는 파이썬 객체 크기 (튜플 + 값, 바이트)"""
+    return sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in rows)
+
+
+class QueryGuard:
+    """
+    진행 핸들러 (sqlite3 set_progress_handler)
+
+    VM 명령 PROGRESS_HANDLER_OPCODES개마다 호출되어, 취소가 요청되었거나 시간 예산 / VM 명령 한도를
+    넘으면 0이 아닌 값을 돌려 실행 중인 문장을 중단시킵니다 (sqlite3.OperationalError: interrupted).
+    VM 명령 수는 호출 횟수로 세므로 PROGRESS_HANDLER_OPCODES 단위로 근사합니다.
+    """
+
+    def __init__(self, limits: QueryLimits | None, cancel: threading.Event | None):
+        self.limits = limits or QueryLimits(None, None, None, None)
+        self.cancel = cancel
+        timeout = self.limits.timeout_seconds
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.steps = 0
+        self.reason: str | None = None
+
+    def __call__(self) -> int:
+        self.steps += PROGRESS_HANDLER_OPCODES
+        max_steps = self.limits.max_vm_steps
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            self.reason = "timeout"
+        elif max_steps is not None and self.steps > max_steps:
+            self.reason = "vm_steps"
+        return 1 if self.reason else 0
+
+
+class Backend(ABC):
+    """연결 백엔드: connection(query)가 쿼리 하나를 실행할 동안 쓸 sqlite3 연결을 빌려줌 (query는 연결 선택용)"""
+    name = "base"
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    @abstractmethod
+    def connection(self, query: str | None = None) -> AbstractContextManager[sqlite3.Connection]:
+        """연결 하나를 빌려 주는 컨텍스트 매니저 (with 블록이 끝나면 반납/종료)"""
+
+    def close(self):
+        """백엔드가 들고 있는 자원 해제 (엔진 교체/종료 시)"""
+
+
+class FileBackend(Backend):
+    """쿼리마다 DB 파일에 새로 연결하고 끝나면 닫음"""
+    name = "file"
+
+    @contextmanager
+    def connection(self, query: str | None = None) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+class PoolBackend(Backend):
+    """읽기 전용(mode=ro) 연결 풀 - 연결을 재사용하고, DB 파일이 교체되면 다시 연결"""
+    name = "pool"
+
+    def __init__(self, db_path: Path, max_size: int = POOL_MAX_SIZE):
+        super().__init__(db_path)
+        self.pool = get_pool(db_path, max_size)
+
+    def connection(self, query: str | None = None):
+        return self.pool.connection()
+
+    def close(self):
+        self.pool.close()
+
+
+class ReplicaBackend(PoolBackend):
+    """
+    프로세스 공유 인메모리 복제본 - 모든 세션이 RAM에서 읽고, 원본 파일이 바뀌면 다시 로드
+
+    복제본에 없는 학습 진행 테이블을 읽는 쿼리는 파일 풀(file_pool)에서 실행합니다.
+    """
+    name = "replica"
+
+    def __init__(self, db_path: Path, max_size: int = POOL_MAX_SIZE):
+        Backend.__init__(self, db_path)
+        self.pool = get_replica(db_path, max_size)
+        self.file_pool = get_pool(db_path, max_size)
+
+    def connection(self, query: str | None = None):
+        if query is not None and reads_replica_excluded(query):
+            return self.file_pool.connection()
+        return self.pool.connection()
+
+    def close(self):
+        self.pool.close()
+        self.file_pool.close()
+
+
+BACKENDS: dict[str, type[Backend]] = {
+    FileBackend.name: FileBackend,
+    PoolBackend.name: PoolBackend,
+    ReplicaBackend.name: ReplicaBackend,
+}
+
+
+class QueryEngine:
+    """백엔드 위에서 SQL을 실행하고 QueryResult로 돌려주는 엔진"""
+
+    def __init__(self, backend: Backend):
+        self.backend = backend
+        self.db_path = backend.db_path
+        self.metrics = EngineMetrics()
+        self.cache = ResultCache()
+        self.user_limits = QueryLimits.from_env()
+
+    @property
+    def fingerprint(self) -> str | None:
+        """현재 DB 지문 (결과 캐시 키용)"""
+        return read_fingerprint(self.db_path)
+
+    def execute(
+        self,
+        query: str,
+        with_cost_hint: bool = False,
+        cache: bool = False,
+        limits: QueryLimits | None = None,
+        cancel: threading.Event | None = None,
+    ) -> QueryResult:
+        """
+        쿼리 실행 - 오류는 예외 대신 QueryResult.error로 반환
+
+        파티션 레이아웃이면 events 참조를 필요한 파티션으로 바꿔 실행합니다 (prune_events_query).
+        with_cost_hint=True면 성공한 쿼리의 전체 스캔 힌트를 함께 계산합니다.
+        cache=True면 같은 DB 지문에서 같은 SQL의 결과를 캐시에서 돌려줍니다 (적중 시 비용 힌트는 없음).
+        limits(학습자 쿼리는 self.user_limits)의 시간 예산을 넘기거나 cancel 이벤트가 세워지면
+        실행 중인 문장을 중단하고 result.interrupted와 안내 메시지를 채워 돌려줍니다.
+        행 수 / VM 명령 / 결과 메모리 한도에 걸리면 그때까지 읽은 행을 result.truncated, result.notice와 함께
+        돌려줍니다 (한 행도 읽기 전에 걸리면 interrupted 오류).
+        """
+        result = QueryResult(query=query)
+        start = time.perf_counter()
+        key = None
+        if cache:
+            fingerprint = self.fingerprint
+            if fingerprint is not None:
+                key = cache_key(query, fingerprint)
+                cached_df = self.cache.get(key)
+                if cached_df is not None:
+                    result.df, result.row_count, result.cached = cached_df, len(cached_df), True
+                    result.elapsed_ms = (time.perf_counter() - start) * 1000
+                    self.metrics.record(result)
+                    return result
+        guard = QueryGuard(limits, cancel) if limits or cancel else None
+        try:
+            with self.backend.connection(query) as conn:
+                if guard is not None:
+                    conn.set_progress_handler(guard, PROGRESS_HANDLER_OPCODES)
+                try:
+                    sql = prune_events_query(conn, query)
+                    if limits is not None:
+                        result.df, result.truncated = self._fetch_limited(conn, sql, limits, guard)
+                        if result.truncated:
+                            result.notice = limits.message(result.truncated, len(result.df))
+                    else:
+                        result.df = pd.read_sql_query(sql, conn)
+                    result.row_count = len(result.df)
+                    if with_cost_hint:
+                        catalog = load_catalog(self.db_path)
+                        result.cost_hint = query_cost_hint(conn, query, catalog) if catalog else None
+                finally:
+                    if guard is not None:
+                        conn.set_progress_handler(None, 0)
+        except Exception as e:
+            result.df = None
+            reason = "memory" if isinstance(e, MemoryError) else guard.reason if guard else None
+            if reason:
+                result.interrupted, result.error = reason, (limits or QueryLimits()).message(reason)
+            else:
+                result.error = str(e)
+        if key is not None and result.ok and not result.truncated:
+            self.cache.put(key, result.df)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics.record(result)
+        return result
+
+    def _fetch_limited(
+        self, conn: sqlite3.Connection, sql: str, limits: QueryLimits, guard: QueryGuard
+    ) -> tuple[pd.DataFrame, str | None]:
+        """
+        한도 안에서 결과 읽기 - (DataFrame, 잘린 이유)
+
+        pd.read_sql_query처럼 전체를 fetchall하지 않고 FETCH_BATCH_ROWS행씩 max_rows행까지만 가져오며,
+        가져온 행의 크기(_rows_bytes)가 max_result_bytes를 넘으면 거기서 멈춥니다.
+        VM 명령 한도나 메모리 부족(SQLITE_NOMEM → MemoryError)으로 중단되면 그때까지 읽은 행으로 결과를 만들고, 읽은 행이 없으면 예외를 그대로 올립니다.
+        DataFrame 변환은 read_sql_query와 같음 (from_records, coerce_float=True).
+        """
+        cursor = conn.execute(sql)
+        try:
+            columns = [column[0] for column in cursor.description or ()]
+            rows: list[tuple] = []
+            rows_bytes = 0
+            truncated = None
+            try:
+                while True:
+                    size = FETCH_BATCH_ROWS
+                    if limits.max_rows is not None:
+                        size = min(size, limits.max_rows + 1 - len(rows))
+                    batch = cursor.fetchmany(size)
+                    if not batch:
+                        break
+                    rows.extend(batch)
+                    if limits.max_rows is not None and len(rows) > limits.max_rows:
+                        del rows[limits.max_rows:]
+                        truncated = "rows"
+                        break
+                    if limits.max_result_bytes is not None:
+                        rows_bytes += _rows_bytes(batch)
+                        if rows_bytes > limits.max_result_bytes:
+                            truncated = "memory"
+                            break
+            except (sqlite3.OperationalError, MemoryError) as e:
+                reason = "memory" if isinstance(e, MemoryError) else guard.reason
+                if not rows or reason not in TRUNCATING_LIMITS:
+                    raise
+                truncated = reason
+        finally:
+            cursor.close()
+        return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True), truncated
+
+    def read_frame(self, query: str) -> pd.DataFrame:
+        """고정 쿼리(대시보드 집계 등) 실행 - 결과 캐시 사용, 오류는 예외로 전달"""
+        result = self.execute(query, cache=True)
+        if not result.ok:
+            raise sqlite3.DatabaseError(result.error)
+        return result.df
+
+    def close(self):
+        self.backend.close()
+
+
+# 프로세스 단위 기본 엔진 (모든 Streamlit 세션이 공유)
+_engine: QueryEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> QueryEngine:
+    """기본 엔진 (crm.db, 백엔드는 CRM_DB_BACKEND - 기본값 pool)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            name = os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+            if name not in BACKENDS:
+                raise ValueError(f"알 수 없는 {BACKEND_ENV}={name} (가능: {', '.join(BACKENDS)})")
+            _engine = QueryEngine(BACKENDS[name](DB_PATH))
+        return _engine
+
+
+def set_engine(engine: QueryEngine) -> QueryEngine:
+    """기본 엔진 교체 (다른 백엔드/DB로 실행할 때). 이전 엔진의 자원은 해제"""
+    global _engine
+    with _engine_lock:
+        previous, _engine = _engine, engine
+    if previous is not None and previous is not engine:
+        previous.close()
+    return engine
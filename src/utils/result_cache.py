@@ -0,0 +1,115 @@
+"""
+쿼리 결과 캐시
+
+같은 DB 버전에서 같은 SQL을 다시 실행하지 않도록 결과 DataFrame을 프로세스 안에 보관합니다.
+정답 확인 후 rerun마다 반복되는 정답 쿼리, 대시보드 집계처럼 모든 세션이 같은 쿼리를 실행하는
+경우에 SQLite를 거치지 않고 결과를 돌려줍니다.
+
+- 키: 정규화한 SQL + DB 지문 - DB를 다시 생성/추가하면 지문이 바뀌어 이전 결과는 자연히 적중하지 않음
+  선택 목록 원문도 키에 넣음 - 별칭 없는 컬럼 이름이 표기를 따르므로 count(*)와 COUNT(*)는 다른 결과
+- 용량: DataFrame 메모리 사용량(deep) 합계가 max_bytes를 넘으면 가장 오래 쓰지 않은 결과부터 제거(LRU)
+- 지표: 적중/미스/제거 횟수 (CacheStats)
+
+    cache = ResultCache(max_bytes=64 * 1024 * 1024)
+    key = cache_key(query, fingerprint)
+    df = cache.get(key)
+    if df is None:
+        df = pd.read_sql_query(query, conn)
+        cache.put(key, df)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.utils.sql_fingerprint import FINGERPRINT_LENGTH, select_list, sql_fingerprint
+
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """캐시 상태 (모니터링용)"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def cache_key(query: str, fingerprint: str) -> str:
+    """
+    캐시 키: DB 지문 + 정규화한 SQL의 지문 + 선택 목록 원문의 해시
+
+    선택 목록 밖의 공백/대소문자/주석/끝 세미콜론 차이는 같은 키이고, 결과 컬럼 이름이 달라지는
+    선택 목록의 표기 차이는 다른 키입니다.
+    """
+    labels = hashlib.sha1(select_list(query).encode()).hexdigest()[:FINGERPRINT_LENGTH]
+    return f"{fingerprint}:{sql_fingerprint(query)}:{labels}"
+
+
+class ResultCache:
+    """바이트 예산이 있는 LRU 결과 캐시 (스레드 안전, 모든 세션이 공유)"""
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """저장된 결과의 복사본 (호출한 쪽이 바꿔도 캐시는 그대로). 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            df = entry[0]
+        return df.copy()
+
+    def put(self, key: str, df: pd.DataFrame):
+        """결과 저장 - 한 결과가 예산 전체보다 크면 저장하지 않음"""
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        df = df.copy()
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
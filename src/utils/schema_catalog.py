@@ -0,0 +1,352 @@
+"""
+스키마 카탈로그
+
+테이블/뷰, 컬럼, 행 수, 고유값 수, 최솟값/최댓값, 미리보기 행을 DB 생성 시 한 번 계산해
+schema_catalog 테이블에 저장합니다. 앱(사이드바, 홈 미리보기, 쿼리 비용 힌트)은
+매 rerun마다 DB를 조회하는 대신 이 카탈로그를 읽습니다.
+
+카탈로그와 함께 DB 지문(fingerprint = 스키마 버전 + 스키마/통계/행 내용 해시)을 db_meta 테이블에
+게시합니다. 앱의 캐시와 미리 계산한 정답 결과는 이 지문을 키로 삼아, DB가 바뀌면 무효화됩니다.
+
+카탈로그는 DB 생성 스크립트(learning/setup_database.py)에서만 만들고 저장합니다.
+앱은 읽기 전용으로 열어 읽기만 하며, 카탈로그가 없는 DB는 --refresh-catalog로 한 번 만들어야 합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# 테이블/컬럼 계약이 바뀌면 올림 - DB 지문(fingerprint) 앞에 붙어 앱 캐시와 스냅샷 호환성을 가름
+SCHEMA_VERSION = 1
+CATALOG_TABLE = "schema_catalog"
+META_TABLE = "db_meta"
+# 카탈로그에서 제외하는 내부 테이블 (지문에도 포함하지 않음)
+INTERNAL_TABLES = {CATALOG_TABLE, META_TABLE, "user_progress"}
+PREVIEW_ROWS = 5
+# 행 수가 이보다 많으면 고유값 수를 앞쪽 표본으로 추정
+EXACT_DISTINCT_ROWS = 1_000_000
+DISTINCT_SAMPLE_ROWS = 100_000
+# 행 내용 해시: 이 행 수 이하인 테이블은 전체 행, 큰 테이블은 rowid 구간 표본
+CONTENT_FULL_ROWS = 200_000
+CONTENT_SAMPLE_WINDOWS = 64
+CONTENT_WINDOW_ROWS = 64
+# 이보다 작은 테이블의 전체 스캔은 비용 힌트에서 생략
+SCAN_HINT_MIN_ROWS = 10_000
+
+
+@dataclass
+class ColumnStats:
+    """컬럼 통계"""
+    name: str
+    type: str
+    distinct_count: int | None = None
+    min_value: Any = None
+    max_value: Any = None
+    distinct_estimated: bool = False
+    generated: bool = False  # 생성 컬럼 (signup_month 등 - SELECT *에는 나오지만 원본 스키마가 아님)
+
+
+@dataclass
+class TableStats:
+    """테이블/뷰 통계"""
+    name: str
+    kind: str  # 'table' | 'view'
+    row_count: int
+    columns: list[ColumnStats] = field(default_factory=list)
+    preview: list[list[Any]] = field(default_factory=list)  # 앞쪽 PREVIEW_ROWS행
+
+    @property
+    def column_names(self) -> list[str]:
+        return [column.name for column in self.columns]
+
+    @property
+    def base_column_names(self) -> list[str]:
+        """생성 컬럼을 뺀 원본 컬럼 (미리보기/사이드바용)"""
+        return [column.name for column in self.columns if not column.generated]
+
+
+@dataclass
+class SchemaCatalog:
+    """DB 한 버전의 스키마 카탈로그"""
+    tables: dict[str, TableStats]
+    built_at: str
+    fingerprint: str = ""
+    schema_version: int | None = None
+
+    def table(self, name: str) -> TableStats | None:
+        return self.tables.get(name)
+
+    def row_count(self, name: str) -> int | None:
+        table = self.tables.get(name)
+        return table.row_count if table else None
+
+
+def build_catalog(conn: sqlite3.Connection, schema_version: int | None = None) -> SchemaCatalog:
+    """
+    DB를 스캔해 카탈로그 생성
+
+    테이블당 한 번의 스캔으로 모든 컬럼의 MIN / MAX / COUNT(DISTINCT)를 계산합니다.
+    EXACT_DISTINCT_ROWS보다 큰 테이블은 고유값 수를 앞쪽 DISTINCT_SAMPLE_ROWS행으로 추정합니다.
+    schema_version은 지문 앞에 붙습니다 (생성 스크립트는 SCHEMA_VERSION을 넘김).
+    """
+    objects = conn.execute("""
+        SELECT name, type FROM sqlite_master
+        WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'
+        ORDER BY type, name
+    """).fetchall()
+
+    tables = {}
+    for name, kind in objects:
+        if name in INTERNAL_TABLES:
+            continue
+        # table_xinfo의 hidden: 2 = VIRTUAL 생성 컬럼, 3 = STORED 생성 컬럼
+        columns = [
+            ColumnStats(name=row[1], type=row[2] or "", generated=row[6] in (2, 3))
+            for row in conn.execute(f"PRAGMA table_xinfo({name})")
+        ]
+        row_count = conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+        estimated = row_count > EXACT_DISTINCT_ROWS
+
+        if columns:
+            source = f"(SELECT * FROM {name} LIMIT {DISTINCT_SAMPLE_ROWS})" if estimated else name
+            distinct = conn.execute(
+                "SELECT " + ", ".join(f"COUNT(DISTINCT {c.name})" for c in columns) + f" FROM {source}"
+            ).fetchone()
+            bounds = conn.execute(
+                "SELECT " + ", ".join(f"MIN({c.name}), MAX({c.name})" for c in columns) + f" FROM {name}"
+            ).fetchone()
+            for i, column in enumerate(columns):
+                column.distinct_count = distinct[i]
+                column.distinct_estimated = estimated
+                column.min_value, column.max_value = bounds[2 * i], bounds[2 * i + 1]
+
+        preview = [list(row) for row in conn.execute(f"SELECT * FROM {name} LIMIT {PREVIEW_ROWS}")]
+        tables[name] = TableStats(name=name, kind=kind, row_count=row_count, columns=columns, preview=preview)
+
+    return SchemaCatalog(
+        tables=tables,
+        built_at=datetime.now().isoformat(timespec="seconds"),
+        fingerprint=compute_fingerprint(conn, tables, schema_version),
+        schema_version=schema_version,
+    )
+
+
+def compute_fingerprint(
+    conn: sqlite3.Connection,
+    tables: dict[str, TableStats],
+    schema_version: int | None = None
+) -> str:
+    """
+    DB 지문: 스키마 버전 + sha256(스키마 정의, 테이블별 행 수/컬럼 통계/미리보기, 행 내용)
+
+    요약 통계만으로는 통계가 같은 재생성/수정을 구분하지 못하므로 행 내용도 해시합니다 (_content_digest).
+    내용이 같은 DB는 같은 지문이고, 재생성, 증분 추가, 인덱스 변경이면 지문이 바뀝니다.
+    """
+    digest = hashlib.sha256()
+    for row in conn.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE name NOT LIKE 'sqlite_%' AND sql IS NOT NULL
+        ORDER BY type, name
+    """):
+        if row[1] not in INTERNAL_TABLES:
+            digest.update(json.dumps(row).encode())
+    for name in sorted(tables):
+        digest.update(json.dumps(asdict(tables[name]), ensure_ascii=False, default=str).encode())
+        if tables[name].kind == "table":
+            _content_digest(conn, tables[name], digest)
+
+    prefix = f"v{schema_version}-" if schema_version is not None else ""
+    return prefix + digest.hexdigest()[:16]
+
+
+def _content_digest(conn: sqlite3.Connection, table: TableStats, digest):
+    """
+    테이블 행 내용을 digest에 더함
+
+    CONTENT_FULL_ROWS행 이하면 전체 행을, 그보다 크면 rowid 범위를 CONTENT_SAMPLE_WINDOWS개 구간으로
+    나눠 구간마다 CONTENT_WINDOW_ROWS행을 rowid 탐색으로 읽어 해시합니다 (대용량에서도 행 수와 무관한 비용).
+    WITHOUT ROWID 테이블은 기본키 순서의 앞/뒤 구간만 표본으로 씁니다.
+    """
+    name = table.name
+    if table.row_count <= CONTENT_FULL_ROWS:
+        rows = conn.execute(f"SELECT * FROM {name}")
+    elif _has_rowid(conn, name):
+        low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {name}").fetchone()
+        step = max(1, (high - low) // CONTENT_SAMPLE_WINDOWS)
+        rows = (
+            row
+            for start in range(low, high + 1, step)
+            for row in conn.execute(
+                f"SELECT * FROM {name} WHERE rowid >= ? ORDER BY rowid LIMIT {CONTENT_WINDOW_ROWS}", (start,)
+            )
+        )
+    else:
+        window = CONTENT_SAMPLE_WINDOWS * CONTENT_WINDOW_ROWS // 2
+        key = conn.execute(f"SELECT name FROM pragma_table_info('{name}') WHERE pk = 1").fetchone()[0]
+        rows = (
+            row
+            for order in ("ASC", "DESC")
+            for row in conn.execute(f"SELECT * FROM {name} ORDER BY {key} {order} LIMIT {window}")
+        )
+    for row in rows:
+        digest.update(repr(row).encode())
+
+
+def _has_rowid(conn: sqlite3.Connection, name: str) -> bool:
+    """rowid가 있는 테이블인지 (WITHOUT ROWID면 False)"""
+    try:
+        conn.execute(f"SELECT rowid FROM {name} LIMIT 0")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def save_catalog(conn: sqlite3.Connection, catalog: SchemaCatalog):
+    """
+    카탈로그를 schema_catalog 테이블에, 지문을 db_meta 테이블에 저장 (기존 내용 교체)
+
+    커밋하지 않으므로 데이터 변경과 같은 트랜잭션에서 게시할 수 있습니다.
+    """
+    conn.execute(f"DROP TABLE IF EXISTS {META_TABLE}")
+    conn.execute(f"CREATE TABLE {META_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+    conn.executemany(f"INSERT INTO {META_TABLE} VALUES (?, ?)", [
+        ("fingerprint", catalog.fingerprint),
+        ("schema_version", None if catalog.schema_version is None else str(catalog.schema_version)),
+        ("built_at", catalog.built_at),
+    ])
+    conn.execute(f"DROP TABLE IF EXISTS {CATALOG_TABLE}")
+    conn.execute(f"CREATE TABLE {CATALOG_TABLE} (table_name TEXT PRIMARY KEY, payload TEXT, built_at TEXT)")
+    conn.executemany(
+        f"INSERT INTO {CATALOG_TABLE} VALUES (?, ?, ?)",
+        [(name, json.dumps(asdict(table), ensure_ascii=False, default=str), catalog.built_at)
+         for name, table in catalog.tables.items()]
+    )
+
+
+def refresh_catalog(db_path: Path, schema_version: int | None = None) -> SchemaCatalog:
+    """카탈로그와 지문을 다시 만들어 저장 (DB 생성/증분 추가 후 호출)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        catalog = build_catalog(conn, schema_version)
+        save_catalog(conn, catalog)
+        conn.commit()
+    finally:
+        conn.close()
+    return catalog
+
+
+def read_catalog(conn: sqlite3.Connection) -> SchemaCatalog | None:
+    """저장된 카탈로그 읽기 (없으면 None)"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CATALOG_TABLE,)
+    ).fetchone()
+    if not exists:
+        return None
+
+    tables = {}
+    built_at = ""
+    for name, payload, built_at in conn.execute(f"SELECT table_name, payload, built_at FROM {CATALOG_TABLE}"):
+        data = json.loads(payload)
+        data["columns"] = [ColumnStats(**column) for column in data["columns"]]
+        tables[name] = TableStats(**data)
+
+    meta = {}
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (META_TABLE,)).fetchone():
+        meta = dict(conn.execute(f"SELECT key, value FROM {META_TABLE}").fetchall())
+    if "fingerprint" not in meta:
+        # 지문 게시 이전 버전의 카탈로그
+        meta["fingerprint"] = compute_fingerprint(conn, tables)
+    version = meta.get("schema_version")
+    return SchemaCatalog(
+        tables=tables,
+        built_at=built_at,
+        fingerprint=meta["fingerprint"],
+        schema_version=int(version) if version is not None else None,
+    )
+
+
+# 프로세스 단위 캐시: DB 파일 경로 → (파일 버전, 카탈로그)
+_cache: dict[Path, tuple[tuple[int, int], SchemaCatalog | None]] = {}
+
+
+def load_catalog(db_path: Path) -> SchemaCatalog | None:
+    """
+    카탈로그 로드 (DB 파일 버전당 한 번, 읽기 전용)
+
+    파일의 (수정 시각, 크기)가 바뀌지 않았으면 DB에 접속하지 않고 캐시를 반환합니다.
+    저장된 카탈로그가 없는 DB(이전 버전 스크립트로 생성)면 None - 앱 읽기 경로에서는 DB에 쓰지 않으며,
+    python learning/setup_database.py --refresh-catalog로 만듭니다.
+    """
+    if not db_path.exists():
+        return None
+
+    stat = os.stat(db_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(db_path)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        catalog = read_catalog(conn)
+    finally:
+        conn.close()
+
+    _cache[db_path] = (version, catalog)
+    return catalog
+
+
+def read_fingerprint(db_path: Path) -> str | None:
+    """게시된 DB 지문 (캐시 키용, DB 파일 버전당 한 번만 읽음). DB가 없으면 None"""
+    catalog = load_catalog(db_path)
+    return catalog.fingerprint if catalog else None
+
+
+def query_cost_hint(conn: sqlite3.Connection, query: str, catalog: SchemaCatalog) -> str | None:
+    """
+    쿼리 비용 힌트: 전체 스캔(인덱스 순서 스캔 포함)하는 테이블과 그 행 수
+
+    EXPLAIN QUERY PLAN의 'SCAN <테이블|별칭>'을 FROM/JOIN 절 별칭으로 테이블에 대응시키고,
+    행 수는 카탈로그에서 읽습니다. SCAN_HINT_MIN_ROWS행 이상인 전체 스캔이 없으면 None.
+    """
+    try:
+        details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")]
+    except sqlite3.Error:
+        return None
+
+    aliases = {}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", query, re.I):
+        if table in catalog.tables:
+            aliases[table] = table
+            if alias:
+                aliases[alias] = table
+
+    scans = []
+    for detail in details:
+        match = re.match(r"SCAN (\w+)\b", detail)
+        if match and match.group(1) in aliases:
+            table = aliases[match.group(1)]
+            if catalog.tables[table].row_count < SCAN_HINT_MIN_ROWS:
+                continue
+            scans.append(f"{table}({catalog.tables[table].row_count:,}행)")
+    if not scans:
+        return None
+    return "전체 스캔: " + ", ".join(dict.fromkeys(scans))
+
+
+def cost_hint(db_path: Path, query: str) -> str | None:
+    """DB 파일 경로 기준 query_cost_hint (앱 컴포넌트용)"""
+    catalog = load_catalog(db_path)
+    if catalog is None:
+        return None
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return query_cost_hint(conn, query, catalog)
+    finally:
+        conn.close()
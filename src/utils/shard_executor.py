@@ -0,0 +1,256 @@
+"""
+해시 샤드 map-reduce 실행기
+
+--shards N으로 만든 샤드 파일(learning/data/shards/crm_shard_{i}.db)은 customers / transactions / events를
+hash(customer_id) = hash(user_id) 기준으로 나눠 담고, campaigns는 모든 샤드에 복제합니다.
+한 고객의 데이터는 항상 한 샤드에만 있으므로 고객 단위 집계(COUNT(DISTINCT user_id), 고객별 RFM 등)를
+샤드마다 따로 계산해 합쳐도 단일 DB 결과와 정확히 같습니다.
+
+실행 흐름:
+1. map: 샤드마다 map_sql을 프로세스 풀에서 병렬 실행 (샤드 파일은 읽기 전용으로 엶)
+2. reduce: 모든 샤드의 map 결과를 인메모리 SQLite의 partials 테이블에 모아 reduce_sql 실행
+
+실행: python -m src.utils.shard_executor --rollup funnel
+      python -m src.utils.shard_executor --rollup rfm --workers 4 --verify
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DB_PATH = PROJECT_ROOT / "learning" / "data" / "crm.db"
+SHARD_DIR = DB_PATH.parent / "shards"
+MANIFEST_NAME = "manifest.json"
+
+# 샤드 키 컬럼 (이 테이블들은 같은 고객의 행이 같은 샤드로 감). 나머지 테이블은 모든 샤드에 복제
+SHARD_KEYS = {
+    "customers": "customer_id",
+    "transactions": "customer_id",
+    "events": "user_id",
+}
+PARTIALS_TABLE = "partials"
+
+
+def shard_of(ids: np.ndarray, n_shards: int) -> np.ndarray:
+    """고객 ID → 샤드 번호 (피보나치 해싱 - 연속된 ID가 샤드에 고르게 퍼짐)"""
+    x = np.asarray(ids).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        x = x * np.uint64(0x9E3779B97F4A7C15)
+    return ((x >> np.uint64(32)) % np.uint64(n_shards)).astype(np.int64)
+
+
+def shard_path(shard_dir: Path, index: int) -> Path:
+    return shard_dir / f"crm_shard_{index}.db"
+
+
+def write_manifest(shard_dir: Path, n_shards: int, fingerprint: str):
+    """샤드 구성 기록 (샤드 수, 원본 crm.db 지문)"""
+    manifest = {
+        "n_shards": n_shards,
+        "shard_keys": SHARD_KEYS,
+        "fingerprint": fingerprint,
+        "files": [shard_path(shard_dir, i).name for i in range(n_shards)],
+    }
+    (shard_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+
+
+def read_manifest(shard_dir: Path = SHARD_DIR) -> dict | None:
+    """샤드 구성 (샤드 배포가 없으면 None)"""
+    path = shard_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def shard_paths(shard_dir: Path = SHARD_DIR) -> list[Path]:
+    """샤드 파일 목록 (manifest 순서)"""
+    manifest = read_manifest(shard_dir)
+    if manifest is None:
+        raise FileNotFoundError(
+            f"{shard_dir}에 샤드가 없습니다. python learning/setup_database.py --shards N으로 생성하세요."
+        )
+    return [shard_dir / name for name in manifest["files"]]
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """샤드 map-reduce 집계 정의"""
+    name: str
+    description: str
+    map_sql: str  # 샤드마다 실행 (샤드 안에서 완결되는 고객 단위 집계)
+    reduce_sql: str  # partials 테이블(모든 샤드의 map 결과)을 합치는 쿼리
+
+
+ROLLUPS = {
+    "funnel": Rollup(
+        name="funnel",
+        description="퍼널 단계별 도달 사용자 수와 전환율 (funnel_1)",
+        map_sql="""
+            SELECT event_type AS step, COUNT(DISTINCT user_id) AS users
+            FROM events
+            WHERE event_type IN ('page_view', 'product_view', 'add_to_cart', 'purchase')
+            GROUP BY event_type
+        """,
+        reduce_sql="""
+            WITH funnel AS (
+                SELECT step, SUM(users) AS users FROM partials GROUP BY step
+            ),
+            total AS (
+                SELECT users AS total_users FROM funnel WHERE step = 'page_view'
+            )
+            SELECT
+                f.step,
+                f.users,
+                ROUND(f.users * 100.0 / t.total_users, 2) AS conversion_rate
+            FROM funnel f, total t
+            ORDER BY
+                CASE f.step
+                    WHEN 'page_view' THEN 1
+                    WHEN 'product_view' THEN 2
+                    WHEN 'add_to_cart' THEN 3
+                    WHEN 'purchase' THEN 4
+                END
+        """,
+    ),
+    "cohort": Rollup(
+        name="cohort",
+        description="가입 월 코호트별 M+N 구매 고객 수와 리텐션 (리텐션 매트릭스)",
+        map_sql="""
+            SELECT
+                c.signup_month AS cohort_month,
+                (CAST(substr(t.txn_month, 1, 4) AS INTEGER) - CAST(substr(c.signup_month, 1, 4) AS INTEGER)) * 12
+                    + CAST(substr(t.txn_month, 6, 2) AS INTEGER) - CAST(substr(c.signup_month, 6, 2) AS INTEGER)
+                    AS month_offset,
+                COUNT(DISTINCT t.customer_id) AS customers
+            FROM customers c
+            JOIN transactions t ON c.customer_id = t.customer_id
+            GROUP BY cohort_month, month_offset
+            UNION ALL
+            SELECT signup_month, NULL, COUNT(*) FROM customers GROUP BY signup_month
+        """,
+        reduce_sql="""
+            WITH cohort_size AS (
+                SELECT cohort_month, SUM(customers) AS cohort_size
+                FROM partials WHERE month_offset IS NULL GROUP BY cohort_month
+            )
+            SELECT
+                p.cohort_month,
+                CAST(p.month_offset AS INTEGER) AS month_offset,
+                SUM(p.customers) AS customers,
+                ROUND(SUM(p.customers) * 100.0 / s.cohort_size, 1) AS retention_rate
+            FROM partials p
+            JOIN cohort_size s ON p.cohort_month = s.cohort_month
+            WHERE p.month_offset IS NOT NULL
+            GROUP BY p.cohort_month, p.month_offset
+            ORDER BY p.cohort_month, month_offset
+        """,
+    ),
+    "rfm": Rollup(
+        name="rfm",
+        description="RFM 스코어 상위 고객 (rfm_2) - 고객별 R/F/M은 샤드에서, NTILE은 전체에서 계산",
+        map_sql="""
+            SELECT
+                customer_id,
+                ROUND(julianday('2024-06-30') - julianday(MAX(transaction_date)), 0) AS recency,
+                COUNT(*) AS frequency,
+                SUM(amount) AS monetary
+            FROM transactions
+            GROUP BY customer_id
+        """,
+        # 동점 순서가 샤드 결과를 합친 순서에 따라 달라지지 않도록 customer_id로 순서 고정
+        reduce_sql="""
+            SELECT
+                customer_id,
+                recency,
+                frequency,
+                monetary,
+                NTILE(5) OVER (ORDER BY recency DESC, customer_id) AS r_score,
+                NTILE(5) OVER (ORDER BY frequency ASC, customer_id) AS f_score,
+                NTILE(5) OVER (ORDER BY monetary ASC, customer_id) AS m_score
+            FROM partials
+            ORDER BY r_score DESC, f_score DESC, m_score DESC, customer_id
+            LIMIT 20
+        """,
+    ),
+}
+
+
+def map_shards(map_sql: str, paths: list[Path], workers: int | None = None) -> pd.DataFrame:
+    """샤드마다 map_sql을 병렬 실행하고 결과를 이어 붙임 (샤드 순서 유지)"""
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers == 1:
+        frames = [_run_map(path, map_sql) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(_run_map, paths, [map_sql] * len(paths)))
+    return pd.concat(frames, ignore_index=True)
+
+
+def reduce_partials(partials: pd.DataFrame, reduce_sql: str) -> pd.DataFrame:
+    """map 결과를 인메모리 SQLite의 partials 테이블에 넣고 reduce_sql 실행"""
+    conn = sqlite3.connect(":memory:")
+    try:
+        partials.to_sql(PARTIALS_TABLE, conn, index=False)
+        return pd.read_sql_query(reduce_sql, conn)
+    finally:
+        conn.close()
+
+
+def map_reduce(
+    rollup: Rollup,
+    paths: list[Path] | None = None,
+    workers: int | None = None
+) -> pd.DataFrame:
+    """샤드 전체에 rollup 실행 (paths가 없으면 manifest의 샤드 파일 사용)"""
+    paths = paths if paths is not None else shard_paths()
+    return reduce_partials(map_shards(rollup.map_sql, paths, workers), rollup.reduce_sql)
+
+
+def _run_map(path: Path, sql: str) -> pd.DataFrame:
+    """샤드 하나에서 map 쿼리 실행 (워커 프로세스에서 실행)"""
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        return pd.read_sql_query(sql, conn)
+    finally:
+        conn.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="해시 샤드 map-reduce 집계")
+    parser.add_argument("--rollup", choices=sorted(ROLLUPS), default="funnel", help="실행할 집계")
+    parser.add_argument("--shard-dir", type=Path, default=SHARD_DIR, help="샤드 디렉터리")
+    parser.add_argument("--workers", type=int, default=None, help="map 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="crm.db 한 파일을 샤드 하나로 보고 같은 집계를 실행해 결과 비교"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rollup = ROLLUPS[args.rollup]
+    paths = shard_paths(args.shard_dir)
+
+    start = time.perf_counter()
+    result = map_reduce(rollup, paths, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"[{rollup.name}] {rollup.description}")
+    print(result.to_string(index=False))
+    print(f"\n샤드 {len(paths)}개, {elapsed * 1000:.0f}ms")
+
+    if args.verify:
+        start = time.perf_counter()
+        single = map_reduce(rollup, [DB_PATH], workers=1)
+        elapsed = time.perf_counter() - start
+        same = single.equals(result)
+        print(f"단일 DB {elapsed * 1000:.0f}ms - 결과 {'일치' if same else '불일치'}")
@@ -0,0 +1,158 @@
+"""
+SQL 정규화 / 지문
+
+학습자는 같은 쿼리를 공백, 대소문자, 주석, 끝 세미콜론만 다르게 제출합니다. 원문을 그대로 키로 쓰면
+결과 캐시/로그 집계가 거의 맞지 않으므로, 토큰 단위로 정규화한 SQL과 그 해시를 씁니다.
+
+- 키워드와 함수 이름은 대문자, 식별자와 문자열은 쓴 그대로 (따옴표 식별자 포함)
+- 주석(-- / /* */) 제거, 토큰 사이 공백은 한 칸 ('(' 뒤, ')' ',' 앞, '.' 양옆, 함수 이름과 괄호 사이는 공백 없음)
+- 끝의 세미콜론 제거
+- parameterize=True면 문자열/숫자 리터럴을 ?로, IN (?, ?, ...) 목록을 IN (...)로 바꿈 - 값만 다른 쿼리를 같은 모양으로 묶음
+
+    normalize_sql("select  count(*) from events -- 전체\\n;")   # 'SELECT COUNT(*) FROM events'
+    sql_fingerprint(query)                      # 결과 캐시 키 (리터럴 구분)
+    sql_fingerprint(query, parameterize=True)   # 쿼리 로그 집계 (모양 기준)
+
+정규화는 결과 값을 바꾸지 않지만, 별칭 없는 식의 컬럼 이름은 SQLite가 원문 표기로 정하므로
+같은 지문의 두 쿼리라도 결과 컬럼 이름 표기는 다를 수 있습니다 (count(*) / COUNT(*)).
+결과를 공유하는 쪽은 select_list(query)의 원문을 함께 비교해야 합니다.
+
+    python -m src.utils.sql_fingerprint < query.sql
+"""
+
+import hashlib
+import re
+import sys
+
+FINGERPRINT_LENGTH = 16
+
+# SQLite 키워드 (https://sqlite.org/lang_keywords.html)
+KEYWORDS = frozenset("""
+ABORT ACTION ADD AFTER ALL ALTER ALWAYS ANALYZE AND AS ASC ATTACH AUTOINCREMENT BEFORE BEGIN BETWEEN BY
+CASCADE CASE CAST CHECK COLLATE COLUMN COMMIT CONFLICT CONSTRAINT CREATE CROSS CURRENT CURRENT_DATE
+CURRENT_TIME CURRENT_TIMESTAMP DATABASE DEFAULT DEFERRABLE DEFERRED DELETE DESC DETACH DISTINCT DO DROP
+EACH ELSE END ESCAPE EXCEPT EXCLUDE EXCLUSIVE EXISTS EXPLAIN FAIL FILTER FIRST FOLLOWING FOR FOREIGN FROM
+FULL GENERATED GLOB GROUP GROUPS HAVING IF IGNORE IMMEDIATE IN INDEX INDEXED INITIALLY INNER INSERT INSTEAD
+INTERSECT INTO IS ISNULL JOIN KEY LAST LEFT LIKE LIMIT MATCH MATERIALIZED NATURAL NO NOT NOTHING NOTNULL
+NULL NULLS OF OFFSET ON OR ORDER OTHERS OUTER OVER PARTITION PLAN PRAGMA PRECEDING PRIMARY QUERY RAISE
+RANGE RECURSIVE REFERENCES REGEXP REINDEX RELEASE RENAME REPLACE RESTRICT RETURNING RIGHT ROLLBACK ROW ROWS
+SAVEPOINT SELECT SET TABLE TEMP TEMPORARY THEN TIES TO TRANSACTION TRIGGER UNBOUNDED UNION UNIQUE UPDATE
+USING VACUUM VALUES VIEW VIRTUAL WHEN WHERE WINDOW WITH WITHOUT
+""".split())
+
+# SQL 토큰 (인덱스 어드바이저, 파티션 프루닝도 이 토크나이저를 씀)
+# word는 키워드와 식별자, quoted는 따옴표 식별자, op는 연산자/구두점 (그 밖의 한 글자 포함)
+TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>[xX]?'(?:[^']|'')*'?)
+  | (?P<quoted>"(?:[^"]|"")*"?|`(?:[^`]|``)*`?|\[[^\]]*\]?)
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<param>\?\d*|[:@$]\w+)
+  | (?P<word>\w+)
+  | (?P<op>\|\||<<|>>|<=|>=|==|!=|<>|->>|->|.)
+""", re.VERBOSE | re.DOTALL)
+
+# 가장 바깥 SELECT의 선택 목록이 끝나는 키워드
+_SELECT_LIST_END = {"FROM", "WHERE", "GROUP", "HAVING", "WINDOW", "ORDER", "LIMIT", "UNION", "INTERSECT", "EXCEPT"}
+
+_NO_SPACE_AFTER = {"(", "."}
+_NO_SPACE_BEFORE = {")", ",", ".", ";"}
+
+
+def tokenize(query: str) -> list[tuple[str, str]]:
+    """(종류, 텍스트) 토큰 목록 - 공백과 주석은 제외"""
+    return [
+        (match.lastgroup, match.group())
+        for match in TOKEN_RE.finditer(query)
+        if match.lastgroup not in ("space", "comment")
+    ]
+
+
+def normalize_sql(query: str, parameterize: bool = False) -> str:
+    """정규화한 SQL 문자열"""
+    tokens = tokenize(query)
+    while tokens and tokens[-1][1] == ";":
+        tokens.pop()
+
+    out: list[str] = []
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        if kind == "word":
+            if text.upper() in KEYWORDS:
+                text = text.upper()
+            elif i + 1 < len(tokens) and tokens[i + 1][1] == "(":
+                # 함수 호출: 이름을 대문자로, 여는 괄호와 붙여 씀
+                text = text.upper() + "("
+                i += 1
+        elif parameterize and kind in ("string", "number"):
+            text = "?"
+        out.append(text)
+        i += 1
+
+    if parameterize:
+        out = _collapse_in_lists(out)
+
+    sql = ""
+    for text in out:
+        if sql and sql[-1] not in _NO_SPACE_AFTER and text not in _NO_SPACE_BEFORE:
+            sql += " "
+        sql += text
+    return sql
+
+
+def _collapse_in_lists(tokens: list[str]) -> list[str]:
+    """IN (?, ?, ?) → IN (...) - 목록 길이만 다른 쿼리를 같은 모양으로"""
+    out: list[str] = []
+    i = 0
+    while i < len(tokens):
+        if tokens[i] == "IN" and i + 2 < len(tokens) and tokens[i + 1] == "(" and tokens[i + 2] == "?":
+            j = i + 2
+            while j + 2 < len(tokens) and tokens[j + 1] == "," and tokens[j + 2] == "?":
+                j += 2
+            if j + 1 < len(tokens) and tokens[j + 1] == ")":
+                out += ["IN", "(", "...", ")"]
+                i = j + 2
+                continue
+        out.append(tokens[i])
+        i += 1
+    return out
+
+
+def select_list(query: str) -> str:
+    """
+    가장 바깥 SELECT의 선택 목록 원문 (정규화하지 않음, 결과 컬럼 이름을 정하는 부분)
+
+    괄호 안(CTE, 서브쿼리)은 건너뛰고, 복합 SELECT는 첫 SELECT의 목록입니다. SELECT가 없으면 빈 문자열.
+    """
+    depth = 0
+    start = None
+    for match in TOKEN_RE.finditer(query):
+        kind, text = match.lastgroup, match.group()
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif depth == 0 and kind == "word":
+            word = text.upper()
+            if start is None and word == "SELECT":
+                start = match.end()
+            elif start is not None and word in _SELECT_LIST_END:
+                return query[start:match.start()].strip()
+        elif depth == 0 and start is not None and text == ";":
+            return query[start:match.start()].strip()
+    return query[start:].strip() if start is not None else ""
+
+
+def sql_fingerprint(query: str, parameterize: bool = False) -> str:
+    """정규화한 SQL의 해시 (16자리 hex) - 같은 쿼리면 표기와 관계없이 같은 값"""
+    normalized = normalize_sql(query, parameterize)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+if __name__ == "__main__":
+    query = sys.stdin.read()
+    print(normalize_sql(query))
+    print(normalize_sql(query, parameterize=True))
+    print(f"지문: {sql_fingerprint(query)} · 모양 지문: {sql_fingerprint(query, parameterize=True)}")
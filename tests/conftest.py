@@ -0,0 +1,40 @@
+"""
+테스트 공통 fixture
+
+테스트 세션마다 1% 미니 DB(create_fixture)를 임시 디렉터리에 한 번 만들고, 그 DB를 쓰는 엔진을 공유합니다.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from learning.setup_database import create_fixture
+from src.utils.query_engine import PoolBackend, QueryEngine
+
+
+def load_component(name: str):
+    """app/components 모듈을 파일에서 직접 로드 (패키지 __init__이 streamlit/plotly를 import하므로)"""
+    path = PROJECT_ROOT / "app" / "components" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"components_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def fixture_db(tmp_path_factory) -> Path:
+    db_path = tmp_path_factory.mktemp("data") / "crm_fixture.db"
+    create_fixture(db_path)
+    return db_path
+
+
+@pytest.fixture
+def engine(fixture_db):
+    engine = QueryEngine(PoolBackend(fixture_db))
+    yield engine
+    engine.close()
@@ -0,0 +1,32 @@
+"""모든 학습 모듈의 정답 쿼리가 미니 DB에서 실행되고, 학습자 경로로 실행해도 정답으로 채점되는지 확인"""
+
+import pytest
+
+from conftest import load_component
+from src.utils.index_advisor import collect_answer_queries
+from src.utils.query_engine import QueryLimits
+
+ANSWER_QUERIES = collect_answer_queries()
+result_checker = load_component("result_checker")
+
+
+def test_answer_queries_collected():
+    assert len(ANSWER_QUERIES) >= 30
+    assert len({(q.module, q.question_id) for q in ANSWER_QUERIES}) == len(ANSWER_QUERIES)
+
+
+@pytest.mark.parametrize("query", ANSWER_QUERIES, ids=lambda q: f"{q.module}-{q.question_id}")
+def test_answer_query_runs(engine, query):
+    result = engine.execute(query.sql)
+    assert result.ok, result.error
+    assert len(result.df.columns) > 0
+
+
+@pytest.mark.parametrize("query", ANSWER_QUERIES, ids=lambda q: f"{q.module}-{q.question_id}")
+def test_answer_query_graded_correct(engine, query):
+    # 문제 카드와 같은 경로: 정답은 캐시된 결과, 제출은 학습자 한도로 실행
+    answer = engine.execute(query.sql, cache=True)
+    submitted = engine.execute(query.sql, limits=QueryLimits())
+    assert submitted.ok and not submitted.truncated, submitted.error or submitted.notice
+    check = result_checker.check_result(submitted.df, answer.df)
+    assert check.status == result_checker.CheckStatus.CORRECT, check.details
@@ -0,0 +1,87 @@
+"""연결 풀 / 인메모리 복제본"""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from src.utils import connection_pool
+from src.utils.connection_pool import MemoryReplicaPool, reads_replica_excluded
+from src.utils.query_engine import QueryEngine, ReplicaBackend
+
+
+@pytest.fixture
+def db_copy(fixture_db, tmp_path):
+    db_path = tmp_path / "crm.db"
+    shutil.copy(fixture_db, db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE user_progress (question_id TEXT PRIMARY KEY, attempts INTEGER)")
+    conn.execute("INSERT INTO user_progress VALUES ('q1', 1)")
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _save_progress(db_path, question_id):
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO user_progress VALUES (?, 1)", (question_id,))
+    conn.commit()
+    conn.close()
+
+
+def test_replica_reads_fingerprint_only_on_change(db_copy, monkeypatch):
+    calls = []
+    read_fingerprint = connection_pool.read_fingerprint
+    monkeypatch.setattr(connection_pool, "read_fingerprint", lambda path: calls.append(path) or read_fingerprint(path))
+    pool = MemoryReplicaPool(db_copy)
+    try:
+        for _ in range(3):
+            with pool.connection() as conn:
+                conn.execute("SELECT COUNT(*) FROM customers").fetchone()
+        assert len(calls) == 1
+
+        # 학습 진행 저장: 수정 시각이 바뀌면 지문을 한 번 다시 읽지만, 지문이 같으므로 다시 로드하지 않음
+        _save_progress(db_copy, "q2")
+        stat = os.stat(db_copy)
+        os.utime(db_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        for _ in range(3):
+            with pool.connection():
+                pass
+        assert len(calls) == 2
+        assert pool._generation == 1
+    finally:
+        pool.close()
+
+
+def test_replica_excludes_progress(db_copy):
+    pool = MemoryReplicaPool(db_copy)
+    try:
+        with pool.connection() as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert "user_progress" not in tables
+        assert "customers" in tables
+    finally:
+        pool.close()
+
+
+def test_replica_backend_reads_progress_from_file(db_copy):
+    engine = QueryEngine(ReplicaBackend(db_copy))
+    try:
+        query = "SELECT question_id FROM user_progress ORDER BY question_id"
+        assert engine.execute(query).df["question_id"].tolist() == ["q1"]
+        _save_progress(db_copy, "q2")
+        assert engine.execute(query).df["question_id"].tolist() == ["q1", "q2"]
+        assert engine.execute("SELECT COUNT(*) FROM customers").ok
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT * FROM user_progress", True),
+    ('SELECT * FROM "USER_PROGRESS"', True),
+    ("SELECT 'user_progress' FROM customers", False),
+    ("SELECT * FROM customers -- user_progress", False),
+])
+def test_reads_replica_excluded(query, expected):
+    assert reads_replica_excluded(query) is expected
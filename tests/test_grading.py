@@ -0,0 +1,89 @@
+"""채점 (result_checker.check_result) - 문제 카드가 학습자 결과와 정답 결과를 비교하는 방식"""
+
+import pandas as pd
+
+from conftest import load_component
+
+result_checker = load_component("result_checker")
+check_result = result_checker.check_result
+CheckStatus = result_checker.CheckStatus
+
+ANSWER = """
+SELECT acquisition_channel, COUNT(*) AS customers, ROUND(AVG(acquisition_cost), 2) AS avg_cac
+FROM customers
+GROUP BY acquisition_channel
+ORDER BY acquisition_channel
+"""
+
+
+def grade(engine, query: str):
+    answer = engine.execute(ANSWER, cache=True).df
+    submitted = engine.execute(query).df if query is not None else None
+    return check_result(submitted, answer)
+
+
+def test_same_query_is_correct(engine):
+    check = grade(engine, ANSWER)
+    assert check.status == CheckStatus.CORRECT
+    assert check.score == 100
+
+
+def test_order_case_and_column_names_ignored(engine):
+    check = grade(engine, """
+        select acquisition_channel as ch, count(*) as n, round(avg(acquisition_cost), 2) as cac
+        from customers group by 1 order by n desc
+    """)
+    assert check.status == CheckStatus.CORRECT
+
+
+def test_float_precision(engine):
+    check = grade(engine, """
+        SELECT acquisition_channel, COUNT(*), AVG(acquisition_cost) + 0.001
+        FROM customers GROUP BY acquisition_channel
+    """)
+    assert check.status == CheckStatus.CORRECT
+
+
+def test_missing_rows_is_partial(engine):
+    check = grade(engine, """
+        SELECT acquisition_channel, COUNT(*), ROUND(AVG(acquisition_cost), 2)
+        FROM customers GROUP BY acquisition_channel ORDER BY acquisition_channel LIMIT 1
+    """)
+    assert check.status in (CheckStatus.PARTIAL, CheckStatus.WRONG)
+    assert check.score < 100
+    assert any("행" in detail for detail in check.details)
+
+
+def test_wrong_values_is_partial(engine):
+    check = grade(engine, """
+        SELECT acquisition_channel, COUNT(*), ROUND(AVG(acquisition_cost), 2) * 2
+        FROM customers GROUP BY acquisition_channel
+    """)
+    assert check.status == CheckStatus.PARTIAL
+    assert 50 <= check.score < 100
+
+
+def test_wrong_shape_is_wrong(engine):
+    check = grade(engine, "SELECT customer_id FROM customers")
+    assert check.status == CheckStatus.WRONG
+    assert check.score < 50
+
+
+def test_not_executed_is_error(engine):
+    assert grade(engine, None).status == CheckStatus.ERROR
+
+
+def test_answer_error_is_error():
+    assert check_result(pd.DataFrame({"a": [1]}), None).status == CheckStatus.ERROR
+
+
+def test_empty_results():
+    empty = pd.DataFrame({"a": []})
+    assert check_result(empty, empty).status == CheckStatus.CORRECT
+    assert check_result(empty, pd.DataFrame({"a": [1]})).status == CheckStatus.WRONG
+
+
+def test_null_values_are_equal(engine):
+    query = "SELECT customer_id, NULLIF(customer_id % 2, 1) AS even FROM customers"
+    check = check_result(engine.execute(query).df, engine.execute(query).df)
+    assert check.status == CheckStatus.CORRECT
@@ -0,0 +1,16 @@
+"""인덱스 어드바이저"""
+
+import shutil
+
+from src.utils.index_advisor import advise
+
+
+def test_advise_deterministic(fixture_db, tmp_path):
+    db_path = tmp_path / "crm.db"
+    shutil.copy(fixture_db, db_path)
+    first = advise(db_path, repeat=1)
+    second = advise(db_path, repeat=1)
+    assert [c.statement for c in first.recommended] == [c.statement for c in second.recommended]
+    assert [c.statement for c in first.candidates] == [c.statement for c in second.candidates]
+    assert first.steps_after == second.steps_after
+    assert not first.applied and not second.applied
@@ -0,0 +1,150 @@
+"""QueryEngine.execute - 실행 한도, 취소, 결과 캐시"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from src.utils.query_engine import BACKENDS, Backend, QueryLimits
+
+# 끝나지 않는 쿼리 (진행 핸들러로만 멈춤)
+ENDLESS_COUNT = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+ENDLESS_ROWS = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT x FROM n"
+
+NO_LIMITS = QueryLimits(None, None, None, None)
+
+
+def test_execute_ok(engine):
+    result = engine.execute("SELECT COUNT(*) AS n FROM customers")
+    assert result.ok
+    assert result.row_count == 1
+    assert result.df["n"].iloc[0] > 0
+    assert not result.cached and result.interrupted is None and result.truncated is None
+
+
+def test_execute_error(engine):
+    result = engine.execute("SELECT * FROM no_such_table")
+    assert not result.ok
+    assert "no_such_table" in result.error
+    assert result.df is None
+    assert engine.metrics.errors == 1
+
+
+def test_limited_fetch_matches_read_sql(engine):
+    query = "SELECT * FROM events ORDER BY event_id"
+    expected = engine.execute(query).df
+    result = engine.execute(query, limits=NO_LIMITS)
+    pd.testing.assert_frame_equal(result.df, expected)
+
+
+def test_max_rows_truncates(engine):
+    result = engine.execute("SELECT * FROM events", limits=QueryLimits(max_rows=100))
+    assert result.ok
+    assert result.row_count == 100
+    assert result.truncated == "rows"
+    assert "100" in result.notice
+
+
+def test_max_rows_exact_is_not_truncated(engine):
+    total = engine.execute("SELECT COUNT(*) FROM events").df.iloc[0, 0]
+    result = engine.execute("SELECT * FROM events", limits=QueryLimits(max_rows=int(total)))
+    assert result.row_count == total
+    assert result.truncated is None
+
+
+def test_max_result_bytes_truncates(engine):
+    limits = QueryLimits(max_rows=None, max_result_bytes=10_000)
+    result = engine.execute("SELECT * FROM events", limits=limits)
+    assert result.ok
+    assert result.truncated == "memory"
+    assert 0 < result.row_count
+
+
+def test_vm_steps_interrupts(engine):
+    result = engine.execute(ENDLESS_COUNT, limits=QueryLimits(max_vm_steps=100_000))
+    assert not result.ok
+    assert result.interrupted == "vm_steps"
+    assert result.df is None
+
+
+def test_vm_steps_truncates_after_rows(engine):
+    limits = QueryLimits(max_rows=None, max_vm_steps=1_000_000)
+    result = engine.execute(ENDLESS_ROWS, limits=limits)
+    assert result.ok
+    assert result.truncated == "vm_steps"
+    assert result.row_count > 0
+
+
+def test_timeout_interrupts(engine):
+    result = engine.execute(ENDLESS_COUNT, limits=QueryLimits(timeout_seconds=0.2, max_vm_steps=None))
+    assert result.interrupted == "timeout"
+    assert "0.2초" in result.error
+
+
+def test_cancel_interrupts(engine):
+    cancel = threading.Event()
+    timer = threading.Timer(0.1, cancel.set)
+    timer.start()
+    try:
+        result = engine.execute(ENDLESS_COUNT, limits=NO_LIMITS, cancel=cancel)
+    finally:
+        timer.cancel()
+    assert result.interrupted == "cancelled"
+    assert not result.ok
+
+
+def test_connection_usable_after_interrupt(engine):
+    engine.execute(ENDLESS_COUNT, limits=QueryLimits(max_vm_steps=100_000))
+    assert engine.execute("SELECT 1").ok
+
+
+def test_cache_hit(engine):
+    query = "SELECT acquisition_channel, COUNT(*) AS n FROM customers GROUP BY acquisition_channel"
+    first = engine.execute(query, cache=True)
+    second = engine.execute(query, cache=True)
+    assert not first.cached and second.cached
+    pd.testing.assert_frame_equal(first.df, second.df)
+    stats = engine.cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_cache_returns_copies(engine):
+    query = "SELECT customer_id FROM customers ORDER BY customer_id"
+    df = engine.execute(query, cache=True).df
+    df.iloc[0, 0] = -1
+    assert engine.execute(query, cache=True).df.iloc[0, 0] != -1
+
+
+def test_uncached_execute_skips_cache(engine):
+    engine.execute("SELECT 1", cache=False)
+    assert engine.cache.stats().entries == 0
+
+
+def test_errors_and_truncated_results_not_cached(engine):
+    engine.execute("SELECT * FROM no_such_table", cache=True)
+    engine.execute("SELECT * FROM events", cache=True, limits=QueryLimits(max_rows=10))
+    assert engine.cache.stats().entries == 0
+
+
+def test_cache_keeps_column_labels(engine):
+    lower = engine.execute("SELECT count(*) FROM customers", cache=True)
+    upper = engine.execute("SELECT COUNT(*) FROM customers", cache=True)
+    assert not upper.cached
+    assert list(lower.df.columns) == ["count(*)"]
+    assert list(upper.df.columns) == ["COUNT(*)"]
+    assert engine.execute("select count(*) FROM customers;", cache=True).cached
+
+
+def test_backend_requires_connection(fixture_db):
+    class Incomplete(Backend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete(fixture_db)
+    for backend_class in BACKENDS.values():
+        backend = backend_class(fixture_db)
+        try:
+            with backend.connection() as conn:
+                assert conn.execute("SELECT 1").fetchone() == (1,)
+        finally:
+            backend.close()
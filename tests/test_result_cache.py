@@ -0,0 +1,75 @@
+"""결과 캐시 - LRU 제거, 바이트 계산, 적중/미스 통계, 캐시 키"""
+
+import pandas as pd
+
+from src.utils.result_cache import ResultCache, cache_key
+
+
+def frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"x": range(n)})
+
+
+def size_of(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def test_hit_miss_stats():
+    cache = ResultCache()
+    assert cache.get("a") is None
+    cache.put("a", frame(3))
+    assert cache.get("a").equals(frame(3))
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+    assert ResultCache().stats().hit_rate == 0.0
+
+
+def test_byte_accounting():
+    cache = ResultCache()
+    cache.put("a", frame(10))
+    cache.put("b", frame(20))
+    assert cache.stats().bytes == size_of(frame(10)) + size_of(frame(20))
+    cache.put("a", frame(30))  # 같은 키 교체는 이전 크기를 뺌
+    assert cache.stats().bytes == size_of(frame(30)) + size_of(frame(20))
+    assert cache.stats().entries == 2
+    cache.clear()
+    assert (cache.stats().bytes, cache.stats().entries) == (0, 0)
+
+
+def test_lru_eviction():
+    one = size_of(frame(100))
+    cache = ResultCache(max_bytes=3 * one)
+    for key in "abc":
+        cache.put(key, frame(100))
+    cache.get("a")  # a를 최근 사용으로
+    cache.put("d", frame(100))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.bytes == 3 * one <= stats.max_bytes
+
+
+def test_oversized_result_not_stored():
+    cache = ResultCache(max_bytes=size_of(frame(10)))
+    cache.put("big", frame(1000))
+    assert cache.get("big") is None
+    assert cache.stats().entries == 0
+
+
+def test_returns_copies():
+    cache = ResultCache()
+    df = frame(3)
+    cache.put("a", df)
+    df.loc[0, "x"] = 99
+    hit = cache.get("a")
+    hit.loc[1, "x"] = 99
+    assert cache.get("a")["x"].tolist() == [0, 1, 2]
+
+
+def test_cache_key():
+    assert cache_key("select count(*) from t;", "v1") == cache_key("select count(*)  FROM t -- 주석", "v1")
+    assert cache_key("SELECT 1", "v1") != cache_key("SELECT 1", "v2")
+    # 별칭 없는 컬럼 이름은 선택 목록 표기를 따르므로 다른 키
+    assert cache_key("SELECT count(*) FROM t", "v1") != cache_key("SELECT COUNT(*) FROM t", "v1")
+    assert cache_key("SELECT COUNT(*) AS n FROM t", "v1") != cache_key("SELECT COUNT(*) AS N FROM t", "v1")
@@ -0,0 +1,103 @@
+"""스키마 카탈로그"""
+
+import shutil
+import sqlite3
+
+from learning.setup_database import create_fixture
+from src.utils import schema_catalog
+from src.utils.schema_catalog import (
+    CATALOG_TABLE, META_TABLE, SCHEMA_VERSION, cost_hint, load_catalog, refresh_catalog,
+)
+
+GENERATED = {
+    "customers": {"signup_day", "signup_month"},
+    "transactions": {"txn_day", "txn_month"},
+    "events": {"event_day", "event_hour"},
+}
+
+
+def test_generated_columns_flagged(fixture_db):
+    catalog = load_catalog(fixture_db)
+    for name, generated in GENERATED.items():
+        table = catalog.table(name)
+        assert {column.name for column in table.columns if column.generated} == generated
+        assert generated.isdisjoint(table.base_column_names)
+        assert len(table.preview[0]) == len(table.column_names)
+
+
+def test_generated_columns_indexed(fixture_db):
+    conn = sqlite3.connect(fixture_db)
+    try:
+        indexed = {
+            (table, row[2])
+            for table in GENERATED
+            for index in conn.execute(f"PRAGMA index_list({table})")
+            for row in conn.execute(f"PRAGMA index_info({index[1]})")
+        }
+    finally:
+        conn.close()
+    for table, columns in GENERATED.items():
+        assert {(table, column) for column in columns} <= indexed
+
+
+def _copy(fixture_db, tmp_path):
+    db_path = tmp_path / "crm.db"
+    shutil.copy(fixture_db, db_path)
+    return db_path
+
+
+def _swap_last_channels(db_path):
+    """통계(행 수/고유값/최솟값/최댓값/미리보기)는 그대로 두고 마지막 두 고객의 채널만 맞바꿈"""
+    conn = sqlite3.connect(db_path)
+    try:
+        (a, a_channel), = conn.execute(
+            "SELECT rowid, acquisition_channel FROM customers ORDER BY rowid DESC LIMIT 1"
+        )
+        (b, b_channel), = conn.execute(
+            "SELECT rowid, acquisition_channel FROM customers WHERE acquisition_channel != ? "
+            "ORDER BY rowid DESC LIMIT 1", (a_channel,)
+        )
+        conn.execute("UPDATE customers SET acquisition_channel = ? WHERE rowid = ?", (b_channel, a))
+        conn.execute("UPDATE customers SET acquisition_channel = ? WHERE rowid = ?", (a_channel, b))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_fingerprint_deterministic(fixture_db, tmp_path):
+    rebuilt = tmp_path / "crm_fixture.db"
+    create_fixture(rebuilt)
+    assert load_catalog(rebuilt).fingerprint == load_catalog(fixture_db).fingerprint
+
+
+def test_fingerprint_tracks_content(fixture_db, tmp_path):
+    db_path = _copy(fixture_db, tmp_path)
+    before = refresh_catalog(db_path, SCHEMA_VERSION)
+    _swap_last_channels(db_path)
+    after = refresh_catalog(db_path, SCHEMA_VERSION)
+    assert after.tables["customers"] == before.tables["customers"]
+    assert after.fingerprint != before.fingerprint
+
+
+def test_fingerprint_sampled(fixture_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(schema_catalog, "CONTENT_FULL_ROWS", 0)
+    monkeypatch.setattr(schema_catalog, "CONTENT_SAMPLE_WINDOWS", 4)
+    db_path = _copy(fixture_db, tmp_path)
+    before = refresh_catalog(db_path, SCHEMA_VERSION)
+    assert refresh_catalog(db_path, SCHEMA_VERSION).fingerprint == before.fingerprint
+    # 마지막 rowid 구간은 항상 표본에 포함
+    _swap_last_channels(db_path)
+    assert refresh_catalog(db_path, SCHEMA_VERSION).fingerprint != before.fingerprint
+
+
+def test_load_catalog_read_only(fixture_db, tmp_path):
+    db_path = _copy(fixture_db, tmp_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"DROP TABLE {CATALOG_TABLE}")
+    conn.execute(f"DROP TABLE {META_TABLE}")
+    conn.close()
+    before = db_path.read_bytes()
+
+    assert load_catalog(db_path) is None
+    assert cost_hint(db_path, "SELECT * FROM customers") is None
+    assert db_path.read_bytes() == before
@@ -0,0 +1,63 @@
+"""DB 생성 스크립트 - 병렬 샤드 생성의 메모리 상한"""
+
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from learning.setup_database import bounded_map, iter_shards
+
+
+class ShardResult:
+    """생성된 샤드 결과 자리표시 (살아 있는 개수를 weakref로 셈)"""
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+def test_bounded_map_limits_live_results():
+    alive = weakref.WeakSet()
+    lock = threading.Lock()
+
+    def generate(index: int) -> ShardResult:
+        result = ShardResult(index)
+        with lock:
+            alive.add(result)
+        return result
+
+    peak = 0
+    order = []
+    workers = 3
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in bounded_map(executor, generate, range(40), workers):
+            time.sleep(0.005)  # 적재가 생성보다 느린 상황
+            with lock:
+                peak = max(peak, len(alive))
+            order.append(result.index)
+            del result
+    assert order == list(range(40))
+    assert peak <= workers + 1
+
+
+def test_bounded_map_propagates_errors():
+    def generate(index: int) -> int:
+        if index == 2:
+            raise ValueError("shard failed")
+        return index
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = bounded_map(executor, generate, range(5), 2)
+        assert [next(results), next(results)] == [0, 1]
+        try:
+            next(results)
+        except ValueError as e:
+            assert "shard failed" in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_iter_shards_global_ids():
+    customers, transactions, events = next(iter_shards(1, workers=1))
+    assert customers["customer_id"].is_unique
+    assert transactions["transaction_id"].is_unique
+    assert events["event_id"].is_unique
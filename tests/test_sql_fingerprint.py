@@ -0,0 +1,54 @@
+"""SQL 정규화 / 지문"""
+
+import pytest
+
+from src.utils.sql_fingerprint import normalize_sql, select_list, sql_fingerprint, tokenize
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("select  count(*) from events -- 전체\n;", "SELECT COUNT(*) FROM events"),
+    ("SELECT a,b FROM t;;", "SELECT a, b FROM t"),
+    ("select /* 주석 */ t.a from t where t.b = 'Mixed Case'", "SELECT t.a FROM t WHERE t.b = 'Mixed Case'"),
+    ('select "Order" from [my table]', 'SELECT "Order" FROM [my table]'),
+    ("select sum ( x ) from t", "SELECT SUM(x) FROM t"),
+    ("select x from t where y in (1, 2)", "SELECT x FROM t WHERE y IN (1, 2)"),
+])
+def test_normalize_sql(query, expected):
+    assert normalize_sql(query) == expected
+
+
+def test_identifiers_keep_case():
+    assert normalize_sql("select Amount from Orders") == "SELECT Amount FROM Orders"
+
+
+def test_parameterize():
+    assert (normalize_sql("select * from t where a = 'x' and b > 3.5 and c in (1, 2, 3)", parameterize=True)
+            == "SELECT * FROM t WHERE a = ? AND b > ? AND c IN (...)")
+
+
+def test_parameterize_keeps_subquery_in():
+    assert normalize_sql("select 1 where a in (select b from t)", parameterize=True) == \
+        "SELECT ? WHERE a IN (SELECT b FROM t)"
+
+
+def test_tokenize_skips_space_and_comments():
+    assert tokenize("a -- x\n + 'b''c'") == [("word", "a"), ("op", "+"), ("string", "'b''c'")]
+
+
+def test_fingerprint():
+    assert sql_fingerprint("SELECT 1;") == sql_fingerprint("select   1")
+    assert sql_fingerprint("SELECT 1") != sql_fingerprint("SELECT 2")
+    assert sql_fingerprint("SELECT 1", parameterize=True) == sql_fingerprint("SELECT 2", parameterize=True)
+    assert len(sql_fingerprint("SELECT 1")) == 16
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("select count(*) from t", "count(*)"),
+    ("SELECT a, (SELECT MAX(b) FROM u) FROM t WHERE c", "a, (SELECT MAX(b) FROM u)"),
+    ("WITH x AS (SELECT 1 AS n FROM t) SELECT n * 2 FROM x", "n * 2"),
+    ("SELECT a FROM t UNION SELECT b FROM u", "a"),
+    ("SELECT 1 + 1;", "1 + 1"),
+    ("PRAGMA table_info(t)", ""),
+])
+def test_select_list(query, expected):
+    assert select_list(query) == expected